@@ -21,21 +21,27 @@ Prerequisites:
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import time
 from typing import Any
 
 import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError, Unauthorized
 from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    ATTR_DURATION_COSTS,
+    CHARGE_CONTROLS,
     CONF_BATTERY_CAPACITY_SENSOR,
     CONF_BATTERY_CHARGING_POWER,
     CONF_BATTERY_CHARGING_SWITCH,
     CONF_BATTERY_SOC_SENSOR,
+    CONF_CHARGE_CONTROL,
     CONF_CHARGING_DURATION_HOURS,
     CONF_DAY_END_TIME,
     CONF_DAY_SCHEDULE_ENABLED,
@@ -46,8 +52,11 @@ from .const import (
     CONF_EVENING_PEAK_END,
     CONF_EVENING_PEAK_START,
     CONF_EVENING_PEAK_TARGET_SOC,
+    CONF_EVENT_DRIVEN_UPDATES,
     CONF_FAILURE_BEHAVIOR,
     CONF_FORECAST_MODE_AUTOMATIC,
+    CONF_MAX_CHARGE_RUNS,
+    CONF_MIN_CHARGE_RUN_MINUTES,
     CONF_MINIMUM_SOC_FLOOR,
     CONF_MORNING_CONSUMPTION_KWH,
     CONF_NIGHT_END_TIME,
@@ -61,11 +70,17 @@ from .const import (
     CONF_NOTIFY_CHARGING_STARTED,
     CONF_NOTIFY_EMERGENCY_CHARGING,
     CONF_PRICE_SENSOR,
+    CONF_REPLAN_SOC_DRIFT,
+    CONF_SLOW_REFRESH_WARNING_MS,
     CONF_SOC_OFFSET_KWH,
+    CONF_SOC_STOP_HYSTERESIS,
     CONF_SOLAR_FORECAST_ENABLED,
     CONF_SOLAR_FORECAST_SENSOR,
+    CONF_SPLIT_CHARGING_ENABLED,
     CONF_TARGET_SOC,
     CONF_TRIGGER_TIME,
+    DATA_MACRO_AVAILABLE,
+    DEFAULT_CHARGE_CONTROL,
     DEFAULT_CHARGING_DURATION_HOURS,
     DEFAULT_DAY_END_TIME,
     DEFAULT_DAY_SCHEDULE_ENABLED,
@@ -76,8 +91,11 @@ from .const import (
     DEFAULT_EVENING_PEAK_END,
     DEFAULT_EVENING_PEAK_START,
     DEFAULT_EVENING_PEAK_TARGET_SOC,
+    DEFAULT_EVENT_DRIVEN_UPDATES,
     DEFAULT_FAILURE_BEHAVIOR,
     DEFAULT_FORECAST_MODE_AUTOMATIC,
+    DEFAULT_MAX_CHARGE_RUNS,
+    DEFAULT_MIN_CHARGE_RUN_MINUTES,
     DEFAULT_MINIMUM_SOC_FLOOR,
     DEFAULT_MORNING_CONSUMPTION_KWH,
     DEFAULT_NIGHT_END_TIME,
@@ -90,15 +108,23 @@ from .const import (
     DEFAULT_NOTIFY_CHARGING_SKIPPED,
     DEFAULT_NOTIFY_CHARGING_STARTED,
     DEFAULT_NOTIFY_EMERGENCY_CHARGING,
+    DEFAULT_REPLAN_SOC_DRIFT,
+    DEFAULT_SLOW_REFRESH_WARNING_MS,
     DEFAULT_SOC_OFFSET_KWH,
+    DEFAULT_SOC_STOP_HYSTERESIS,
     DEFAULT_SOLAR_FORECAST_ENABLED,
+    DEFAULT_SPLIT_CHARGING_ENABLED,
     DEFAULT_TARGET_SOC,
     DEFAULT_TRIGGER_TIME,
     DOMAIN,
     FAILURE_BEHAVIORS,
+    PROFILE_HOTSPOTS,
+    SERVICE_GET_WINDOW_COSTS,
+    SERVICE_PROFILE,
 )
 from .coordinator import TibberCheapestChargingCoordinator
-from .dashboard import async_setup_dashboard, async_register_dashboard_service
+from .dashboard import async_register_dashboard_service, async_setup_dashboard
+from .profiling import ProfileSession
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -160,6 +186,9 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_FAILURE_BEHAVIOR, default=DEFAULT_FAILURE_BEHAVIOR
                 ): vol.In(FAILURE_BEHAVIORS),
+                vol.Optional(
+                    CONF_CHARGE_CONTROL, default=DEFAULT_CHARGE_CONTROL
+                ): vol.In(CHARGE_CONTROLS),
                 vol.Optional(
                     CONF_DEFAULT_CHARGE_START_TIME,
                     default=DEFAULT_DEFAULT_CHARGE_START_TIME,
@@ -167,6 +196,21 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_DEFAULT_CHARGE_DURATION, default=DEFAULT_DEFAULT_CHARGE_DURATION
                 ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=8)),
+                vol.Optional(
+                    CONF_SPLIT_CHARGING_ENABLED, default=DEFAULT_SPLIT_CHARGING_ENABLED
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_MIN_CHARGE_RUN_MINUTES, default=DEFAULT_MIN_CHARGE_RUN_MINUTES
+                ): vol.All(vol.Coerce(int), vol.Range(min=15, max=240)),
+                vol.Optional(
+                    CONF_MAX_CHARGE_RUNS, default=DEFAULT_MAX_CHARGE_RUNS
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=8)),
+                vol.Optional(
+                    CONF_SOC_STOP_HYSTERESIS, default=DEFAULT_SOC_STOP_HYSTERESIS
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                vol.Optional(
+                    CONF_REPLAN_SOC_DRIFT, default=DEFAULT_REPLAN_SOC_DRIFT
+                ): vol.All(vol.Coerce(float), vol.Range(min=1, max=25)),
                 # Notification settings
                 vol.Optional(
                     CONF_NOTIFICATION_SERVICE, default=DEFAULT_NOTIFICATION_SERVICE
@@ -208,6 +252,13 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Optional(
                     CONF_MINIMUM_SOC_FLOOR, default=DEFAULT_MINIMUM_SOC_FLOOR
                 ): vol.All(vol.Coerce(int), vol.Range(min=10, max=50)),
+                # Update settings
+                vol.Optional(
+                    CONF_EVENT_DRIVEN_UPDATES, default=DEFAULT_EVENT_DRIVEN_UPDATES
+                ): cv.boolean,
+                vol.Optional(
+                    CONF_SLOW_REFRESH_WARNING_MS, default=DEFAULT_SLOW_REFRESH_WARNING_MS
+                ): vol.All(vol.Coerce(float), vol.Range(min=10, max=5000)),
             }
         )
     },
@@ -296,8 +347,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create coordinator
     coordinator = TibberCheapestChargingCoordinator(hass, entry)
 
-    # Initial data fetch
-    await coordinator.async_config_entry_first_refresh()
+    # Serve the persisted plan right away, otherwise wait for the first refresh
+    restored = await coordinator.async_restore_plan()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
+
+    # Refresh on source entity state changes
+    coordinator.async_setup_listeners()
+
+    # Set up charging triggers and the charge executor, unless the blueprint switches
+    await coordinator.async_setup_automations()
 
     # Store coordinator
     hass.data[DOMAIN][entry.entry_id] = {
@@ -307,18 +366,127 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    # Set up dashboard
-    await async_setup_dashboard(hass, entry)
+    # Set up dashboard without holding up entry setup
+    entry.async_create_background_task(
+        hass, async_setup_dashboard(hass, entry), f"{DOMAIN} dashboard setup"
+    )
 
     # Register dashboard recreation service
     await async_register_dashboard_service(hass)
 
+    # Register window cost lookup service
+    _async_register_window_cost_service(hass)
+
+    # Register the admin-only profiling service
+    _async_register_profile_service(hass)
+
     # Set up options update listener
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    # Revalidate a restored plan without delaying setup
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} plan revalidation"
+        )
+
     return True
 
 
+def _async_register_window_cost_service(hass: HomeAssistant) -> None:
+    """Register the get_window_costs service."""
+    if hass.services.has_service(DOMAIN, SERVICE_GET_WINDOW_COSTS):
+        return
+
+    async def handle_get_window_costs(call: ServiceCall) -> ServiceResponse:
+        """Return the precomputed window costs of every loaded entry."""
+        duration = call.data.get("duration")
+        response: dict[str, Any] = {}
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
+            coordinator = entry_data["coordinator"]
+            if duration is None:
+                response[entry_id] = (coordinator.data or {}).get(ATTR_DURATION_COSTS) or []
+            else:
+                response[entry_id] = coordinator.get_window_cost(duration)
+        return response
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_WINDOW_COSTS,
+        handle_get_window_costs,
+        schema=vol.Schema(
+            {
+                vol.Optional("duration"): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.25, max=8)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+def _async_register_profile_service(hass: HomeAssistant) -> None:
+    """Register the admin-only profile service."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        return
+
+    async def handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Profile the next refreshes of every loaded entry and write a pstats file."""
+        # The profile writes to the config directory, so only admins may run it
+        user_id = call.context.user_id
+        user = await hass.auth.async_get_user(user_id) if user_id else None
+        if user is None or not user.is_admin:
+            raise Unauthorized(context=call.context)
+
+        coordinators: list[TibberCheapestChargingCoordinator] = [
+            entry_data["coordinator"] for entry_data in hass.data.get(DOMAIN, {}).values()
+        ]
+        if not coordinators:
+            raise HomeAssistantError("No Charge Cheapest entry is loaded")
+        if any(coordinator.profiling is not None for coordinator in coordinators):
+            raise HomeAssistantError("A profile is already running")
+
+        session = ProfileSession(call.data["refreshes"])
+        for coordinator in coordinators:
+            coordinator.profiling = session
+        _LOGGER.info("Profiling the next %s refreshes", session.target)
+        try:
+            async with asyncio.timeout(call.data["timeout"]):
+                await session.done.wait()
+        except TimeoutError:
+            _LOGGER.info("Profiling timed out after %s refreshes", session.refreshes)
+        finally:
+            for coordinator in coordinators:
+                coordinator.profiling = None
+            session.stop()
+
+        path = hass.config.path(f"{DOMAIN}_profile.{int(time.time())}.cprof")
+        hotspots = await hass.async_add_executor_job(session.write, path, PROFILE_HOTSPOTS)
+        _LOGGER.info("Wrote profile to %s", path)
+        return {
+            "file": path,
+            "refreshes": session.refreshes,
+            "callbacks": session.callbacks,
+            "hotspots": hotspots,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        handle_profile,
+        schema=vol.Schema(
+            {
+                vol.Optional("refreshes", default=5): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=100)
+                ),
+                vol.Optional("timeout", default=600): vol.All(
+                    vol.Coerce(float), vol.Range(min=10, max=3600)
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     # Unload platforms
@@ -332,6 +500,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # Remove entry data
         hass.data[DOMAIN].pop(entry.entry_id)
 
+        # The services serve all entries, remove them with the last one
+        if not hass.data[DOMAIN]:
+            for service in (SERVICE_GET_WINDOW_COSTS, SERVICE_PROFILE):
+                hass.services.async_remove(DOMAIN, service)
+
     return unload_ok
 
 
@@ -357,24 +530,27 @@ async def _validate_tibber_integration(hass: HomeAssistant) -> bool:
 
 
 async def _validate_cheapest_energy_macro(hass: HomeAssistant) -> bool:
-    """Check if the cheapest-energy-hours Jinja macro is available."""
-    try:
-        # Try to check if the macro file exists in custom_templates
-        import os
-
-        custom_templates_path = hass.config.path("custom_templates")
-        macro_file = os.path.join(
-            custom_templates_path, "cheapest_energy_hours.jinja"
-        )
-
-        if os.path.exists(macro_file):
-            return True
+    """Check if the cheapest-energy-hours Jinja macro is available.
 
-        # Also check in templates directory
-        templates_path = hass.config.path("templates")
-        macro_file_alt = os.path.join(templates_path, "cheapest_energy_hours.jinja")
+    The filesystem probe runs in the executor once per Home Assistant run.
+    """
+    if DATA_MACRO_AVAILABLE in hass.data:
+        return hass.data[DATA_MACRO_AVAILABLE]
 
-        return os.path.exists(macro_file_alt)
+    macro_files = [
+        os.path.join(hass.config.path(directory), "cheapest_energy_hours.jinja")
+        for directory in ("custom_templates", "templates")
+    ]
+    try:
+        available = await hass.async_add_executor_job(_any_file_exists, macro_files)
     except Exception:
         # If we can't check, assume it might be available
-        return True
+        available = True
+
+    hass.data[DATA_MACRO_AVAILABLE] = available
+    return available
+
+
+def _any_file_exists(paths: list[str]) -> bool:
+    """Return True if any of the paths exists (blocking)."""
+    return any(os.path.exists(path) for path in paths)
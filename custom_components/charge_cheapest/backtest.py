@@ -0,0 +1,446 @@
+"""Offline backtesting for Charge Cheapest integration.
+
+Historical prices are replayed through the same planning code the
+coordinator uses: the charging duration from SOC, capacity and power, and
+the cheapest slots of each night window from the window engine. A synthetic
+home consumes energy on an hourly load profile, the battery covers the load
+down to its minimum SOC, and every planned slot charges until the night
+target is reached, as the SOC watch does in Home Assistant.
+
+The charge plan strategy replays the SOC trajectory optimizer instead: at
+every night start the night, evening peak and minimum SOC targets are
+solved together over the prices known by then, with the household drain
+measured from the replayed SOC. Before each evening peak the peak forecast
+projects the SOC and charges the cheapest slots that close a remaining
+shortfall, holding them once started and stopping at the required SOC.
+
+Prices are loaded from the Tibber price service response format (YAML) or
+from a CSV file with ``start_time`` and ``price`` columns. The replay runs
+slot by slot on plain floats, so a year of quarter-hour prices takes well
+under a second per strategy.
+"""
+
+from __future__ import annotations
+
+import csv
+from array import array
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, time, timedelta, tzinfo
+from pathlib import Path
+from typing import Any
+
+from .compiled_config import CompiledConfig
+from .const import (
+    CHARGING_EFFICIENCY,
+    DRAIN_MIN_SAMPLE_HOURS,
+    DRAIN_WINDOW_HOURS,
+    PEAK_FORECAST_HORIZON_HOURS,
+    TIME_SLOT_SECONDS,
+)
+from .forecast import DrainEstimator, project_soc
+from .optimizer import SocTarget, charging_slots, optimize_charge_plan
+from .timeline import PriceTimeline, entry_price, entry_start
+from .window import ChargingWindow, WindowEngine
+
+STRATEGY_CONFIGURED = "configured"
+STRATEGY_CONTIGUOUS = "contiguous"
+STRATEGY_SPLIT = "split"
+STRATEGY_NIGHT_START = "night_start"
+STRATEGY_CHARGE_PLAN = "charge_plan"
+
+# Share of the daily consumption per local hour, a typical household curve
+DEFAULT_LOAD_PROFILE: tuple[float, ...] = (
+    2.5, 2.0, 2.0, 2.0, 2.0, 2.5, 4.0, 5.5, 5.0, 4.0, 3.5, 3.5,
+    4.0, 3.5, 3.5, 4.0, 5.0, 6.5, 7.5, 7.5, 6.5, 5.5, 4.5, 3.0,
+)  # fmt: skip
+
+# Planner: (engine, slots needed, first slot, end slot, config) -> segments
+Strategy = Callable[[WindowEngine, int, int, int, CompiledConfig], list[ChargingWindow]]
+
+
+@dataclass(frozen=True, slots=True)
+class HomeModel:
+    """Synthetic battery and household consumption."""
+
+    capacity_kwh: float = 10.0
+    charge_power_kw: float = 3.0
+    efficiency: float = CHARGING_EFFICIENCY
+    initial_soc: float = 50.0
+    min_soc: float = 10.0
+    daily_consumption_kwh: float = 10.0
+    load_profile: tuple[float, ...] = DEFAULT_LOAD_PROFILE
+
+    def hourly_load_kwh(self) -> tuple[float, ...]:
+        """Return the consumption (kWh) of each local hour."""
+        total = sum(self.load_profile)
+        return tuple(self.daily_consumption_kwh * weight / total for weight in self.load_profile)
+
+
+@dataclass(slots=True)
+class DayResult:
+    """Replay totals of one local calendar day.
+
+    ``target_hit`` refers to the night window starting on this day and is
+    None when no night was planned on it.
+    """
+
+    day: date
+    cost: float = 0.0
+    baseline_cost: float = 0.0
+    charged_kwh: float = 0.0
+    cycles: float = 0.0
+    target_hit: bool | None = None
+
+    @property
+    def savings(self) -> float:
+        """Return the saving against buying all consumption from the grid."""
+        return self.baseline_cost - self.cost
+
+
+@dataclass(slots=True)
+class BacktestResult:
+    """Per-day results of one strategy."""
+
+    strategy: str
+    days: list[DayResult] = field(default_factory=list)
+
+    @property
+    def cost(self) -> float:
+        """Return the total grid cost."""
+        return sum(day.cost for day in self.days)
+
+    @property
+    def savings(self) -> float:
+        """Return the total saving against buying all consumption from the grid."""
+        return sum(day.savings for day in self.days)
+
+    @property
+    def cycles(self) -> float:
+        """Return the total equivalent full battery cycles."""
+        return sum(day.cycles for day in self.days)
+
+    @property
+    def target_hit_rate(self) -> float | None:
+        """Return the share of nights that reached the night target."""
+        nights = [day.target_hit for day in self.days if day.target_hit is not None]
+        if not nights:
+            return None
+        return sum(nights) / len(nights)
+
+    def summary(self) -> dict[str, Any]:
+        """Return the totals as a flat dict."""
+        hit_rate = self.target_hit_rate
+        return {
+            "strategy": self.strategy,
+            "days": len(self.days),
+            "cost": round(self.cost, 2),
+            "savings": round(self.savings, 2),
+            "cycles": round(self.cycles, 1),
+            "target_hit_rate": None if hit_rate is None else round(hit_rate, 3),
+        }
+
+
+def _min_run_slots(config: CompiledConfig) -> int:
+    """Return the minimum split charging run in slots, as the coordinator does."""
+    return (config.min_charge_run_minutes * 60 / TIME_SLOT_SECONDS).__ceil__()
+
+
+def _plan_contiguous(engine: WindowEngine, slots: int, first: int, last: int, config: CompiledConfig) -> list[ChargingWindow]:
+    """Return the cheapest contiguous block."""
+    return engine.cheapest_segments(slots, first, last, max_runs=1)
+
+
+def _plan_split(engine: WindowEngine, slots: int, first: int, last: int, config: CompiledConfig) -> list[ChargingWindow]:
+    """Return the cheapest slots in the configured number of runs."""
+    return engine.cheapest_segments(slots, first, last, min_run=_min_run_slots(config), max_runs=max(1, config.max_charge_runs))
+
+
+def _plan_configured(engine: WindowEngine, slots: int, first: int, last: int, config: CompiledConfig) -> list[ChargingWindow]:
+    """Return the segments the coordinator would plan with this config."""
+    if config.split_charging_enabled:
+        return _plan_split(engine, slots, first, last, config)
+    return _plan_contiguous(engine, slots, first, last, config)
+
+
+def _plan_night_start(engine: WindowEngine, slots: int, first: int, last: int, config: CompiledConfig) -> list[ChargingWindow]:
+    """Return a block starting with the night window, as a plain timer would."""
+    slots = min(slots, last - first)
+    if slots <= 0:
+        return []
+    return [ChargingWindow(first, slots, engine.block_cost(first, slots))]
+
+
+STRATEGIES: dict[str, Strategy] = {
+    STRATEGY_CONFIGURED: _plan_configured,
+    STRATEGY_CONTIGUOUS: _plan_contiguous,
+    STRATEGY_SPLIT: _plan_split,
+    STRATEGY_NIGHT_START: _plan_night_start,
+}
+
+# Night window strategies and the charge plan, which replans the whole horizon
+ALL_STRATEGIES: tuple[str, ...] = (*STRATEGIES, STRATEGY_CHARGE_PLAN)
+
+
+def series_timeline(entries: Iterable[Any]) -> PriceTimeline:
+    """Return a quarter-hour timeline from time-ordered price entries.
+
+    Raises:
+        ValueError: If entries lack start times or are not evenly spaced
+    """
+    starts: list[float] = []
+    prices = array("d")
+    for entry in entries:
+        start = entry_start(entry)
+        if start is None:
+            raise ValueError(f"Price entry without start time: {entry!r}")
+        starts.append(start)
+        prices.append(entry_price(entry))
+
+    if len(starts) < 2:
+        raise ValueError("At least two price entries are needed")
+
+    resolution = int(round(starts[1] - starts[0]))
+    for index, start in enumerate(starts):
+        if start != starts[0] + index * resolution:
+            raise ValueError(f"Price series is not contiguous at {datetime.fromtimestamp(start, UTC).isoformat()}")
+
+    timeline = PriceTimeline(starts[0], resolution, prices, len(prices))
+    return timeline.resample(TIME_SLOT_SECONDS)
+
+
+def load_prices_yaml(path: str | Path, home: str | None = None) -> PriceTimeline:
+    """Load a Tibber price service response saved as YAML.
+
+    The file holds ``prices`` mapped per home to lists of ``start_time`` and
+    ``price`` entries; the first home is used unless ``home`` is given.
+    """
+    import yaml
+
+    with open(path, encoding="utf-8") as file:
+        document = yaml.safe_load(file)
+
+    prices = document.get("prices", document) if isinstance(document, Mapping) else document
+    if isinstance(prices, Mapping):
+        prices = prices[home] if home is not None else next(iter(prices.values()))
+    return series_timeline(prices)
+
+
+def load_prices_csv(path: str | Path) -> PriceTimeline:
+    """Load prices from a CSV file with a start time and a price column.
+
+    Column names follow the Tibber attributes, e.g. ``start_time``/``price``
+    or ``startsAt``/``total``.
+    """
+    with open(path, encoding="utf-8", newline="") as file:
+        return series_timeline(csv.DictReader(file))
+
+
+def _night_ranges(timeline: PriceTimeline, config: CompiledConfig, time_zone: tzinfo) -> dict[int, int]:
+    """Return the end slot of every night window inside the timeline by its start slot."""
+    night_start = time(config.night_start // 60, config.night_start % 60)
+    night_end = time(config.night_end // 60, config.night_end % 60)
+    wraps = config.night_end <= config.night_start
+
+    ranges: dict[int, int] = {}
+    day = datetime.fromtimestamp(timeline.start, time_zone).date()
+    while True:
+        start = datetime.combine(day, night_start, time_zone).timestamp()
+        end_day = day + timedelta(days=1) if wraps else day
+        end = datetime.combine(end_day, night_end, time_zone).timestamp()
+        if start >= timeline.end:
+            return ranges
+        if start >= timeline.start and end <= timeline.end:
+            ranges[timeline.index_at(start)] = timeline.index_at(end)
+        day += timedelta(days=1)
+
+
+def _daily_slots(timeline: PriceTimeline, minute: int, time_zone: tzinfo) -> list[int]:
+    """Return the slot of a local minute of day on every day inside the timeline."""
+    at = time(minute // 60, minute % 60)
+    slots: list[int] = []
+    day = datetime.fromtimestamp(timeline.start, time_zone).date()
+    while True:
+        timestamp = datetime.combine(day, at, time_zone).timestamp()
+        if timestamp >= timeline.end:
+            return slots
+        if timestamp >= timeline.start:
+            slots.append(timeline.index_at(timestamp))
+        day += timedelta(days=1)
+
+
+def _in_window(minute: int, start: int, end: int) -> bool:
+    """Return whether a minute of day lies in [start, end), wrapping midnight."""
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end
+
+
+def _plan_horizon(
+    timeline: PriceTimeline,
+    first: int,
+    last: int,
+    soc: float,
+    soc_per_slot: float,
+    drain_per_slot: float,
+    config: CompiledConfig,
+    time_zone: tzinfo,
+) -> list[ChargingWindow]:
+    """Return the charge plan over [first, last), as the coordinator solves it."""
+    slot_minutes = timeline.resolution // 60
+    targets: list[SocTarget] = []
+    allowed: list[bool] = []
+    for slot in range(last - first):
+        local = datetime.fromtimestamp(timeline.slot_start(first + slot), time_zone)
+        minute = local.hour * 60 + local.minute
+        day = config.day_schedule_enabled and _in_window(minute, config.day_start, config.day_end)
+        allowed.append(day or _in_window(minute, config.night_start, config.night_end))
+        if minute <= config.night_end < minute + slot_minutes:
+            targets.append(SocTarget(slot, config.night_target_soc))
+        if minute <= config.evening_peak_start < minute + slot_minutes:
+            targets.append(SocTarget(slot, config.evening_peak_target_soc))
+
+    plan = optimize_charge_plan(
+        timeline.prices[first:last],
+        soc,
+        soc_per_slot,
+        targets,
+        floor_soc=config.minimum_soc_floor,
+        allowed=allowed,
+        drain_per_slot=drain_per_slot,
+    )
+    return [ChargingWindow(first + segment.start_index, segment.slots, segment.cost) for segment in plan.segments]
+
+
+def run_backtest(
+    timeline: PriceTimeline,
+    config: CompiledConfig,
+    home: HomeModel,
+    time_zone: tzinfo,
+    strategy: str = STRATEGY_CONFIGURED,
+) -> BacktestResult:
+    """Replay a price series with one planning strategy.
+
+    Each night is planned at the night start from the SOC at that time,
+    toward the night target, over the slots of the night window. The charge
+    plan strategy instead replans the prices known at the night start, up
+    to the end of the next day, and adds the evening peak forecast.
+
+    Args:
+        timeline: Contiguous quarter-hour prices
+        config: Integration settings, e.g. from ``CompiledConfig.from_mapping``
+        home: Battery and consumption model
+        time_zone: Local time zone of the schedule times
+        strategy: Key of ``STRATEGIES`` or ``STRATEGY_CHARGE_PLAN``
+
+    Returns:
+        The per-day results
+    """
+    charge_plan = strategy == STRATEGY_CHARGE_PLAN
+    plan = _plan_configured if charge_plan else STRATEGIES[strategy]
+    prices = timeline.prices
+    engine = WindowEngine(prices)
+    nights = _night_ranges(timeline, config, time_zone)
+
+    slot_hours = timeline.resolution / 3600
+    hourly_load = [load * slot_hours for load in home.hourly_load_kwh()]
+    capacity = home.capacity_kwh
+    stored_per_slot = home.charge_power_kw * slot_hours * home.efficiency
+    soc_per_slot = stored_per_slot / capacity * 100
+    target = config.night_target_soc
+
+    # Charge plan state: measured drain, upcoming peaks and held pre-peak segments
+    drain = DrainEstimator(DRAIN_WINDOW_HOURS * 3600, DRAIN_MIN_SAMPLE_HOURS * 3600)
+    peaks = _daily_slots(timeline, config.evening_peak_start, time_zone) if charge_plan else []
+    peak_horizon = int(PEAK_FORECAST_HORIZON_HOURS * 3600 / timeline.resolution)
+    peak_target = config.evening_peak_target_soc
+    held_until = 0
+
+    def no_solar(start: float, end: float) -> float:
+        return 0.0
+
+    result = BacktestResult(strategy)
+    # SOC (%) up to which each slot charges, 0 for no charging
+    limits = [0.0] * len(prices)
+    soc = home.initial_soc
+    night: DayResult | None = None
+    night_end = -1
+    today: DayResult | None = None
+    day_end = timeline.start
+
+    for index, price in enumerate(prices):
+        timestamp = timeline.slot_start(index)
+        local = datetime.fromtimestamp(timestamp, time_zone)
+        if timestamp >= day_end:
+            today = DayResult(local.date())
+            result.days.append(today)
+            midnight = datetime.combine(local.date() + timedelta(days=1), time(), time_zone)
+            day_end = midnight.timestamp()
+
+        if index in nights:
+            night_end = nights[index]
+            night = today
+            night.target_hit = soc >= target
+            if charge_plan:
+                # Prices are known up to the end of the next day
+                horizon = datetime.combine(local.date() + timedelta(days=2), time(), time_zone).timestamp()
+                last = timeline.index_at(min(horizon, timeline.end))
+                rate = drain.rate(no_solar) or 0.0
+                limits[max(index, held_until) : last] = [0.0] * (last - max(index, held_until))
+                for segment in _plan_horizon(timeline, index, last, soc, soc_per_slot, rate * slot_hours, config, time_zone):
+                    limits[segment.start_index : segment.end_index] = [100.0] * segment.slots
+            else:
+                slots = charging_slots(soc, target, capacity, home.charge_power_kw, home.efficiency, slot_hours)
+                for segment in plan(engine, slots, index, night_end, config) if slots else ():
+                    limits[segment.start_index : segment.end_index] = [target] * segment.slots
+
+        while peaks and peaks[0] <= index:
+            peaks.pop(0)
+        if peaks and index >= held_until and peaks[0] - index <= peak_horizon:
+            # Project SOC to the peak and close a shortfall with the cheapest slots before it
+            rate = drain.rate(no_solar)
+            if rate is not None:
+                peak_start = timeline.slot_start(peaks[0])
+                shortfall = peak_target - project_soc(soc, timestamp, peak_start, rate, no_solar)
+                slots = min(round(shortfall / soc_per_slot, 9).__ceil__(), peaks[0] - index)
+                segments = plan(engine, slots, index, peaks[0], config) if slots > 0 else []
+                if segments and segments[0].start_index == index:
+                    stop_soc = min(100.0, soc + shortfall)
+                    for segment in segments:
+                        for slot in range(segment.start_index, segment.end_index):
+                            limits[slot] = max(limits[slot], stop_soc)
+                    held_until = segments[-1].end_index
+
+        load = hourly_load[local.hour]
+        grid = load
+        limit = limits[index]
+        if soc < limit:
+            stored = min(stored_per_slot, (limit - soc) / 100 * capacity)
+            soc += stored / capacity * 100
+            grid += stored / home.efficiency
+            today.charged_kwh += stored / home.efficiency
+            today.cycles += stored / capacity
+            drain.add(timestamp + timeline.resolution, soc, True)
+        else:
+            used = min(load, max(0.0, (soc - home.min_soc) / 100 * capacity))
+            soc -= used / capacity * 100
+            grid -= used
+            drain.add(timestamp + timeline.resolution, soc, False)
+
+        today.cost += grid * price
+        today.baseline_cost += load * price
+        if night is not None and index < night_end and soc >= target - 1e-9:
+            night.target_hit = True
+
+    return result
+
+
+def compare_strategies(
+    timeline: PriceTimeline,
+    config: CompiledConfig,
+    home: HomeModel,
+    time_zone: tzinfo,
+    strategies: Iterable[str] = ALL_STRATEGIES,
+) -> dict[str, BacktestResult]:
+    """Replay a price series with several strategies."""
+    return {strategy: run_backtest(timeline, config, home, time_zone, strategy) for strategy in strategies}
@@ -13,7 +13,6 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTR_CURRENT_SOC,
@@ -21,6 +20,7 @@ from .const import (
     DOMAIN,
 )
 from .coordinator import TibberCheapestChargingCoordinator
+from .entity import TibberCheapestChargingEntity
 
 
 @dataclass(frozen=True)
@@ -84,9 +84,7 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class TibberCheapestChargingBinarySensor(
-    CoordinatorEntity[TibberCheapestChargingCoordinator], BinarySensorEntity
-):
+class TibberCheapestChargingBinarySensor(TibberCheapestChargingEntity, BinarySensorEntity):
     """Representation of a Charge Cheapest binary sensor."""
 
     entity_description: TibberCheapestChargingBinarySensorEntityDescription
@@ -0,0 +1,243 @@
+"""Compiled configuration snapshot for Charge Cheapest integration.
+
+A config entry stores its settings as a merged ``data``/``options`` dict with
+time strings. The coordinator reads those settings on every refresh, so they
+are compiled once per entry load into an immutable object with typed values
+and times as minutes since midnight.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    CONF_BATTERY_CAPACITY_SENSOR,
+    CONF_BATTERY_CHARGING_POWER,
+    CONF_BATTERY_CHARGING_SWITCH,
+    CONF_BATTERY_SOC_SENSOR,
+    CONF_CHARGE_CONTROL,
+    CONF_CHARGING_DURATION_HOURS,
+    CONF_DAY_END_TIME,
+    CONF_DAY_SCHEDULE_ENABLED,
+    CONF_DAY_START_TIME,
+    CONF_DAY_TARGET_SOC,
+    CONF_DEFAULT_CHARGE_DURATION,
+    CONF_DEFAULT_CHARGE_START_TIME,
+    CONF_EVENING_PEAK_END,
+    CONF_EVENING_PEAK_START,
+    CONF_EVENING_PEAK_TARGET_SOC,
+    CONF_EVENT_DRIVEN_UPDATES,
+    CONF_FAILURE_BEHAVIOR,
+    CONF_FORECAST_MODE_AUTOMATIC,
+    CONF_MAX_CHARGE_RUNS,
+    CONF_MIN_CHARGE_RUN_MINUTES,
+    CONF_MINIMUM_SOC_FLOOR,
+    CONF_MORNING_CONSUMPTION_KWH,
+    CONF_NIGHT_END_TIME,
+    CONF_NIGHT_START_TIME,
+    CONF_NIGHT_TARGET_SOC,
+    CONF_NOTIFY_CHARGING_COMPLETED,
+    CONF_NOTIFY_CHARGING_ERROR,
+    CONF_NOTIFY_CHARGING_SCHEDULED,
+    CONF_NOTIFY_CHARGING_SKIPPED,
+    CONF_NOTIFY_CHARGING_STARTED,
+    CONF_NOTIFY_EMERGENCY_CHARGING,
+    CONF_PRICE_SENSOR,
+    CONF_REPLAN_SOC_DRIFT,
+    CONF_SLOW_REFRESH_WARNING_MS,
+    CONF_SOC_OFFSET_KWH,
+    CONF_SOC_STOP_HYSTERESIS,
+    CONF_SOLAR_FORECAST_ENABLED,
+    CONF_SOLAR_FORECAST_SENSOR,
+    CONF_SPLIT_CHARGING_ENABLED,
+    CONF_TARGET_SOC,
+    CONF_TRIGGER_TIME,
+    DEFAULT_CHARGE_CONTROL,
+    DEFAULT_CHARGING_DURATION_HOURS,
+    DEFAULT_DAY_END_TIME,
+    DEFAULT_DAY_SCHEDULE_ENABLED,
+    DEFAULT_DAY_START_TIME,
+    DEFAULT_DAY_TARGET_SOC,
+    DEFAULT_DEFAULT_CHARGE_DURATION,
+    DEFAULT_DEFAULT_CHARGE_START_TIME,
+    DEFAULT_EVENING_PEAK_END,
+    DEFAULT_EVENING_PEAK_START,
+    DEFAULT_EVENING_PEAK_TARGET_SOC,
+    DEFAULT_EVENT_DRIVEN_UPDATES,
+    DEFAULT_FAILURE_BEHAVIOR,
+    DEFAULT_FORECAST_MODE_AUTOMATIC,
+    DEFAULT_MAX_CHARGE_RUNS,
+    DEFAULT_MIN_CHARGE_RUN_MINUTES,
+    DEFAULT_MINIMUM_SOC_FLOOR,
+    DEFAULT_MORNING_CONSUMPTION_KWH,
+    DEFAULT_NIGHT_END_TIME,
+    DEFAULT_NIGHT_START_TIME,
+    DEFAULT_NIGHT_TARGET_SOC,
+    DEFAULT_NOTIFY_CHARGING_COMPLETED,
+    DEFAULT_NOTIFY_CHARGING_ERROR,
+    DEFAULT_NOTIFY_CHARGING_SCHEDULED,
+    DEFAULT_NOTIFY_CHARGING_SKIPPED,
+    DEFAULT_NOTIFY_CHARGING_STARTED,
+    DEFAULT_NOTIFY_EMERGENCY_CHARGING,
+    DEFAULT_REPLAN_SOC_DRIFT,
+    DEFAULT_SLOW_REFRESH_WARNING_MS,
+    DEFAULT_SOC_OFFSET_KWH,
+    DEFAULT_SOC_STOP_HYSTERESIS,
+    DEFAULT_SOLAR_FORECAST_ENABLED,
+    DEFAULT_SPLIT_CHARGING_ENABLED,
+    DEFAULT_TARGET_SOC,
+    DEFAULT_TRIGGER_TIME,
+)
+
+MINUTES_PER_DAY = 1440
+
+
+def parse_time_minutes(value: Any) -> int:
+    """Convert a time value to minutes since midnight.
+
+    Accepts ``HH:MM[:SS]`` strings, TimeSelector dicts and ``datetime.time``.
+    """
+    if isinstance(value, dict):
+        return value.get("hour", 0) * 60 + value.get("minute", 0)
+    if hasattr(value, "hour") and hasattr(value, "minute"):
+        return value.hour * 60 + value.minute
+    if ":" in str(value):
+        parts = str(value).split(":")
+        return int(parts[0]) * 60 + (int(parts[1]) if len(parts) > 1 else 0)
+    return 0
+
+
+def format_minutes(minutes: int) -> str:
+    """Format minutes since midnight as HH:MM:SS, wrapping past midnight."""
+    minutes %= MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}:00"
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledConfig:
+    """Typed, immutable view of a config entry's data and options."""
+
+    # Entities
+    price_sensor: str | None
+    battery_soc_sensor: str | None
+    battery_charging_switch: str | None
+    battery_capacity_sensor: str | None
+    battery_charging_power: str | None
+    solar_forecast_sensor: str | None
+
+    # Schedule times in minutes since midnight
+    night_start: int
+    night_end: int
+    day_schedule_enabled: bool
+    day_start: int
+    day_end: int
+    evening_peak_start: int
+    evening_peak_end: int
+    trigger_time: int
+
+    # SOC targets (%)
+    night_target_soc: int
+    day_target_soc: int
+    evening_peak_target_soc: int
+    target_soc: int
+    minimum_soc_floor: int
+
+    # Charging behavior
+    charging_duration_hours: float
+    failure_behavior: str
+    charge_control: str
+    default_charge_start: int
+    default_charge_duration: float
+    split_charging_enabled: bool
+    min_charge_run_minutes: int
+    max_charge_runs: int
+    soc_stop_hysteresis: float
+    replan_soc_drift: float
+
+    # Notifications
+    notify_charging_scheduled: bool
+    notify_charging_started: bool
+    notify_charging_completed: bool
+    notify_charging_skipped: bool
+    notify_charging_error: bool
+    notify_emergency_charging: bool
+
+    # Solar forecast
+    solar_forecast_enabled: bool
+    forecast_mode_automatic: bool
+    morning_consumption_kwh: float
+    soc_offset_kwh: float
+
+    # Updates
+    event_driven_updates: bool
+    slow_refresh_warning_ms: float
+
+    @property
+    def source_entities(self) -> tuple[str, ...]:
+        """Return the configured entities whose state feeds the calculations."""
+        return tuple(
+            entity_id
+            for entity_id in (
+                self.price_sensor,
+                self.battery_soc_sensor,
+                self.battery_charging_switch,
+                self.battery_capacity_sensor,
+                self.battery_charging_power,
+                self.solar_forecast_sensor,
+            )
+            if entity_id
+        )
+
+    @classmethod
+    def from_mapping(cls, config: Mapping[str, Any]) -> CompiledConfig:
+        """Compile a merged config entry ``data``/``options`` mapping."""
+
+        def get(key: str, default: Any = None) -> Any:
+            value = config.get(key)
+            return default if value is None else value
+
+        return cls(
+            price_sensor=get(CONF_PRICE_SENSOR) or None,
+            battery_soc_sensor=get(CONF_BATTERY_SOC_SENSOR) or None,
+            battery_charging_switch=get(CONF_BATTERY_CHARGING_SWITCH) or None,
+            battery_capacity_sensor=get(CONF_BATTERY_CAPACITY_SENSOR) or None,
+            battery_charging_power=get(CONF_BATTERY_CHARGING_POWER) or None,
+            solar_forecast_sensor=get(CONF_SOLAR_FORECAST_SENSOR) or None,
+            night_start=parse_time_minutes(get(CONF_NIGHT_START_TIME, DEFAULT_NIGHT_START_TIME)),
+            night_end=parse_time_minutes(get(CONF_NIGHT_END_TIME, DEFAULT_NIGHT_END_TIME)),
+            day_schedule_enabled=bool(get(CONF_DAY_SCHEDULE_ENABLED, DEFAULT_DAY_SCHEDULE_ENABLED)),
+            day_start=parse_time_minutes(get(CONF_DAY_START_TIME, DEFAULT_DAY_START_TIME)),
+            day_end=parse_time_minutes(get(CONF_DAY_END_TIME, DEFAULT_DAY_END_TIME)),
+            evening_peak_start=parse_time_minutes(get(CONF_EVENING_PEAK_START, DEFAULT_EVENING_PEAK_START)),
+            evening_peak_end=parse_time_minutes(get(CONF_EVENING_PEAK_END, DEFAULT_EVENING_PEAK_END)),
+            trigger_time=parse_time_minutes(get(CONF_TRIGGER_TIME, DEFAULT_TRIGGER_TIME)),
+            night_target_soc=int(get(CONF_NIGHT_TARGET_SOC, DEFAULT_NIGHT_TARGET_SOC)),
+            day_target_soc=int(get(CONF_DAY_TARGET_SOC, DEFAULT_DAY_TARGET_SOC)),
+            evening_peak_target_soc=int(get(CONF_EVENING_PEAK_TARGET_SOC, DEFAULT_EVENING_PEAK_TARGET_SOC)),
+            target_soc=int(get(CONF_TARGET_SOC, DEFAULT_TARGET_SOC)),
+            minimum_soc_floor=int(get(CONF_MINIMUM_SOC_FLOOR, DEFAULT_MINIMUM_SOC_FLOOR)),
+            charging_duration_hours=float(get(CONF_CHARGING_DURATION_HOURS, DEFAULT_CHARGING_DURATION_HOURS)),
+            failure_behavior=str(get(CONF_FAILURE_BEHAVIOR, DEFAULT_FAILURE_BEHAVIOR)),
+            charge_control=str(get(CONF_CHARGE_CONTROL, DEFAULT_CHARGE_CONTROL)),
+            default_charge_start=parse_time_minutes(get(CONF_DEFAULT_CHARGE_START_TIME, DEFAULT_DEFAULT_CHARGE_START_TIME)),
+            default_charge_duration=float(get(CONF_DEFAULT_CHARGE_DURATION, DEFAULT_DEFAULT_CHARGE_DURATION)),
+            split_charging_enabled=bool(get(CONF_SPLIT_CHARGING_ENABLED, DEFAULT_SPLIT_CHARGING_ENABLED)),
+            min_charge_run_minutes=int(get(CONF_MIN_CHARGE_RUN_MINUTES, DEFAULT_MIN_CHARGE_RUN_MINUTES)),
+            max_charge_runs=int(get(CONF_MAX_CHARGE_RUNS, DEFAULT_MAX_CHARGE_RUNS)),
+            soc_stop_hysteresis=float(get(CONF_SOC_STOP_HYSTERESIS, DEFAULT_SOC_STOP_HYSTERESIS)),
+            replan_soc_drift=float(get(CONF_REPLAN_SOC_DRIFT, DEFAULT_REPLAN_SOC_DRIFT)),
+            notify_charging_scheduled=bool(get(CONF_NOTIFY_CHARGING_SCHEDULED, DEFAULT_NOTIFY_CHARGING_SCHEDULED)),
+            notify_charging_started=bool(get(CONF_NOTIFY_CHARGING_STARTED, DEFAULT_NOTIFY_CHARGING_STARTED)),
+            notify_charging_completed=bool(get(CONF_NOTIFY_CHARGING_COMPLETED, DEFAULT_NOTIFY_CHARGING_COMPLETED)),
+            notify_charging_skipped=bool(get(CONF_NOTIFY_CHARGING_SKIPPED, DEFAULT_NOTIFY_CHARGING_SKIPPED)),
+            notify_charging_error=bool(get(CONF_NOTIFY_CHARGING_ERROR, DEFAULT_NOTIFY_CHARGING_ERROR)),
+            notify_emergency_charging=bool(get(CONF_NOTIFY_EMERGENCY_CHARGING, DEFAULT_NOTIFY_EMERGENCY_CHARGING)),
+            solar_forecast_enabled=bool(get(CONF_SOLAR_FORECAST_ENABLED, DEFAULT_SOLAR_FORECAST_ENABLED)),
+            forecast_mode_automatic=bool(get(CONF_FORECAST_MODE_AUTOMATIC, DEFAULT_FORECAST_MODE_AUTOMATIC)),
+            morning_consumption_kwh=float(get(CONF_MORNING_CONSUMPTION_KWH, DEFAULT_MORNING_CONSUMPTION_KWH)),
+            soc_offset_kwh=float(get(CONF_SOC_OFFSET_KWH, DEFAULT_SOC_OFFSET_KWH)),
+            event_driven_updates=bool(get(CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES)),
+            slow_refresh_warning_ms=float(get(CONF_SLOW_REFRESH_WARNING_MS, DEFAULT_SLOW_REFRESH_WARNING_MS)),
+        )
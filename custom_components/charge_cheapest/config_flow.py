@@ -12,10 +12,12 @@ from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
 from .const import (
+    CHARGE_CONTROLS,
     CONF_BATTERY_CAPACITY_SENSOR,
     CONF_BATTERY_CHARGING_POWER,
     CONF_BATTERY_CHARGING_SWITCH,
     CONF_BATTERY_SOC_SENSOR,
+    CONF_CHARGE_CONTROL,
     CONF_CHARGING_DURATION_HOURS,
     CONF_DAY_END_TIME,
     CONF_DAY_SCHEDULE_ENABLED,
@@ -26,8 +28,11 @@ from .const import (
     CONF_EVENING_PEAK_END,
     CONF_EVENING_PEAK_START,
     CONF_EVENING_PEAK_TARGET_SOC,
+    CONF_EVENT_DRIVEN_UPDATES,
     CONF_FAILURE_BEHAVIOR,
     CONF_FORECAST_MODE_AUTOMATIC,
+    CONF_MAX_CHARGE_RUNS,
+    CONF_MIN_CHARGE_RUN_MINUTES,
     CONF_MINIMUM_SOC_FLOOR,
     CONF_MORNING_CONSUMPTION_KWH,
     CONF_NIGHT_END_TIME,
@@ -41,11 +46,16 @@ from .const import (
     CONF_NOTIFY_CHARGING_STARTED,
     CONF_NOTIFY_EMERGENCY_CHARGING,
     CONF_PRICE_SENSOR,
+    CONF_REPLAN_SOC_DRIFT,
+    CONF_SLOW_REFRESH_WARNING_MS,
     CONF_SOC_OFFSET_KWH,
+    CONF_SOC_STOP_HYSTERESIS,
     CONF_SOLAR_FORECAST_ENABLED,
     CONF_SOLAR_FORECAST_SENSOR,
+    CONF_SPLIT_CHARGING_ENABLED,
     CONF_TARGET_SOC,
     CONF_TRIGGER_TIME,
+    DEFAULT_CHARGE_CONTROL,
     DEFAULT_CHARGING_DURATION_HOURS,
     DEFAULT_DAY_END_TIME,
     DEFAULT_DAY_SCHEDULE_ENABLED,
@@ -56,8 +66,11 @@ from .const import (
     DEFAULT_EVENING_PEAK_END,
     DEFAULT_EVENING_PEAK_START,
     DEFAULT_EVENING_PEAK_TARGET_SOC,
+    DEFAULT_EVENT_DRIVEN_UPDATES,
     DEFAULT_FAILURE_BEHAVIOR,
     DEFAULT_FORECAST_MODE_AUTOMATIC,
+    DEFAULT_MAX_CHARGE_RUNS,
+    DEFAULT_MIN_CHARGE_RUN_MINUTES,
     DEFAULT_MINIMUM_SOC_FLOOR,
     DEFAULT_MORNING_CONSUMPTION_KWH,
     DEFAULT_NIGHT_END_TIME,
@@ -70,8 +83,12 @@ from .const import (
     DEFAULT_NOTIFY_CHARGING_SKIPPED,
     DEFAULT_NOTIFY_CHARGING_STARTED,
     DEFAULT_NOTIFY_EMERGENCY_CHARGING,
+    DEFAULT_REPLAN_SOC_DRIFT,
+    DEFAULT_SLOW_REFRESH_WARNING_MS,
     DEFAULT_SOC_OFFSET_KWH,
+    DEFAULT_SOC_STOP_HYSTERESIS,
     DEFAULT_SOLAR_FORECAST_ENABLED,
+    DEFAULT_SPLIT_CHARGING_ENABLED,
     DEFAULT_TARGET_SOC,
     DEFAULT_TRIGGER_TIME,
     DOMAIN,
@@ -496,6 +513,18 @@ class TibberCheapestChargingOptionsFlow(config_entries.OptionsFlow):
                             mode="dropdown",
                         )
                     ),
+                    # Charge control
+                    vol.Optional(
+                        CONF_CHARGE_CONTROL,
+                        default=current_data.get(
+                            CONF_CHARGE_CONTROL, DEFAULT_CHARGE_CONTROL
+                        ),
+                    ): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=CHARGE_CONTROLS,
+                            mode="dropdown",
+                        )
+                    ),
                     vol.Optional(
                         CONF_CHARGING_DURATION_HOURS,
                         default=current_data.get(
@@ -516,6 +545,70 @@ class TibberCheapestChargingOptionsFlow(config_entries.OptionsFlow):
                             min=0.5, max=8, step=0.5, unit_of_measurement="h", mode="slider"
                         )
                     ),
+                    # Split charging
+                    vol.Optional(
+                        CONF_SPLIT_CHARGING_ENABLED,
+                        default=current_data.get(
+                            CONF_SPLIT_CHARGING_ENABLED, DEFAULT_SPLIT_CHARGING_ENABLED
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_MIN_CHARGE_RUN_MINUTES,
+                        default=current_data.get(
+                            CONF_MIN_CHARGE_RUN_MINUTES, DEFAULT_MIN_CHARGE_RUN_MINUTES
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=15, max=240, step=15, unit_of_measurement="min", mode="slider"
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_MAX_CHARGE_RUNS,
+                        default=current_data.get(
+                            CONF_MAX_CHARGE_RUNS, DEFAULT_MAX_CHARGE_RUNS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1, max=8, step=1, mode="slider"
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_SOC_STOP_HYSTERESIS,
+                        default=current_data.get(
+                            CONF_SOC_STOP_HYSTERESIS, DEFAULT_SOC_STOP_HYSTERESIS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=0, max=10, step=1, unit_of_measurement="%", mode="slider"
+                        )
+                    ),
+                    vol.Optional(
+                        CONF_REPLAN_SOC_DRIFT,
+                        default=current_data.get(
+                            CONF_REPLAN_SOC_DRIFT, DEFAULT_REPLAN_SOC_DRIFT
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=1, max=25, step=1, unit_of_measurement="%", mode="slider"
+                        )
+                    ),
+                    # Update behavior
+                    vol.Optional(
+                        CONF_EVENT_DRIVEN_UPDATES,
+                        default=current_data.get(
+                            CONF_EVENT_DRIVEN_UPDATES, DEFAULT_EVENT_DRIVEN_UPDATES
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Optional(
+                        CONF_SLOW_REFRESH_WARNING_MS,
+                        default=current_data.get(
+                            CONF_SLOW_REFRESH_WARNING_MS, DEFAULT_SLOW_REFRESH_WARNING_MS
+                        ),
+                    ): selector.NumberSelector(
+                        selector.NumberSelectorConfig(
+                            min=10, max=5000, step=10, unit_of_measurement="ms", mode="box"
+                        )
+                    ),
                     # Recreate Dashboard button
                     vol.Optional("recreate_dashboard", default=False): selector.BooleanSelector(),
                 }
@@ -526,18 +619,26 @@ class TibberCheapestChargingOptionsFlow(config_entries.OptionsFlow):
     async def _trigger_dashboard_recreation(self) -> None:
         """Trigger dashboard recreation service."""
         try:
-            await self.hass.services.async_call(
+            response = await self.hass.services.async_call(
                 DOMAIN,
                 SERVICE_RECREATE_DASHBOARD,
                 {},
+                blocking=True,
+                return_response=True,
             )
+            if (response or {}).get("changed"):
+                title = "Dashboard Recreated"
+                message = "The Charge Cheapest dashboard has been recreated successfully."
+            else:
+                title = "Dashboard Up To Date"
+                message = "The Charge Cheapest dashboard already matches the default configuration."
             # Show success notification
             await self.hass.services.async_call(
                 "persistent_notification",
                 "create",
                 {
-                    "title": "Dashboard Recreated",
-                    "message": "The Charge Cheapest dashboard has been recreated successfully.",
+                    "title": title,
+                    "message": message,
                     "notification_id": "charge_cheapest_dashboard_recreated",
                 },
             )
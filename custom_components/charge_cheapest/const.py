@@ -38,8 +38,14 @@ CONF_TARGET_SOC: Final = "target_soc"
 CONF_CHARGING_DURATION_HOURS: Final = "charging_duration_hours"
 CONF_TRIGGER_TIME: Final = "trigger_time"
 CONF_FAILURE_BEHAVIOR: Final = "failure_behavior"
+CONF_CHARGE_CONTROL: Final = "charge_control"
 CONF_DEFAULT_CHARGE_START_TIME: Final = "default_charge_start_time"
 CONF_DEFAULT_CHARGE_DURATION: Final = "default_charge_duration"
+CONF_SPLIT_CHARGING_ENABLED: Final = "split_charging_enabled"
+CONF_MIN_CHARGE_RUN_MINUTES: Final = "min_charge_run_minutes"
+CONF_MAX_CHARGE_RUNS: Final = "max_charge_runs"
+CONF_SOC_STOP_HYSTERESIS: Final = "soc_stop_hysteresis"
+CONF_REPLAN_SOC_DRIFT: Final = "replan_soc_drift"
 
 # Configuration keys - Notifications
 CONF_NOTIFICATION_SERVICE: Final = "notification_service"
@@ -57,6 +63,10 @@ CONF_MORNING_CONSUMPTION_KWH: Final = "morning_consumption_kwh"
 CONF_SOC_OFFSET_KWH: Final = "soc_offset_kwh"
 CONF_MINIMUM_SOC_FLOOR: Final = "minimum_soc_floor"
 
+# Configuration keys - Updates
+CONF_EVENT_DRIVEN_UPDATES: Final = "event_driven_updates"
+CONF_SLOW_REFRESH_WARNING_MS: Final = "slow_refresh_warning_ms"
+
 # Default values - Schedule times
 DEFAULT_NIGHT_START_TIME: Final = "23:00:00"
 DEFAULT_NIGHT_END_TIME: Final = "06:00:00"
@@ -79,6 +89,12 @@ DEFAULT_CHARGING_DURATION_HOURS: Final = 3.0
 DEFAULT_DEFAULT_CHARGE_DURATION: Final = 3.0
 DEFAULT_DAY_SCHEDULE_ENABLED: Final = False
 DEFAULT_FAILURE_BEHAVIOR: Final = "skip_charging"
+DEFAULT_CHARGE_CONTROL: Final = "blueprint"
+DEFAULT_SPLIT_CHARGING_ENABLED: Final = False
+DEFAULT_MIN_CHARGE_RUN_MINUTES: Final = 30
+DEFAULT_MAX_CHARGE_RUNS: Final = 3
+DEFAULT_SOC_STOP_HYSTERESIS: Final = 2
+DEFAULT_REPLAN_SOC_DRIFT: Final = 5
 
 # Default values - Notifications
 DEFAULT_NOTIFICATION_SERVICE: Final = "persistent_notification.create"
@@ -95,6 +111,10 @@ DEFAULT_FORECAST_MODE_AUTOMATIC: Final = False
 DEFAULT_MORNING_CONSUMPTION_KWH: Final = 3.0
 DEFAULT_SOC_OFFSET_KWH: Final = 0.0
 
+# Default values - Updates
+DEFAULT_EVENT_DRIVEN_UPDATES: Final = True
+DEFAULT_SLOW_REFRESH_WARNING_MS: Final = 250
+
 # Failure behavior options
 FAILURE_BEHAVIOR_SKIP: Final = "skip_charging"
 FAILURE_BEHAVIOR_DEFAULT_WINDOW: Final = "use_default_window"
@@ -106,6 +126,17 @@ FAILURE_BEHAVIORS: Final = [
     FAILURE_BEHAVIOR_CHARGE_IMMEDIATELY,
 ]
 
+# Charge control options
+CHARGE_CONTROL_BLUEPRINT: Final = "blueprint"
+CHARGE_CONTROL_WINDOWS: Final = "windows"
+CHARGE_CONTROL_PLAN: Final = "plan"
+
+CHARGE_CONTROLS: Final = [
+    CHARGE_CONTROL_BLUEPRINT,
+    CHARGE_CONTROL_WINDOWS,
+    CHARGE_CONTROL_PLAN,
+]
+
 # Charging status states
 STATUS_IDLE: Final = "idle"
 STATUS_SCHEDULED: Final = "scheduled"
@@ -116,17 +147,55 @@ STATUS_ERROR: Final = "error"
 # Coordinator update interval (minutes)
 COORDINATOR_UPDATE_INTERVAL: Final = 5
 
+# Fallback update interval when refreshing on state changes (minutes)
+SAFETY_UPDATE_INTERVAL: Final = 30
+
+# Cooldown between state-change triggered refreshes (seconds)
+REFRESH_DEBOUNCE_SECONDS: Final = 10
+
+# Refreshes kept for the per-stage timing percentiles
+STAGE_TIMING_SAMPLES: Final = 100
+
+# Switch actions of the charge scheduler kept for diagnostics
+EXECUTOR_ACTION_HISTORY: Final = 20
+
+# Persisted plan storage
+STORAGE_VERSION: Final = 1
+STORAGE_SAVE_DELAY_SECONDS: Final = 30
+STORED_PLAN_MAX_AGE_HOURS: Final = 24
+
 # Efficiency factor for charging calculations
 CHARGING_EFFICIENCY: Final = 0.95
 
 # Time slot granularity (15 minutes = 0.25 hours)
 TIME_SLOT_HOURS: Final = 0.25
+TIME_SLOT_SECONDS: Final = 900
+
+# Longest window in the precomputed duration cost table (8 hours)
+MAX_TABLE_SLOTS: Final = 32
 
 # Emergency check buffer (minutes before evening peak)
 EMERGENCY_CHECK_BUFFER_MINUTES: Final = 60
 
+# Evening peak forecast look-ahead and drain measurement (hours)
+PEAK_FORECAST_HORIZON_HOURS: Final = 12
+DRAIN_WINDOW_HOURS: Final = 3
+DRAIN_MIN_SAMPLE_HOURS: Final = 0.5
+
+# Daylight used for the solar profile when sunrise and sunset are unknown (minutes of day)
+FALLBACK_SUNRISE_MINUTES: Final = 6 * 60
+FALLBACK_SUNSET_MINUTES: Final = 20 * 60
+
 # Service names
 SERVICE_RECREATE_DASHBOARD: Final = "recreate_dashboard"
+SERVICE_GET_WINDOW_COSTS: Final = "get_window_costs"
+SERVICE_PROFILE: Final = "profile"
+
+# Functions listed in the profile service response
+PROFILE_HOTSPOTS: Final = 20
+
+# hass.data key caching the macro probe for the current Home Assistant run
+DATA_MACRO_AVAILABLE: Final = f"{DOMAIN}_macro_available"
 
 # Dashboard configuration
 DASHBOARD_URL_PATH: Final = "charge-cheapest"
@@ -140,6 +209,11 @@ DEVICE_MODEL: Final = "Smart Battery Charging"
 ATTR_NEXT_WINDOW_START: Final = "next_window_start"
 ATTR_NEXT_WINDOW_END: Final = "next_window_end"
 ATTR_ESTIMATED_COST: Final = "estimated_cost"
+ATTR_CHARGING_SEGMENTS: Final = "charging_segments"
+ATTR_CHARGE_PLAN: Final = "charge_plan"
+ATTR_DURATION_COSTS: Final = "duration_costs"
+ATTR_DAY_WINDOW: Final = "day_window"
+ATTR_PEAK_FORECAST: Final = "peak_forecast"
 ATTR_CHARGING_DURATION: Final = "charging_duration"
 ATTR_TARGET_SOC: Final = "target_soc"
 ATTR_CURRENT_SOC: Final = "current_soc"
@@ -147,3 +221,7 @@ ATTR_TOMORROW_PRICES_AVAILABLE: Final = "tomorrow_prices_available"
 ATTR_CALCULATION_TIMESTAMP: Final = "calculation_timestamp"
 ATTR_SOLAR_FORECAST_KWH: Final = "solar_forecast_kwh"
 ATTR_OPTIMAL_SOC_TARGET: Final = "optimal_soc_target"
+ATTR_STAGE_CACHE_HIT_RATE: Final = "stage_cache_hit_rate"
+ATTR_STAGE_CACHE_STATS: Final = "stage_cache_stats"
+ATTR_REFRESH_DURATION: Final = "refresh_duration"
+ATTR_STAGE_TIMINGS: Final = "stage_timings"
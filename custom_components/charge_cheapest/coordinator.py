@@ -2,100 +2,87 @@
 
 from __future__ import annotations
 
+import inspect
 import logging
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.const import SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.sun import get_astral_event_date
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
+from .compiled_config import MINUTES_PER_DAY, CompiledConfig, format_minutes
 from .const import (
     ATTR_CALCULATION_TIMESTAMP,
+    ATTR_CHARGE_PLAN,
     ATTR_CHARGING_DURATION,
+    ATTR_CHARGING_SEGMENTS,
     ATTR_CURRENT_SOC,
+    ATTR_DAY_WINDOW,
+    ATTR_DURATION_COSTS,
     ATTR_ESTIMATED_COST,
     ATTR_NEXT_WINDOW_END,
     ATTR_NEXT_WINDOW_START,
     ATTR_OPTIMAL_SOC_TARGET,
-    ATTR_SOLAR_FORECAST_KWH,
+    ATTR_PEAK_FORECAST,
+    ATTR_REFRESH_DURATION,
+    ATTR_STAGE_CACHE_HIT_RATE,
+    ATTR_STAGE_CACHE_STATS,
+    ATTR_STAGE_TIMINGS,
     ATTR_TARGET_SOC,
     ATTR_TOMORROW_PRICES_AVAILABLE,
+    CHARGE_CONTROL_BLUEPRINT,
+    CHARGE_CONTROL_PLAN,
+    CHARGE_CONTROL_WINDOWS,
     CHARGING_EFFICIENCY,
-    CONF_BATTERY_CAPACITY_SENSOR,
-    CONF_BATTERY_CHARGING_POWER,
-    CONF_BATTERY_CHARGING_SWITCH,
-    CONF_BATTERY_SOC_SENSOR,
-    CONF_CHARGING_DURATION_HOURS,
-    CONF_DAY_END_TIME,
-    CONF_DAY_SCHEDULE_ENABLED,
-    CONF_DAY_START_TIME,
-    CONF_DAY_TARGET_SOC,
-    CONF_DEFAULT_CHARGE_DURATION,
-    CONF_DEFAULT_CHARGE_START_TIME,
-    CONF_EVENING_PEAK_START,
-    CONF_EVENING_PEAK_TARGET_SOC,
-    CONF_FAILURE_BEHAVIOR,
-    CONF_FORECAST_MODE_AUTOMATIC,
-    CONF_MINIMUM_SOC_FLOOR,
-    CONF_MORNING_CONSUMPTION_KWH,
-    CONF_NIGHT_END_TIME,
-    CONF_NIGHT_START_TIME,
-    CONF_NIGHT_TARGET_SOC,
-    CONF_NOTIFY_CHARGING_COMPLETED,
-    CONF_NOTIFY_CHARGING_ERROR,
-    CONF_NOTIFY_CHARGING_SCHEDULED,
-    CONF_NOTIFY_CHARGING_SKIPPED,
-    CONF_NOTIFY_CHARGING_STARTED,
-    CONF_NOTIFY_EMERGENCY_CHARGING,
-    CONF_PRICE_SENSOR,
-    CONF_SOC_OFFSET_KWH,
-    CONF_SOLAR_FORECAST_ENABLED,
-    CONF_SOLAR_FORECAST_SENSOR,
-    CONF_TARGET_SOC,
-    CONF_TRIGGER_TIME,
     COORDINATOR_UPDATE_INTERVAL,
     DEFAULT_CHARGING_DURATION_HOURS,
-    DEFAULT_DAY_END_TIME,
-    DEFAULT_DAY_SCHEDULE_ENABLED,
-    DEFAULT_DAY_START_TIME,
-    DEFAULT_DAY_TARGET_SOC,
-    DEFAULT_DEFAULT_CHARGE_DURATION,
-    DEFAULT_DEFAULT_CHARGE_START_TIME,
-    DEFAULT_EVENING_PEAK_START,
-    DEFAULT_EVENING_PEAK_TARGET_SOC,
-    DEFAULT_FAILURE_BEHAVIOR,
-    DEFAULT_FORECAST_MODE_AUTOMATIC,
-    DEFAULT_MINIMUM_SOC_FLOOR,
-    DEFAULT_MORNING_CONSUMPTION_KWH,
-    DEFAULT_NIGHT_END_TIME,
-    DEFAULT_NIGHT_START_TIME,
     DEFAULT_NIGHT_TARGET_SOC,
-    DEFAULT_NOTIFY_CHARGING_COMPLETED,
-    DEFAULT_NOTIFY_CHARGING_ERROR,
-    DEFAULT_NOTIFY_CHARGING_SCHEDULED,
-    DEFAULT_NOTIFY_CHARGING_SKIPPED,
-    DEFAULT_NOTIFY_CHARGING_STARTED,
-    DEFAULT_NOTIFY_EMERGENCY_CHARGING,
-    DEFAULT_SOC_OFFSET_KWH,
-    DEFAULT_SOLAR_FORECAST_ENABLED,
-    DEFAULT_TARGET_SOC,
-    DEFAULT_TRIGGER_TIME,
     DEVICE_MANUFACTURER,
     DEVICE_MODEL,
     DOMAIN,
+    DRAIN_MIN_SAMPLE_HOURS,
+    DRAIN_WINDOW_HOURS,
     EMERGENCY_CHECK_BUFFER_MINUTES,
     FAILURE_BEHAVIOR_CHARGE_IMMEDIATELY,
     FAILURE_BEHAVIOR_DEFAULT_WINDOW,
     FAILURE_BEHAVIOR_SKIP,
+    FALLBACK_SUNRISE_MINUTES,
+    FALLBACK_SUNSET_MINUTES,
+    MAX_TABLE_SLOTS,
+    PEAK_FORECAST_HORIZON_HOURS,
+    REFRESH_DEBOUNCE_SECONDS,
+    SAFETY_UPDATE_INTERVAL,
+    STAGE_TIMING_SAMPLES,
     STATUS_CHARGING,
     STATUS_DISABLED,
     STATUS_ERROR,
     STATUS_IDLE,
     STATUS_SCHEDULED,
+    STORAGE_SAVE_DELAY_SECONDS,
+    STORAGE_VERSION,
+    STORED_PLAN_MAX_AGE_HOURS,
     TIME_SLOT_HOURS,
+    TIME_SLOT_SECONDS,
 )
+from .forecast import DrainEstimator, project_soc, solar_share
+from .optimizer import RollingPlan, SocTarget, charging_slots, optimize_charge_plan, replan_reason
+from .profiling import ProfileSession
+from .scheduler import ChargeScheduler
+from .stage_cache import StageCache
+from .stage_timings import STAGE_TOTAL, StageTimings
+from .timeline import ParsedPrices, PriceTimeline
+from .window import ChargingWindow, WindowEngine
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -105,17 +92,56 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the coordinator."""
+        config = CompiledConfig.from_mapping({**entry.data, **entry.options})
+
+        # With state-change refreshes, polling is only a safety net
+        update_minutes = (
+            SAFETY_UPDATE_INTERVAL
+            if config.event_driven_updates
+            else COORDINATOR_UPDATE_INTERVAL
+        )
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=COORDINATOR_UPDATE_INTERVAL),
+            update_interval=timedelta(minutes=update_minutes),
+            request_refresh_debouncer=Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=REFRESH_DEBOUNCE_SECONDS,
+                immediate=False,
+            ),
         )
 
         self.entry = entry
-        self._config = {**entry.data, **entry.options}
+        self.config = config
         self._unsubscribe_callbacks: list = []
         self._scheduled_charging: dict[str, Any] = {}
+        self._price_cache: ParsedPrices | None = None
+        self._price_cache_key: tuple | None = None
+        self._price_attributes: Any = None
+        self._price_revision = 0
+        self._stages = StageCache()
+        self.profiling: ProfileSession | None = None
+        self._timings = StageTimings(STAGE_TIMING_SAMPLES)
+        self._duration_table: dict[int, ChargingWindow] = {}
+        self._rolling_plan: RollingPlan | None = None
+        self._plan_generation = 0
+        self._drain = DrainEstimator(DRAIN_WINDOW_HOURS * 3600, DRAIN_MIN_SAMPLE_HOURS * 3600)
+        self._scheduler = ChargeScheduler(
+            hass,
+            self._profiled(self._async_start_planned_charging),
+            self._profiled(self._async_stop_planned_charging),
+        )
+        self._plan_armed_until = 0.0
+        self._day_armed_until = 0.0
+        self._peak_hold: dict[str, Any] | None = None
+        self._soc_unsubscribe: CALLBACK_TYPE | None = None
+        self._soc_target_reached = False
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.plan"
+        )
 
         # Device info for entities
         self.device_info = {
@@ -126,63 +152,314 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             "sw_version": "1.0.0",
         }
 
-    @property
-    def config(self) -> dict[str, Any]:
-        """Return current configuration."""
-        return {**self.entry.data, **self.entry.options}
+    @callback
+    def async_setup_listeners(self) -> None:
+        """Refresh when any configured source entity changes state."""
+        if not self.config.event_driven_updates:
+            return
+
+        entities = self.config.source_entities
+        if not entities:
+            return
+
+        self._unsubscribe_callbacks.append(
+            async_track_state_change_event(
+                self.hass, entities, self._profiled(self._handle_source_state_change)
+            )
+        )
+        _LOGGER.debug("Refreshing on state changes of %s", ", ".join(entities))
+
+    async def async_restore_plan(self) -> bool:
+        """Serve the persisted plan until a refresh revalidates it.
+
+        The plan is only restored if it was saved for the same schedule and
+        targets within the last day. A charge window that is still running
+        is rescheduled, so charging continues across restarts.
+
+        Returns:
+            True if a plan was restored
+        """
+        stored = await self._store.async_load()
+        if not stored or not stored.get("data"):
+            return False
+
+        saved_at = dt_util.parse_datetime(stored.get("saved_at") or "")
+        if (
+            saved_at is None
+            or dt_util.utcnow() - saved_at > timedelta(hours=STORED_PLAN_MAX_AGE_HOURS)
+            or stored.get("targets") != self._plan_targets()
+        ):
+            _LOGGER.debug("Discarding stale persisted plan")
+            return False
+
+        data = stored["data"]
+        for key in ("segment_times", "day_segment_times", "peak_segment_times", "plan_segment_times"):
+            data[key] = [tuple(times) for times in data.get(key, [])]
+        self.async_set_updated_data(data)
+
+        now = dt_util.utcnow().timestamp()
+        if stored.get("armed_until", 0.0) > now:
+            self._plan_armed_until = stored["armed_until"]
+        if stored.get("day_armed_until", 0.0) > now:
+            self._day_armed_until = stored["day_armed_until"]
+        self._handle_plan_update()
+
+        _LOGGER.info("Restored charging plan saved at %s", saved_at.isoformat())
+        return True
+
+    @callback
+    def _plan_snapshot(self) -> dict[str, Any]:
+        """Return the current plan as stored data."""
+        price_updated = self._price_cache_key[1] if self._price_cache_key else None
+        return {
+            "saved_at": dt_util.utcnow().isoformat(),
+            "price_revision": self._price_revision,
+            "price_updated": price_updated.isoformat() if price_updated else None,
+            "targets": self._plan_targets(),
+            "armed_until": self._plan_armed_until,
+            "day_armed_until": self._day_armed_until,
+            "data": self.data,
+        }
+
+    def _plan_targets(self) -> dict[str, Any]:
+        """Return the schedule and targets a persisted plan was made for."""
+        return {
+            "night_start": self.config.night_start,
+            "night_end": self.config.night_end,
+            "night_target_soc": self.config.night_target_soc,
+            "day_schedule_enabled": self.config.day_schedule_enabled,
+            "day_start": self.config.day_start,
+            "day_end": self.config.day_end,
+            "day_target_soc": self.config.day_target_soc,
+            "evening_peak_start": self.config.evening_peak_start,
+            "evening_peak_target_soc": self.config.evening_peak_target_soc,
+            "split_charging_enabled": self.config.split_charging_enabled,
+        }
+
+    @callback
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the planning internals for a diagnostics download."""
+        timeline = self._price_cache.timeline if self._price_cache else None
+        return {
+            "price_revision": self._price_revision,
+            "timeline": None
+            if timeline is None
+            else {
+                "start": dt_util.utc_from_timestamp(timeline.start).isoformat(),
+                "resolution": timeline.resolution,
+                "today_slots": timeline.today_slots,
+                "prices": [round(price, 4) for price in timeline.prices],
+            },
+            "plan": {
+                "armed_until": self._format_epoch(self._plan_armed_until),
+                "day_armed_until": self._format_epoch(self._day_armed_until),
+                "soc_target_reached": self._soc_target_reached,
+                "charging": self._scheduler.charging,
+                "segments": [
+                    [self._format_epoch(start), self._format_epoch(end)]
+                    for start, end in self._scheduler.segments
+                ],
+            },
+            "stage_fingerprints": self._stages.fingerprints(),
+            "stage_cache_hit_rate": self._stages.hit_rate,
+            "stage_cache": self._stages.stats(),
+            "stage_timings": self._timings.stats(),
+            "last_refresh_ms": self._timings.last(),
+            "recent_refreshes_ms": self._timings.recent(),
+            "executor_actions": self._scheduler.recent_actions(),
+        }
 
-    def _get_config_value(self, key: str, default: Any = None) -> Any:
-        """Get a configuration value with fallback to default."""
-        return self.config.get(key, default)
+    @staticmethod
+    def _format_epoch(timestamp: float) -> str | None:
+        """Return an epoch as ISO time, or None for an unset time."""
+        return dt_util.utc_from_timestamp(timestamp).isoformat() if timestamp else None
+
+    @callback
+    def _handle_source_state_change(self, event: Event[EventStateChangedData]) -> None:
+        """Request a debounced refresh after a source entity changed."""
+        self.hass.async_create_task(self.async_request_refresh())
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Fetch data from sensors and calculate charging windows."""
+        session = self.profiling
+        if session is None:
+            return await self._async_calculate_data()
+        with session.measure(refresh=True):
+            return await self._async_calculate_data()
+
+    async def _async_calculate_data(self) -> dict[str, Any]:
+        """Run the calculation stages on the current sensor states."""
         try:
             data = {}
+            self._timings.start()
 
             # Get current price and availability
-            price_sensor = self._get_config_value(CONF_PRICE_SENSOR)
+            price_sensor = self.config.price_sensor
             if price_sensor:
                 data.update(await self._fetch_price_data(price_sensor))
+            parsed = self._get_parsed_prices(price_sensor)
+            price_revision = parsed.revision if parsed else None
+            self._timings.lap("price_fetch")
 
             # Get current SOC
-            soc_sensor = self._get_config_value(CONF_BATTERY_SOC_SENSOR)
+            soc_sensor = self.config.battery_soc_sensor
             if soc_sensor:
                 data[ATTR_CURRENT_SOC] = self._get_sensor_value(soc_sensor, -1)
 
             # Check charging switch state
-            charging_switch = self._get_config_value(CONF_BATTERY_CHARGING_SWITCH)
+            charging_switch = self.config.battery_charging_switch
             if charging_switch:
                 switch_state = self.hass.states.get(charging_switch)
                 data["is_charging"] = switch_state and switch_state.state == "on"
 
+            # Sample SOC for the household drain estimate, skipping an unavailable sensor
+            if soc_sensor and data[ATTR_CURRENT_SOC] >= 0:
+                self._drain.add(
+                    dt_util.utcnow().timestamp(),
+                    data[ATTR_CURRENT_SOC],
+                    bool(data.get("is_charging")),
+                )
+
+            # Stage inputs read from other entities
+            current_soc = data.get(ATTR_CURRENT_SOC, 0)
+            capacity_input = self._state_fingerprint(self.config.battery_capacity_sensor)
+            power_input = self._state_fingerprint(self.config.battery_charging_power)
+
+            # After an early stop, charge again only below the hysteresis band
+            night_target = self.config.night_target_soc
+            if self._soc_target_reached:
+                if current_soc < night_target - self.config.soc_stop_hysteresis:
+                    self._soc_target_reached = False
+                else:
+                    night_target = min(current_soc, night_target)
+
             # Calculate charging duration
-            data[ATTR_CHARGING_DURATION] = self._calculate_charging_duration(
-                data.get(ATTR_CURRENT_SOC, 0),
-                self._get_config_value(CONF_NIGHT_TARGET_SOC, DEFAULT_NIGHT_TARGET_SOC),
+            data[ATTR_CHARGING_DURATION] = self._stages.get_or_compute(
+                "duration",
+                (round(current_soc, 1), night_target, capacity_input, power_input),
+                lambda: self._calculate_charging_duration(current_soc, night_target),
             )
+            self._timings.lap("duration")
 
             # Calculate optimal SOC target
-            data[ATTR_OPTIMAL_SOC_TARGET] = self._calculate_optimal_morning_soc()
+            data[ATTR_OPTIMAL_SOC_TARGET] = self._stages.get_or_compute(
+                "optimal_soc",
+                self._optimal_soc_fingerprint(capacity_input),
+                self._calculate_optimal_morning_soc,
+            )
+            self._timings.lap("optimal_soc")
+
+            # Slots of the night window that are still ahead
+            night_range = self._night_slot_range(parsed)
+
+            # Cheapest night window for every duration, once per price revision
+            self._duration_table = self._stages.get_or_compute(
+                "duration_table",
+                (price_revision, night_range),
+                lambda: self._calculate_duration_table(parsed, night_range),
+            )
+            data[ATTR_DURATION_COSTS] = self._stages.get_or_compute(
+                "duration_costs",
+                (price_revision, night_range),
+                lambda: self._format_duration_table(parsed),
+            )
 
             # Calculate next charging window
-            window_data = await self._calculate_next_charging_window(data)
+            prices_known = self._night_prices_known(parsed)
+            window_input = self._window_fingerprint(price_revision, night_range, prices_known, data)
+            hit, window_data = self._stages.lookup("window", window_input)
+            if not hit:
+                window_data = await self._calculate_next_charging_window(data, prices_known)
+                self._stages.store("window", window_input, window_data)
             data.update(window_data)
+            self._timings.lap("window_search")
+
+            # Cheapest day window toward the day target on the same timeline
+            if self.config.day_schedule_enabled:
+                day_target = self.config.day_target_soc
+                day_range = self._day_slot_range(parsed)
+                day_duration = self._stages.get_or_compute(
+                    "day_duration",
+                    (round(current_soc, 1), day_target, capacity_input, power_input),
+                    lambda: self._calculate_charging_duration(current_soc, day_target),
+                )
+                data[ATTR_DAY_WINDOW], data["day_segment_times"] = self._stages.get_or_compute(
+                    "day_window",
+                    (price_revision, day_range, day_duration),
+                    lambda: self._calculate_day_window(parsed, day_range, day_duration),
+                )
+                self._timings.lap("day_window")
+
+            # Re-plan the remaining price horizon only when the policy asks for it
+            morning_target = data[ATTR_OPTIMAL_SOC_TARGET]
+            plan_key = (
+                price_revision,
+                self._state_fingerprint(self.config.solar_forecast_sensor),
+                (morning_target, capacity_input, power_input),
+            )
+            reason = replan_reason(
+                self._rolling_plan,
+                *plan_key,
+                dt_util.now().timestamp(),
+                current_soc,
+                self.config.replan_soc_drift,
+            )
+            if reason is not None:
+                self._plan_generation += 1
+            data[ATTR_CHARGE_PLAN], data["plan_segment_times"] = self._stages.get_or_compute(
+                "charge_plan",
+                self._plan_generation,
+                lambda: self._calculate_charge_plan(
+                    parsed, current_soc, morning_target, plan_key, reason
+                ),
+            )
+            self._timings.lap("charge_plan")
+
+            # Project SOC to the evening peak and plan pre-peak charging for a shortfall
+            data[ATTR_PEAK_FORECAST], data["peak_segment_times"] = self._calculate_peak_forecast(
+                parsed, current_soc
+            )
+            self._timings.lap("peak_forecast")
 
             # Determine charging status
             data["status"] = self._determine_charging_status(data)
+            self._timings.lap("status")
 
             # Calculate price range
-            data["price_range"] = self._calculate_price_range(price_sensor)
+            data["price_range"] = self._stages.get_or_compute(
+                "price_range",
+                price_revision,
+                lambda: self._calculate_price_range(price_sensor),
+            )
+            self._timings.lap("price_range")
 
             # Calculate estimated savings
-            data["estimated_savings"] = self._calculate_estimated_savings(price_sensor)
+            data["estimated_savings"] = self._stages.get_or_compute(
+                "savings",
+                (price_revision, power_input),
+                lambda: self._calculate_estimated_savings(price_sensor),
+            )
+            self._timings.lap("savings")
 
             # System ready check
             data["system_ready"] = self._check_system_ready()
+            self._timings.lap("system_ready")
+
+            # Stage cache diagnostics
+            data[ATTR_STAGE_CACHE_HIT_RATE] = self._stages.hit_rate
+            data[ATTR_STAGE_CACHE_STATS] = self._stages.stats()
 
             # Add timestamp
-            data[ATTR_CALCULATION_TIMESTAMP] = datetime.now().isoformat()
+            data[ATTR_CALCULATION_TIMESTAMP] = dt_util.now().isoformat()
+
+            # Persist the plan for a warm start
+            self._store.async_delay_save(self._plan_snapshot, STORAGE_SAVE_DELAY_SECONDS)
+
+            # Stage timings, including this refresh
+            self._check_refresh_duration(self._timings.finish())
+            timings = self._timings.stats()
+            data[ATTR_REFRESH_DURATION] = round(timings[STAGE_TOTAL]["p95"])
+            data[ATTR_STAGE_TIMINGS] = timings
 
             return data
 
@@ -190,29 +467,80 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Error updating Charge Cheapest data: %s", err)
             raise UpdateFailed(f"Error fetching data: {err}") from err
 
-    async def _fetch_price_data(self, price_sensor: str) -> dict[str, Any]:
-        """Fetch price data from Tibber sensor."""
-        data = {}
+    def _check_refresh_duration(self, seconds: float) -> None:
+        """Warn when a refresh blocked the event loop longer than configured."""
+        threshold = self.config.slow_refresh_warning_ms
+        if seconds * 1000 <= threshold:
+            return
+        stages = self._timings.last()
+        stages.pop(STAGE_TOTAL, None)
+        slowest = sorted(stages.items(), key=lambda item: item[1], reverse=True)[:3]
+        _LOGGER.warning(
+            "Recalculation took %.0f ms (threshold %.0f ms), slowest stages: %s",
+            seconds * 1000,
+            threshold,
+            ", ".join(f"{stage} {ms:.1f} ms" for stage, ms in slowest),
+        )
 
-        state = self.hass.states.get(price_sensor)
+    def _state_fingerprint(self, entity_id: str | None) -> tuple[Any, Any] | None:
+        """Return the parts of an entity's state that stage outputs depend on."""
+        if not entity_id:
+            return None
+        state = self.hass.states.get(entity_id)
         if state is None:
-            data["current_price"] = None
-            data[ATTR_TOMORROW_PRICES_AVAILABLE] = False
-            return data
+            return None
+        return state.state, state.attributes.get("unit_of_measurement")
 
-        # Current price
-        try:
-            data["current_price"] = float(state.state)
-        except (ValueError, TypeError):
-            data["current_price"] = None
+    def _optimal_soc_fingerprint(self, capacity_input: tuple[Any, Any] | None) -> tuple[Any, ...]:
+        """Return the inputs of the optimal morning SOC stage.
 
-        # Tomorrow's prices availability
-        tomorrow_attr = state.attributes.get("tomorrow", [])
-        data[ATTR_TOMORROW_PRICES_AVAILABLE] = bool(
-            tomorrow_attr and len(tomorrow_attr) > 0
+        The forecast sensor's last update is included, as a forecast for the
+        next day may report the same total as the one for the current day.
+        """
+        forecast_sensor = self.config.solar_forecast_sensor
+        state = self.hass.states.get(forecast_sensor) if forecast_sensor else None
+        return (
+            self.config.solar_forecast_enabled,
+            self._state_fingerprint(forecast_sensor),
+            state.last_updated if state is not None else None,
+            capacity_input,
         )
 
-        return data
+    def _window_fingerprint(
+        self,
+        price_revision: int | None,
+        night_range: tuple[int, int] | None,
+        prices_known: bool,
+        data: dict[str, Any],
+    ) -> tuple[Any, ...]:
+        """Return the inputs of the charging window stage.
+
+        Charging immediately on missing prices depends on the current time,
+        so that fallback is fingerprinted per minute.
+        """
+        fingerprint = (
+            price_revision,
+            night_range,
+            prices_known,
+            data[ATTR_CHARGING_DURATION],
+        )
+        if (
+            not prices_known
+            and self.config.failure_behavior == FAILURE_BEHAVIOR_CHARGE_IMMEDIATELY
+        ):
+            fingerprint += (dt_util.now().replace(second=0, microsecond=0),)
+        return fingerprint
+
+    async def _fetch_price_data(self, price_sensor: str) -> dict[str, Any]:
+        """Fetch price data from Tibber sensor."""
+        parsed = self._get_parsed_prices(price_sensor)
+        if parsed is None:
+            return {"current_price": None, ATTR_TOMORROW_PRICES_AVAILABLE: False}
+
+        return {
+            "current_price": parsed.current_price,
+            ATTR_TOMORROW_PRICES_AVAILABLE: parsed.tomorrow_available,
+        }
 
     def _get_sensor_value(self, entity_id: str, default: float = -1) -> float:
         """Get numeric value from a sensor."""
@@ -236,15 +564,13 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
         Returns:
             Charging duration in hours, rounded to 15-minute slots
         """
-        fallback = self._get_config_value(
-            CONF_CHARGING_DURATION_HOURS, DEFAULT_CHARGING_DURATION_HOURS
-        )
+        fallback = self.config.charging_duration_hours
 
         if current_soc < 0:
             return fallback
 
         # Get battery capacity
-        capacity_sensor = self._get_config_value(CONF_BATTERY_CAPACITY_SENSOR)
+        capacity_sensor = self.config.battery_capacity_sensor
         if not capacity_sensor:
             return fallback
 
@@ -268,7 +594,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             capacity_kwh = capacity_raw
 
         # Get charging power
-        power_entity = self._get_config_value(CONF_BATTERY_CHARGING_POWER)
+        power_entity = self.config.battery_charging_power
         if not power_entity:
             return fallback
 
@@ -278,18 +604,12 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
         charge_power_kw = charge_power_w / 1000
 
-        # Calculate SOC delta
-        soc_delta = target_soc - current_soc
-        if soc_delta <= 0:
-            return 0
-
-        # Calculate energy needed and time
-        energy_needed_kwh = (soc_delta / 100) * capacity_kwh
-        hours_needed = energy_needed_kwh / (charge_power_kw * CHARGING_EFFICIENCY)
-
         # Round to 15-minute slots
-        hours_clamped = max(hours_needed, TIME_SLOT_HOURS)
-        slots_needed = (hours_clamped * 4).__ceil__()
+        slots_needed = charging_slots(
+            current_soc, target_soc, capacity_kwh, charge_power_kw, CHARGING_EFFICIENCY, TIME_SLOT_HOURS
+        )
+        if slots_needed == 0:
+            return 0
         return round(slots_needed / 4, 2)
 
     def _calculate_optimal_morning_soc(self) -> float:
@@ -298,21 +618,15 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
         Returns:
             Optimal SOC target percentage
         """
-        default_target = self._get_config_value(
-            CONF_NIGHT_TARGET_SOC, DEFAULT_NIGHT_TARGET_SOC
-        )
-        min_floor = self._get_config_value(
-            CONF_MINIMUM_SOC_FLOOR, DEFAULT_MINIMUM_SOC_FLOOR
-        )
+        default_target = self.config.night_target_soc
+        min_floor = self.config.minimum_soc_floor
 
         # Check if solar forecast is enabled
-        if not self._get_config_value(
-            CONF_SOLAR_FORECAST_ENABLED, DEFAULT_SOLAR_FORECAST_ENABLED
-        ):
+        if not self.config.solar_forecast_enabled:
             return default_target
 
         # Get solar forecast
-        forecast_sensor = self._get_config_value(CONF_SOLAR_FORECAST_SENSOR)
+        forecast_sensor = self.config.solar_forecast_sensor
         if not forecast_sensor:
             return default_target
 
@@ -321,7 +635,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             return default_target
 
         # Get battery capacity
-        capacity_sensor = self._get_config_value(CONF_BATTERY_CAPACITY_SENSOR)
+        capacity_sensor = self.config.battery_capacity_sensor
         if not capacity_sensor:
             return default_target
 
@@ -348,10 +662,8 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             return default_target
 
         # Calculate optimal SOC
-        consumption = self._get_config_value(
-            CONF_MORNING_CONSUMPTION_KWH, DEFAULT_MORNING_CONSUMPTION_KWH
-        )
-        offset = self._get_config_value(CONF_SOC_OFFSET_KWH, DEFAULT_SOC_OFFSET_KWH)
+        consumption = self.config.morning_consumption_kwh
+        offset = self.config.soc_offset_kwh
 
         excess_solar = forecast_kwh - consumption - offset
         soc_reduction = (excess_solar / capacity_kwh) * 100
@@ -362,20 +674,24 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
         return round(clamped_target, 1)
 
     async def _calculate_next_charging_window(
-        self, data: dict[str, Any]
+        self, data: dict[str, Any], prices_known: bool
     ) -> dict[str, Any]:
-        """Calculate the next charging window."""
+        """Calculate the next charging window.
+
+        The failure behavior applies when the prices do not cover the rest of
+        the night window. After midnight tomorrow's prices are not published
+        yet, but a running night window is still covered by today's.
+        """
         result = {
             ATTR_NEXT_WINDOW_START: None,
             ATTR_NEXT_WINDOW_END: None,
             ATTR_ESTIMATED_COST: 0,
-            ATTR_TARGET_SOC: self._get_config_value(
-                CONF_NIGHT_TARGET_SOC, DEFAULT_NIGHT_TARGET_SOC
-            ),
+            ATTR_CHARGING_SEGMENTS: [],
+            ATTR_TARGET_SOC: self.config.night_target_soc,
+            "segment_times": [],
         }
 
-        # Check if tomorrow's prices are available
-        if not data.get(ATTR_TOMORROW_PRICES_AVAILABLE, False):
+        if not prices_known:
             # Handle failure behavior
             return await self._handle_price_unavailable(result)
 
@@ -389,6 +705,8 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
                 result[ATTR_NEXT_WINDOW_START] = cheapest_hours.get("start")
                 result[ATTR_NEXT_WINDOW_END] = cheapest_hours.get("end")
                 result[ATTR_ESTIMATED_COST] = cheapest_hours.get("cost", 0)
+                result[ATTR_CHARGING_SEGMENTS] = cheapest_hours.get("segments", [])
+                result["segment_times"] = cheapest_hours.get("segment_times", [])
 
         except Exception as err:
             _LOGGER.warning("Could not calculate cheapest hours: %s", err)
@@ -399,110 +717,525 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
     async def _calculate_cheapest_hours(
         self, hours_needed: float
     ) -> dict[str, Any] | None:
-        """Calculate cheapest hours using the cheapest-energy-hours Jinja macro.
+        """Calculate the cheapest charging slots in the night window.
 
-        This method attempts to invoke the external Jinja macro for price calculation.
-        Falls back to simple calculation if macro is not available.
+        The search runs on the quarter-hour price timeline, so the window has
+        the same slot granularity as the calculated charging duration.
+        Contiguous windows of up to 8 hours come from the duration table. With
+        split charging enabled the slots may form several segments; ``start``
+        and ``end`` then span from the first segment to the last.
         """
-        price_sensor = self._get_config_value(CONF_PRICE_SENSOR)
-        if not price_sensor:
+        parsed = self._get_parsed_prices(self.config.price_sensor)
+        if parsed is None or parsed.timeline is None:
             return None
 
-        # Get price data from sensor
-        state = self.hass.states.get(price_sensor)
-        if state is None:
+        timeline = parsed.timeline
+
+        slots_needed = (hours_needed / TIME_SLOT_HOURS).__ceil__()
+        if slots_needed <= 0:
             return None
 
-        today_prices = state.attributes.get("today", [])
-        tomorrow_prices = state.attributes.get("tomorrow", [])
+        first, last = self._night_slot_range(parsed)
 
-        if not today_prices:
+        if not self.config.split_charging_enabled and slots_needed in self._duration_table:
+            segments = [self._duration_table[slots_needed]]
+        else:
+            segments = self._cheapest_segments(timeline, slots_needed, first, last)
+
+        if not segments:
             return None
 
-        # Get schedule configuration
-        night_start = self._get_config_value(
-            CONF_NIGHT_START_TIME, DEFAULT_NIGHT_START_TIME
+        return self._format_window(timeline, segments)
+
+    def _calculate_day_window(
+        self,
+        parsed: ParsedPrices | None,
+        day_range: tuple[int, int] | None,
+        hours_needed: float,
+    ) -> tuple[dict[str, Any] | None, list[tuple[float, float]]]:
+        """Calculate the cheapest slots of the day window.
+
+        Returns:
+            The day window attribute and its segments as start and end epochs
+        """
+        if parsed is None or parsed.timeline is None or day_range is None:
+            return None, []
+
+        slots_needed = (hours_needed / TIME_SLOT_HOURS).__ceil__()
+        if slots_needed <= 0:
+            return None, []
+
+        timeline = parsed.timeline
+        segments = self._cheapest_segments(timeline, slots_needed, *day_range)
+        if not segments:
+            return None, []
+
+        window = self._format_window(timeline, segments)
+        segment_times = window.pop("segment_times")
+        window["duration"] = hours_needed
+        return window, segment_times
+
+    def _format_window(
+        self, timeline: PriceTimeline, segments: list[ChargingWindow]
+    ) -> dict[str, Any]:
+        """Return charging segments as local times with costs and start and end epochs."""
+        formatted = [
+            {
+                "start": self._format_timestamp(timeline.slot_start(segment.start_index)),
+                "end": self._format_timestamp(timeline.slot_start(segment.end_index)),
+                "cost": round(segment.cost * TIME_SLOT_HOURS, 4),
+            }
+            for segment in segments
+        ]
+        return {
+            "start": formatted[0]["start"],
+            "end": formatted[-1]["end"],
+            "cost": round(sum(segment.cost for segment in segments) * TIME_SLOT_HOURS, 4),
+            "segments": formatted,
+            "segment_times": [
+                (timeline.slot_start(segment.start_index), timeline.slot_start(segment.end_index))
+                for segment in segments
+            ],
+        }
+
+    def _cheapest_segments(
+        self, timeline: PriceTimeline, slots_needed: int, first: int, last: int
+    ) -> list[ChargingWindow]:
+        """Return the cheapest slots in [first, last), split into segments if enabled."""
+        engine = WindowEngine(timeline.prices)
+        if self.config.split_charging_enabled:
+            min_run = (self.config.min_charge_run_minutes / 60 / TIME_SLOT_HOURS).__ceil__()
+            return engine.cheapest_segments(
+                slots_needed,
+                first,
+                last,
+                min_run=min_run,
+                max_runs=max(1, self.config.max_charge_runs),
+            )
+        window = engine.cheapest(slots_needed, first, last)
+        return [window] if window is not None else []
+
+    def _calculate_duration_table(
+        self, parsed: ParsedPrices | None, night_range: tuple[int, int] | None
+    ) -> dict[int, ChargingWindow]:
+        """Return tonight's cheapest window for every duration up to 8 hours.
+
+        All durations are answered in a single pass over the start slots, so
+        a changed SOC or target becomes a table lookup instead of a search.
+        """
+        if parsed is None or parsed.timeline is None or night_range is None:
+            return {}
+
+        return WindowEngine(parsed.timeline.prices).cheapest_many(
+            range(1, MAX_TABLE_SLOTS + 1), *night_range
         )
-        night_end = self._get_config_value(CONF_NIGHT_END_TIME, DEFAULT_NIGHT_END_TIME)
-
-        # Parse times
-        start_hour = self._parse_time_hour(night_start)
-        end_hour = self._parse_time_hour(night_end)
-
-        # Build price list for the window (cross-midnight support)
-        window_prices = []
-        now = datetime.now()
-
-        # Add today's prices from start_hour onwards
-        for i, price_entry in enumerate(today_prices):
-            if i >= start_hour:
-                hour_time = now.replace(hour=i, minute=0, second=0, microsecond=0)
-                window_prices.append({
-                    "time": hour_time,
-                    "price": price_entry.get("total", 0),
-                })
-
-        # Add tomorrow's prices until end_hour
-        if tomorrow_prices:
-            tomorrow = now + timedelta(days=1)
-            for i, price_entry in enumerate(tomorrow_prices):
-                if i < end_hour:
-                    hour_time = tomorrow.replace(hour=i, minute=0, second=0, microsecond=0)
-                    window_prices.append({
-                        "time": hour_time,
-                        "price": price_entry.get("total", 0),
-                    })
-
-        if not window_prices:
+
+    def _format_duration_table(self, parsed: ParsedPrices | None) -> list[dict[str, Any]]:
+        """Return the duration table as attribute and service response rows.
+
+        Durations longer than the known prices were shortened to the price
+        span, so they are left out instead of reported with a shorter window.
+        """
+        if parsed is None or parsed.timeline is None:
+            return []
+
+        timeline = parsed.timeline
+        return [
+            {
+                "hours": slots * TIME_SLOT_HOURS,
+                "start": self._format_timestamp(timeline.slot_start(window.start_index)),
+                "end": self._format_timestamp(timeline.slot_start(window.end_index)),
+                "cost": round(window.cost * TIME_SLOT_HOURS, 4),
+            }
+            for slots, window in sorted(self._duration_table.items())
+            if window.slots == slots
+        ]
+
+    def get_window_cost(self, hours: float) -> dict[str, Any] | None:
+        """Return the precomputed cheapest window for a charging duration."""
+        hours = (hours / TIME_SLOT_HOURS).__ceil__() * TIME_SLOT_HOURS
+        costs = (self.data or {}).get(ATTR_DURATION_COSTS) or []
+        return next((row for row in costs if row["hours"] == hours), None)
+
+    def _calculate_charge_plan(
+        self,
+        parsed: ParsedPrices | None,
+        current_soc: float,
+        morning_target: float,
+        plan_key: tuple[Any, Any, Any],
+        reason: str | None,
+    ) -> tuple[dict[str, Any] | None, list[tuple[float, float]]]:
+        """Solve the night, evening-peak and SOC floor targets as one charge plan.
+
+        Charging is allowed in the night window and, if enabled, in the day
+        window. Every night end in the horizon must reach ``morning_target``
+        and every evening peak start the evening-peak target. The measured
+        household drain and today's solar forecast are part of the
+        trajectory. Only the slots from now on are planned; charging of the
+        previous plan up to now is kept as executed.
+
+        Returns:
+            The plan attribute and its charging periods as start and end epochs
+        """
+        previous, self._rolling_plan = self._rolling_plan, None
+        charge_rate = self._get_charge_rate()
+        capacity_kwh = self._get_battery_capacity_kwh()
+        if parsed is None or parsed.timeline is None or current_soc < 0 or charge_rate is None or capacity_kwh is None:
+            return None, []
+
+        timeline = parsed.timeline
+        now = dt_util.now().timestamp()
+        first = timeline.index_at(now)
+        prices = timeline.prices[first:]
+        if not prices:
+            return None, []
+
+        energy_per_slot, soc_per_slot = charge_rate
+        solar_soc = self._solar_soc(dt_util.now(), capacity_kwh)
+        drain = self._drain.rate(solar_soc) or 0.0
+        drain_per_slot = drain * timeline.resolution / 3600
+        solar = [solar_soc(timeline.slot_start(first + slot), timeline.slot_start(first + slot + 1)) for slot in range(len(prices))]
+
+        # Local wall-clock minute of day of every slot, also across DST changes
+        slot_minutes = TIME_SLOT_SECONDS // 60
+        targets: list[SocTarget] = []
+        allowed: list[bool] = []
+        for slot in range(len(prices)):
+            local = dt_util.as_local(dt_util.utc_from_timestamp(timeline.slot_start(first + slot)))
+            minute = local.hour * 60 + local.minute
+            allowed.append(self._charging_allowed_at(minute))
+            if minute <= self.config.night_end < minute + slot_minutes:
+                targets.append(SocTarget(slot, morning_target))
+            if minute <= self.config.evening_peak_start < minute + slot_minutes:
+                targets.append(SocTarget(slot, self.config.evening_peak_target_soc))
+
+        plan = optimize_charge_plan(
+            prices,
+            current_soc,
+            soc_per_slot,
+            targets,
+            floor_soc=self.config.minimum_soc_floor,
+            allowed=allowed,
+            drain_per_slot=drain_per_slot,
+            # Solar of the current slot only from now on
+            solar=[solar[0] * (timeline.slot_start(first + 1) - now) / timeline.resolution, *solar[1:]],
+        )
+
+        charged = bytearray(len(prices))
+        for segment in plan.segments:
+            charged[segment.start_index : segment.end_index] = b"\x01" * segment.slots
+        price_revision, forecast, inputs = plan_key
+        self._rolling_plan = RollingPlan(
+            anchor=timeline.slot_start(first),
+            planned_at=now,
+            slot_seconds=timeline.resolution,
+            start_soc=current_soc,
+            soc_per_slot=soc_per_slot,
+            charged=bytes(charged),
+            price_revision=price_revision,
+            forecast=forecast,
+            inputs=inputs,
+            executed=previous.executed_before(now, timeline.start) if previous else (),
+            drain_per_slot=drain_per_slot,
+            solar=tuple(solar),
+        )
+        _LOGGER.debug("Charge plan recalculated (%s)", reason)
+
+        periods = self._rolling_plan.periods()
+        segments = []
+        for start, end in periods:
+            begin, stop = timeline.index_at(start), timeline.index_at(end - 1) + 1
+            segments.append(
+                {
+                    "start": self._format_datetime(start),
+                    "end": self._format_datetime(end),
+                    "cost": round(sum(timeline.prices[begin:stop]) * energy_per_slot, 4),
+                }
+            )
+        return {
+            "segments": segments,
+            "cost": round(plan.cost * energy_per_slot, 4),
+            "end_soc": plan.end_soc,
+            "drain_rate": round(drain, 2),
+            "planned_at": self._format_datetime(now),
+            "replan_reason": reason,
+        }, list(periods)
+
+    def _calculate_peak_forecast(
+        self, parsed: ParsedPrices | None, current_soc: float
+    ) -> tuple[dict[str, Any] | None, list[tuple[float, float]]]:
+        """Project SOC to the next evening peak and plan charging for a shortfall.
+
+        The forecast starts once the peak is less than
+        ``PEAK_FORECAST_HORIZON_HOURS`` away and a drain rate was measured.
+        A predicted shortfall is closed with the cheapest slots before the
+        peak, so emergency charging is only needed without a forecast. Once
+        the first of these slots started, the segments are held until the
+        last one ends; otherwise the shortfall shrinking while charging would
+        move them and switch charging off mid-slot.
+
+        Returns:
+            The forecast attribute and the pre-peak segments as start and end epochs
+        """
+        charge_rate = self._get_charge_rate()
+        if parsed is None or parsed.timeline is None or current_soc < 0 or charge_rate is None:
+            return None, []
+
+        now = dt_util.now()
+        peak_start = dt_util.start_of_local_day(now) + timedelta(
+            minutes=self.config.evening_peak_start
+        )
+        if peak_start <= now:
+            peak_start += timedelta(days=1)
+        if peak_start - now > timedelta(hours=PEAK_FORECAST_HORIZON_HOURS):
+            return None, []
+
+        capacity_kwh = self._get_battery_capacity_kwh()
+        solar_soc = self._solar_soc(peak_start, capacity_kwh)
+        drain = self._drain.rate(solar_soc)
+        if drain is None:
+            return None, []
+
+        start, end = now.timestamp(), peak_start.timestamp()
+        projected = project_soc(current_soc, start, end, drain, solar_soc)
+        shortfall = max(0.0, self.config.evening_peak_target_soc - projected)
+        forecast: dict[str, Any] = {
+            "peak_start": self._format_datetime(end),
+            "projected_soc": round(projected, 1),
+            "drain_rate": round(drain, 2),
+            "shortfall": round(shortfall, 1),
+            "segments": [],
+        }
+
+        hold = self._peak_hold
+        if hold is not None and start < hold["times"][-1][1]:
+            forecast["segments"] = hold["segments"]
+            return forecast, list(hold["times"])
+        self._peak_hold = None
+
+        energy_per_slot, soc_per_slot = charge_rate
+        timeline = parsed.timeline
+        first, last = timeline.index_at(start), timeline.index_at(end)
+        slots_needed = min(round(shortfall / soc_per_slot, 9).__ceil__(), last - first)
+        if slots_needed <= 0:
+            return forecast, []
+
+        segments = self._cheapest_segments(timeline, slots_needed, first, last)
+        forecast["segments"] = [
+            {
+                "start": self._format_datetime(timeline.slot_start(segment.start_index)),
+                "end": self._format_datetime(timeline.slot_start(segment.end_index)),
+                "cost": round(segment.cost * energy_per_slot, 4),
+            }
+            for segment in segments
+        ]
+        times = [(timeline.slot_start(segment.start_index), timeline.slot_start(segment.end_index)) for segment in segments]
+        if times[0][0] <= start:
+            # SOC needed now to still reach the target at the peak start
+            self._peak_hold = {
+                "times": times,
+                "segments": forecast["segments"],
+                "stop_soc": round(min(100.0, current_soc + shortfall), 1),
+            }
+        return forecast, times
+
+    def _solar_soc(
+        self, day: datetime, capacity_kwh: float
+    ) -> Callable[[float, float], float]:
+        """Return the SOC (%) the solar forecast adds between two epochs of ``day``."""
+        forecast_kwh = -1.0
+        if self.config.solar_forecast_enabled and self.config.solar_forecast_sensor:
+            forecast_kwh = self._get_sensor_value(self.config.solar_forecast_sensor, -1)
+        if forecast_kwh <= 0:
+            return lambda start, end: 0.0
+
+        sunrise, sunset = self._stages.get_or_compute(
+            "daylight", day.date(), lambda: self._daylight(day)
+        )
+        scale = forecast_kwh / capacity_kwh * 100
+        return lambda start, end: scale * solar_share(start, end, sunrise, sunset)
+
+    def _daylight(self, day: datetime) -> tuple[float, float]:
+        """Return sunrise and sunset of ``day`` as epochs."""
+        sunrise = get_astral_event_date(self.hass, SUN_EVENT_SUNRISE, day.date())
+        sunset = get_astral_event_date(self.hass, SUN_EVENT_SUNSET, day.date())
+        if sunrise is None or sunset is None:
+            midnight = dt_util.start_of_local_day(day)
+            sunrise = midnight + timedelta(minutes=FALLBACK_SUNRISE_MINUTES)
+            sunset = midnight + timedelta(minutes=FALLBACK_SUNSET_MINUTES)
+        return sunrise.timestamp(), sunset.timestamp()
+
+    def _get_charge_rate(self) -> tuple[float, float] | None:
+        """Return the energy (kWh) and SOC (%) one slot of charging adds."""
+        capacity_kwh = self._get_battery_capacity_kwh()
+        power_entity = self.config.battery_charging_power
+        charge_power_w = self._get_sensor_value(power_entity, -1) if power_entity else -1
+        if capacity_kwh is None or charge_power_w <= 0:
             return None
 
-        # Sort by price
-        window_prices.sort(key=lambda x: x["price"])
+        energy_per_slot = charge_power_w / 1000 * TIME_SLOT_HOURS
+        return energy_per_slot, energy_per_slot * CHARGING_EFFICIENCY / capacity_kwh * 100
 
-        # Get cheapest consecutive hours
-        slots_needed = int(hours_needed * 4)  # 15-minute slots
-        hours_slots = int(hours_needed.__ceil__())
+    def _charging_allowed_at(self, minute: int) -> bool:
+        """Return whether the charge plan may charge at a minute of day."""
+        if self._in_window(minute, self.config.night_start, self.config.night_end):
+            return True
+        return self.config.day_schedule_enabled and self._in_window(
+            minute, self.config.day_start, self.config.day_end
+        )
 
-        if hours_slots > len(window_prices):
-            hours_slots = len(window_prices)
+    @staticmethod
+    def _in_window(minute: int, start: int, end: int) -> bool:
+        """Return whether a minute of day lies in [start, end), wrapping midnight."""
+        if start <= end:
+            return start <= minute < end
+        return minute >= start or minute < end
 
-        # Find cheapest consecutive hours
-        best_start_idx = 0
-        best_cost = float("inf")
+    def _get_battery_capacity_kwh(self) -> float | None:
+        """Return the battery capacity in kWh, or None if unavailable."""
+        capacity_sensor = self.config.battery_capacity_sensor
+        if not capacity_sensor:
+            return None
 
-        for i in range(len(window_prices) - hours_slots + 1):
-            cost = sum(p["price"] for p in window_prices[i : i + hours_slots])
-            if cost < best_cost:
-                best_cost = cost
-                best_start_idx = i
+        capacity_state = self.hass.states.get(capacity_sensor)
+        if capacity_state is None:
+            return None
 
-        if best_cost == float("inf"):
+        try:
+            capacity_raw = float(capacity_state.state)
+        except (ValueError, TypeError):
             return None
 
-        selected_hours = window_prices[best_start_idx : best_start_idx + hours_slots]
-        selected_hours.sort(key=lambda x: x["time"])
+        if capacity_raw <= 0:
+            return None
 
-        return {
-            "start": selected_hours[0]["time"].strftime("%H:%M:%S"),
-            "end": (selected_hours[-1]["time"] + timedelta(hours=1)).strftime("%H:%M:%S"),
-            "cost": round(best_cost, 4),
-        }
+        unit = capacity_state.attributes.get("unit_of_measurement", "kWh")
+        if "wh" in unit.lower() and "kwh" not in unit.lower():
+            return capacity_raw / 1000
+        return capacity_raw
+
+    def _get_parsed_prices(self, price_sensor: str | None) -> ParsedPrices | None:
+        """Return the parsed price sensor state, reparsing only when it changed.
+
+        The cache is keyed on the state's ``last_updated`` and context, so all
+        consumers in a refresh, and most refreshes in a day, share one parse.
+        A new current price with the same price lists keeps the timeline and
+        its revision, so the stages depending on it are not recalculated.
+        """
+        if not price_sensor:
+            return None
+
+        state = self.hass.states.get(price_sensor)
+        if state is None:
+            return None
+
+        day_start = dt_util.start_of_local_day().timestamp()
+        cache_key = (price_sensor, state.last_updated, state.context.id, day_start)
+        if self._price_cache is not None and self._price_cache_key == cache_key:
+            return self._price_cache
+
+        previous_key = self._price_cache_key
+        if (
+            self._price_cache is not None
+            and previous_key[0] == price_sensor
+            and previous_key[3] == day_start
+            and self._price_attributes == state.attributes
+        ):
+            parsed = self._price_cache.with_current_price(state.state)
+        else:
+            try:
+                parsed = ParsedPrices.from_state(
+                    self._price_revision + 1,
+                    state.state,
+                    state.attributes,
+                    day_start,
+                    TIME_SLOT_SECONDS,
+                )
+            except (ValueError, TypeError) as err:
+                _LOGGER.warning("Could not parse prices of %s: %s", price_sensor, err)
+                return None
+
+        self._price_revision = parsed.revision
+        self._price_cache = parsed
+        self._price_cache_key = cache_key
+        self._price_attributes = state.attributes
+        return parsed
+
+    @staticmethod
+    def _window_bounds(window_start: int, window_end: int) -> tuple[float, float]:
+        """Return the upcoming or running charging window as start and end epochs.
+
+        After midnight a window that started yesterday evening is kept until
+        it ends, so a running charge is not replanned into the next night.
+        A window that already ended today moves to tomorrow.
+        """
+        today = dt_util.start_of_local_day()
+        start = today.replace(hour=window_start // 60, minute=window_start % 60)
+        end = today.replace(hour=window_end // 60, minute=window_end % 60)
+        if end <= start:
+            if dt_util.now() < end:
+                start = (today - timedelta(days=1)).replace(
+                    hour=window_start // 60, minute=window_start % 60
+                )
+            else:
+                end = (today + timedelta(days=1)).replace(
+                    hour=window_end // 60, minute=window_end % 60
+                )
+        elif end <= dt_util.now():
+            start += timedelta(days=1)
+            end += timedelta(days=1)
+
+        return start.timestamp(), end.timestamp()
 
-    def _parse_time_hour(self, time_str: str) -> int:
-        """Parse time string and return hour."""
-        if isinstance(time_str, dict):
-            return time_str.get("hour", 0)
-        if ":" in str(time_str):
-            return int(str(time_str).split(":")[0])
-        return 0
+    def _slot_range(
+        self, parsed: ParsedPrices | None, window_start: int, window_end: int
+    ) -> tuple[int, int] | None:
+        """Return the timeline slots of a charging window from the current slot on.
+
+        Once the window has started only the remaining slots are searched, so
+        a replanned window never lies in the past.
+        """
+        if parsed is None or parsed.timeline is None:
+            return None
+
+        timeline = parsed.timeline
+        start, end = self._window_bounds(window_start, window_end)
+        first = max(timeline.index_at(start), timeline.index_at(dt_util.now().timestamp()))
+        return first, timeline.index_at(end)
+
+    def _night_prices_known(self, parsed: ParsedPrices | None) -> bool:
+        """Return True if the timeline covers the rest of the night window."""
+        if parsed is None or parsed.timeline is None:
+            return False
+        start, end = self._window_bounds(self.config.night_start, self.config.night_end)
+        timeline = parsed.timeline
+        return timeline.start <= max(start, dt_util.now().timestamp()) and end <= timeline.end
+
+    def _night_slot_range(self, parsed: ParsedPrices | None) -> tuple[int, int] | None:
+        """Return the remaining timeline slots of the night window."""
+        return self._slot_range(parsed, self.config.night_start, self.config.night_end)
+
+    def _day_slot_range(self, parsed: ParsedPrices | None) -> tuple[int, int] | None:
+        """Return the remaining timeline slots of the day window."""
+        return self._slot_range(parsed, self.config.day_start, self.config.day_end)
+
+    @staticmethod
+    def _format_timestamp(timestamp: float) -> str:
+        """Format an epoch as local HH:MM:SS."""
+        return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).strftime(
+            "%H:%M:%S"
+        )
+
+    @staticmethod
+    def _format_datetime(timestamp: float) -> str:
+        """Format an epoch as a local ISO datetime."""
+        return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
 
     async def _handle_price_unavailable(
         self, result: dict[str, Any]
     ) -> dict[str, Any]:
         """Handle case when price data is unavailable."""
-        failure_behavior = self._get_config_value(
-            CONF_FAILURE_BEHAVIOR, DEFAULT_FAILURE_BEHAVIOR
-        )
+        failure_behavior = self.config.failure_behavior
 
         if failure_behavior == FAILURE_BEHAVIOR_SKIP:
             _LOGGER.info("Price data unavailable, skipping charging per failure_behavior")
@@ -510,54 +1243,37 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             return result
 
         if failure_behavior == FAILURE_BEHAVIOR_DEFAULT_WINDOW:
-            default_start = self._get_config_value(
-                CONF_DEFAULT_CHARGE_START_TIME, DEFAULT_DEFAULT_CHARGE_START_TIME
-            )
-            default_duration = self._get_config_value(
-                CONF_DEFAULT_CHARGE_DURATION, DEFAULT_DEFAULT_CHARGE_DURATION
-            )
+            default_start = self.config.default_charge_start
+            default_duration = self.config.default_charge_duration
 
-            result[ATTR_NEXT_WINDOW_START] = default_start
-            result[ATTR_NEXT_WINDOW_END] = self._calculate_end_time(
-                default_start, default_duration
+            result[ATTR_NEXT_WINDOW_START] = format_minutes(default_start)
+            result[ATTR_NEXT_WINDOW_END] = format_minutes(
+                default_start + int(default_duration * 60)
             )
+            start = dt_util.start_of_local_day() + timedelta(minutes=default_start)
+            end = start + timedelta(hours=default_duration)
+            if end <= dt_util.now():
+                start += timedelta(days=1)
+                end += timedelta(days=1)
+            result["segment_times"] = [(start.timestamp(), end.timestamp())]
             result["failure_mode"] = "default_window"
             return result
 
         if failure_behavior == FAILURE_BEHAVIOR_CHARGE_IMMEDIATELY:
-            now = datetime.now()
-            default_duration = self._get_config_value(
-                CONF_DEFAULT_CHARGE_DURATION, DEFAULT_DEFAULT_CHARGE_DURATION
-            )
+            now = dt_util.now()
+            default_duration = self.config.default_charge_duration
 
             result[ATTR_NEXT_WINDOW_START] = now.strftime("%H:%M:%S")
             result[ATTR_NEXT_WINDOW_END] = (
                 now + timedelta(hours=default_duration)
             ).strftime("%H:%M:%S")
+            start = now.timestamp()
+            result["segment_times"] = [(start, start + default_duration * 3600)]
             result["failure_mode"] = "charge_immediately"
             return result
 
         return result
 
-    def _calculate_end_time(self, start_time: str, duration_hours: float) -> str:
-        """Calculate end time from start time and duration."""
-        if isinstance(start_time, dict):
-            start_hour = start_time.get("hour", 0)
-            start_minute = start_time.get("minute", 0)
-        elif ":" in str(start_time):
-            parts = str(start_time).split(":")
-            start_hour = int(parts[0])
-            start_minute = int(parts[1]) if len(parts) > 1 else 0
-        else:
-            start_hour = 0
-            start_minute = 0
-
-        total_minutes = start_hour * 60 + start_minute + int(duration_hours * 60)
-        end_hour = (total_minutes // 60) % 24
-        end_minute = total_minutes % 60
-
-        return f"{end_hour:02d}:{end_minute:02d}:00"
-
     def _determine_charging_status(self, data: dict[str, Any]) -> str:
         """Determine the current charging status."""
         # Check if system is ready
@@ -576,60 +1292,33 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
     def _calculate_price_range(self, price_sensor: str | None) -> str:
         """Calculate today's price range."""
-        if not price_sensor:
-            return "unavailable"
-
-        state = self.hass.states.get(price_sensor)
-        if state is None:
-            return "unavailable"
-
-        today_prices = state.attributes.get("today", [])
-        if not today_prices:
+        parsed = self._get_parsed_prices(price_sensor)
+        if parsed is None or parsed.timeline is None:
             return "unavailable"
 
-        try:
-            prices = [p.get("total", 0) for p in today_prices]
-            min_price = min(prices)
-            max_price = max(prices)
-            return f"{min_price:.3f} - {max_price:.3f}"
-        except (ValueError, TypeError):
-            return "unavailable"
+        return f"{parsed.min_price:.3f} - {parsed.max_price:.3f}"
 
     def _calculate_estimated_savings(self, price_sensor: str | None) -> float:
         """Calculate estimated savings vs average price."""
-        if not price_sensor:
-            return 0.0
-
-        state = self.hass.states.get(price_sensor)
-        if state is None:
+        parsed = self._get_parsed_prices(price_sensor)
+        if parsed is None or parsed.timeline is None:
             return 0.0
 
-        today_prices = state.attributes.get("today", [])
-        if not today_prices:
-            return 0.0
+        # Estimate based on 3 hours charging at charging power
+        power_entity = self.config.battery_charging_power
+        charging_power = self._get_sensor_value(power_entity, 3000) if power_entity else 3000
+        hours_charging = 3
+        kwh_charged = (charging_power / 1000) * hours_charging
 
-        try:
-            prices = [p.get("total", 0) for p in today_prices]
-            avg_price = sum(prices) / len(prices)
-            min_price = min(prices)
-
-            # Estimate based on 3 hours charging at charging power
-            power_entity = self._get_config_value(CONF_BATTERY_CHARGING_POWER)
-            charging_power = self._get_sensor_value(power_entity, 3000) if power_entity else 3000
-            hours_charging = 3
-            kwh_charged = (charging_power / 1000) * hours_charging
-
-            savings = (avg_price - min_price) * kwh_charged
-            return round(savings, 2)
-        except (ValueError, TypeError, ZeroDivisionError):
-            return 0.0
+        savings = (parsed.mean_price - parsed.min_price) * kwh_charged
+        return round(savings, 2)
 
     def _check_system_ready(self) -> bool:
         """Check if all required entities are configured and available."""
         required_entities = [
-            self._get_config_value(CONF_PRICE_SENSOR),
-            self._get_config_value(CONF_BATTERY_SOC_SENSOR),
-            self._get_config_value(CONF_BATTERY_CHARGING_SWITCH),
+            self.config.price_sensor,
+            self.config.battery_soc_sensor,
+            self.config.battery_charging_switch,
         ]
 
         for entity_id in required_entities:
@@ -644,7 +1333,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
     async def async_start_charging(self) -> None:
         """Start battery charging."""
-        switch_entity = self._get_config_value(CONF_BATTERY_CHARGING_SWITCH)
+        switch_entity = self.config.battery_charging_switch
         if not switch_entity:
             _LOGGER.error("No charging switch configured")
             return
@@ -661,7 +1350,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
     async def async_stop_charging(self) -> None:
         """Stop battery charging."""
-        switch_entity = self._get_config_value(CONF_BATTERY_CHARGING_SWITCH)
+        switch_entity = self.config.battery_charging_switch
         if not switch_entity:
             _LOGGER.error("No charging switch configured")
             return
@@ -677,50 +1366,60 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             _LOGGER.error("Failed to stop charging: %s", err)
 
     async def async_setup_automations(self) -> None:
-        """Set up internal automations for charging triggers."""
+        """Set up internal automations for charging triggers.
+
+        Nothing is set up while the blueprint automation switches the
+        charger, so the integration never switches it on its own. When the
+        charge plan is executed, only plan changes are followed.
+        """
+        if self.config.charge_control == CHARGE_CONTROL_BLUEPRINT:
+            return
+
+        # Follow plan changes while charging segments are scheduled
+        self._unsubscribe_callbacks.append(
+            self.async_add_listener(self._profiled(self._handle_plan_update))
+        )
+        if self.config.charge_control == CHARGE_CONTROL_PLAN:
+            self._handle_plan_update()
+            _LOGGER.info("Charging follows the charge plan")
+            return
+
         # Night charging trigger
-        trigger_time = self._get_config_value(CONF_TRIGGER_TIME, DEFAULT_TRIGGER_TIME)
-        hour, minute = self._parse_time_components(trigger_time)
+        trigger_time = self.config.trigger_time
 
         unsub = async_track_time_change(
             self.hass,
-            self._handle_night_trigger,
-            hour=hour,
-            minute=minute,
+            self._profiled(self._handle_night_trigger),
+            hour=trigger_time // 60,
+            minute=trigger_time % 60,
             second=0,
         )
         self._unsubscribe_callbacks.append(unsub)
 
         # Day charging trigger (if enabled)
-        if self._get_config_value(CONF_DAY_SCHEDULE_ENABLED, DEFAULT_DAY_SCHEDULE_ENABLED):
-            day_start = self._get_config_value(CONF_DAY_START_TIME, DEFAULT_DAY_START_TIME)
-            day_hour, day_minute = self._parse_time_components(day_start)
+        if self.config.day_schedule_enabled:
+            day_start = self.config.day_start
 
             unsub_day = async_track_time_change(
                 self.hass,
-                self._handle_day_trigger,
-                hour=day_hour,
-                minute=day_minute,
+                self._profiled(self._handle_day_trigger),
+                hour=day_start // 60,
+                minute=day_start % 60,
                 second=0,
             )
             self._unsubscribe_callbacks.append(unsub_day)
 
         # Evening peak check trigger
-        evening_peak_start = self._get_config_value(
-            CONF_EVENING_PEAK_START, DEFAULT_EVENING_PEAK_START
-        )
-        peak_hour, peak_minute = self._parse_time_components(evening_peak_start)
-
         # Calculate check time (1 hour before peak)
-        check_minutes = peak_hour * 60 + peak_minute - EMERGENCY_CHECK_BUFFER_MINUTES
-        if check_minutes < 0:
-            check_minutes += 1440
+        check_minutes = (
+            self.config.evening_peak_start - EMERGENCY_CHECK_BUFFER_MINUTES
+        ) % MINUTES_PER_DAY
         check_hour = check_minutes // 60
         check_minute = check_minutes % 60
 
         unsub_peak = async_track_time_change(
             self.hass,
-            self._handle_evening_peak_check,
+            self._profiled(self._handle_evening_peak_check),
             hour=check_hour,
             minute=check_minute,
             second=0,
@@ -729,19 +1428,126 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
         _LOGGER.info("Charging automations set up successfully")
 
-    def _parse_time_components(self, time_str: str) -> tuple[int, int]:
-        """Parse time string into hour and minute components."""
-        if isinstance(time_str, dict):
-            return time_str.get("hour", 0), time_str.get("minute", 0)
-        if ":" in str(time_str):
-            parts = str(time_str).split(":")
-            return int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
-        return 0, 0
+    def _profiled(self, action: Callable[..., Any]) -> Callable[..., Any]:
+        """Return ``action`` wrapped to be measured by a running profiling session."""
+        if inspect.iscoroutinefunction(action):
+
+            async def run_async(*args: Any) -> Any:
+                if self.profiling is None:
+                    return await action(*args)
+                with self.profiling.measure():
+                    return await action(*args)
+
+            return run_async
+
+        @callback
+        def run(*args: Any) -> Any:
+            if self.profiling is None:
+                return action(*args)
+            with self.profiling.measure():
+                return action(*args)
+
+        return run
+
+    @callback
+    def _handle_plan_update(self) -> None:
+        """Reschedule the charge plan, or pre-peak segments and armed night and day segments."""
+        if self.data is None or self.config.charge_control == CHARGE_CONTROL_BLUEPRINT:
+            return
+        if self.config.charge_control == CHARGE_CONTROL_PLAN:
+            self._scheduler.async_schedule(self.data.get("plan_segment_times", []))
+            return
+        now = dt_util.utcnow().timestamp()
+        segments = list(self.data.get("peak_segment_times", []))
+        if now < self._plan_armed_until:
+            segments.extend(self.data.get("segment_times", []))
+        if now < self._day_armed_until:
+            segments.extend(self.data.get("day_segment_times", []))
+        self._scheduler.async_schedule(segments)
+
+    async def _async_start_planned_charging(self) -> None:
+        """Start a planned segment and watch SOC while it charges."""
+        await self.async_start_charging()
+        self._async_watch_soc()
+
+    async def _async_stop_planned_charging(self) -> None:
+        """End a planned segment."""
+        self._async_unwatch_soc()
+        await self.async_stop_charging()
+
+    @callback
+    def _async_watch_soc(self) -> None:
+        """Subscribe to the SOC sensor while planned charging is active."""
+        soc_sensor = self.config.battery_soc_sensor
+        if not soc_sensor or self._soc_unsubscribe is not None:
+            return
+        self._soc_unsubscribe = async_track_state_change_event(
+            self.hass, [soc_sensor], self._profiled(self._handle_soc_change)
+        )
+
+    @callback
+    def _async_unwatch_soc(self) -> None:
+        """Stop watching the SOC sensor."""
+        if self._soc_unsubscribe is not None:
+            self._soc_unsubscribe()
+            self._soc_unsubscribe = None
+
+    @callback
+    def _handle_soc_change(self, event: Event[EventStateChangedData]) -> None:
+        """Stop planned night, day or pre-peak charging as soon as its target is reached."""
+        new_state = event.data["new_state"]
+        if new_state is None:
+            return
+        try:
+            soc = float(new_state.state)
+        except (ValueError, TypeError):
+            return
+
+        now = dt_util.utcnow().timestamp()
+        if now < self._plan_armed_until:
+            schedule, target = "Night", self.config.night_target_soc
+        elif now < self._day_armed_until:
+            schedule, target = "Day", self.config.day_target_soc
+        elif self.config.charge_control == CHARGE_CONTROL_WINDOWS and self._peak_hold is not None and now < self._peak_hold["times"][-1][1]:
+            schedule, target = "Peak", self._peak_hold["stop_soc"]
+        else:
+            return
+
+        if soc < target:
+            return
+
+        self._async_unwatch_soc()
+        if schedule == "Night":
+            self._soc_target_reached = True
+        elif schedule == "Day":
+            self._day_armed_until = 0.0
+        else:
+            self._peak_hold = None
+        self._scheduler.async_mark_stopped()
+        self.hass.async_create_task(self._async_stop_at_target(soc, schedule, target))
+
+    async def _async_stop_at_target(self, soc: float, schedule: str, target: float) -> None:
+        """Stop charging at the SOC target and replan the remaining slots."""
+        _LOGGER.info(
+            "SOC reached %s target (%s >= %s), stopping charging early",
+            schedule.lower(),
+            soc,
+            target,
+        )
+        await self.async_stop_charging()
+        await self.async_refresh()
+
+        if self.config.notify_charging_completed:
+            await self._send_notification(
+                "Battery Charging Completed",
+                f"{schedule} target of {target}% reached at {soc}% SOC.",
+            )
 
     @callback
     async def _handle_night_trigger(self, now: datetime) -> None:
         """Handle night charging trigger."""
         _LOGGER.info("Night charging trigger fired")
+        self._soc_target_reached = False
 
         # Refresh data
         await self.async_refresh()
@@ -760,7 +1566,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
                 current_soc,
                 target_soc,
             )
-            if self._get_config_value(CONF_NOTIFY_CHARGING_SKIPPED, DEFAULT_NOTIFY_CHARGING_SKIPPED):
+            if self.config.notify_charging_skipped:
                 await self._send_notification(
                     "Night Charging Skipped",
                     f"Battery SOC already at target. Current: {current_soc}%, Target: {target_soc}%",
@@ -775,7 +1581,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
         """Handle day charging trigger."""
         _LOGGER.info("Day charging trigger fired")
 
-        if not self._get_config_value(CONF_DAY_SCHEDULE_ENABLED, DEFAULT_DAY_SCHEDULE_ENABLED):
+        if not self.config.day_schedule_enabled:
             return
 
         # Refresh data
@@ -787,7 +1593,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
         # Check if SOC is already at target
         current_soc = self.data.get(ATTR_CURRENT_SOC, 0)
-        day_target = self._get_config_value(CONF_DAY_TARGET_SOC, DEFAULT_DAY_TARGET_SOC)
+        day_target = self.config.day_target_soc
 
         if current_soc >= day_target:
             _LOGGER.info(
@@ -814,9 +1620,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
         # Check if SOC is below evening peak target
         current_soc = self.data.get(ATTR_CURRENT_SOC, 0)
-        evening_target = self._get_config_value(
-            CONF_EVENING_PEAK_TARGET_SOC, DEFAULT_EVENING_PEAK_TARGET_SOC
-        )
+        evening_target = self.config.evening_peak_target_soc
 
         if current_soc >= evening_target:
             _LOGGER.info(
@@ -826,7 +1630,20 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             )
             return
 
-        # Start emergency charging
+        # The forecast already planned pre-peak charging or expects the target to be met
+        forecast = self.data.get(ATTR_PEAK_FORECAST)
+        if forecast is not None:
+            _LOGGER.info(
+                "SOC below evening peak target (%s < %s), following the forecast "
+                "(projected %s%%, %d pre-peak segments)",
+                current_soc,
+                evening_target,
+                forecast["projected_soc"],
+                len(forecast["segments"]),
+            )
+            return
+
+        # Start emergency charging as a last resort
         _LOGGER.warning(
             "SOC below evening peak target (%s < %s), starting emergency charging",
             current_soc,
@@ -835,7 +1652,7 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
 
         await self.async_start_charging()
 
-        if self._get_config_value(CONF_NOTIFY_EMERGENCY_CHARGING, DEFAULT_NOTIFY_EMERGENCY_CHARGING):
+        if self.config.notify_emergency_charging:
             await self._send_notification(
                 "Emergency Charging Started",
                 f"SOC ({current_soc}%) below evening peak target ({evening_target}%). "
@@ -855,8 +1672,12 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             return
 
         _LOGGER.info("Scheduling charging from %s to %s", start_time, end_time)
+        segment_times = self.data.get("segment_times", [])
+        self._plan_armed_until = max((end for _, end in segment_times), default=0.0)
+        self._handle_plan_update()
+        self._store.async_delay_save(self._plan_snapshot, STORAGE_SAVE_DELAY_SECONDS)
 
-        if self._get_config_value(CONF_NOTIFY_CHARGING_SCHEDULED, DEFAULT_NOTIFY_CHARGING_SCHEDULED):
+        if self.config.notify_charging_scheduled:
             duration = self.data.get(ATTR_CHARGING_DURATION, 0)
             cost = self.data.get(ATTR_ESTIMATED_COST, 0)
             await self._send_notification(
@@ -866,8 +1687,26 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
             )
 
     async def _schedule_day_charging_window(self) -> None:
-        """Schedule day charging window."""
-        _LOGGER.info("Scheduling day charging window")
+        """Schedule charging in the calculated day window until the window ends."""
+        if self.data is None:
+            return
+
+        window = self.data.get(ATTR_DAY_WINDOW)
+        if not window:
+            _LOGGER.warning("No day charging window calculated")
+            return
+
+        _LOGGER.info("Scheduling day charging from %s to %s", window["start"], window["end"])
+        self._day_armed_until = self._window_bounds(self.config.day_start, self.config.day_end)[1]
+        self._handle_plan_update()
+        self._store.async_delay_save(self._plan_snapshot, STORAGE_SAVE_DELAY_SECONDS)
+
+        if self.config.notify_charging_scheduled:
+            await self._send_notification(
+                "Day Charging Scheduled",
+                f"Charging scheduled from {window['start'][:5]} to {window['end'][:5]}. "
+                f"Duration: {window['duration']}h, Estimated cost: {window['cost']:.4f} EUR",
+            )
 
     async def _send_notification(self, title: str, message: str) -> None:
         """Send a notification."""
@@ -890,5 +1729,13 @@ class TibberCheapestChargingCoordinator(DataUpdateCoordinator):
         for unsub in self._unsubscribe_callbacks:
             unsub()
         self._unsubscribe_callbacks.clear()
+        self._scheduler.async_cancel()
+        self._async_unwatch_soc()
+
+        # Write the plan now, a reload would drop the delayed save
+        if self.data is not None:
+            await self._store.async_save(self._plan_snapshot())
+
+        await super().async_shutdown()
 
         _LOGGER.info("Coordinator shutdown complete")
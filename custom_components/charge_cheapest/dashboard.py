@@ -3,10 +3,9 @@
 from __future__ import annotations
 
 import logging
-from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
 
 from .const import (
     DASHBOARD_TITLE,
@@ -18,271 +17,6 @@ from .const import (
 _LOGGER = logging.getLogger(__name__)
 
 
-# Dashboard configuration converted from dashboards/charge_cheapest.yaml
-DASHBOARD_CONFIG: dict[str, Any] = {
-    "title": DASHBOARD_TITLE,
-    "views": [
-        # Overview Tab
-        {
-            "title": "Overview",
-            "path": "overview",
-            "icon": "mdi:battery-charging",
-            "cards": [
-                # Status Card
-                {
-                    "type": "entities",
-                    "title": "Charging Status",
-                    "show_header_toggle": False,
-                    "entities": [
-                        {
-                            "entity": "sensor.charge_cheapest_status",
-                            "name": "Status",
-                        },
-                        {
-                            "entity": "sensor.charge_cheapest_current_price",
-                            "name": "Current Price",
-                        },
-                        {
-                            "entity": "sensor.charge_cheapest_next_window",
-                            "name": "Next Window",
-                        },
-                        {
-                            "entity": "binary_sensor.charge_cheapest_is_cheap_hour",
-                            "name": "Cheap Hour",
-                        },
-                    ],
-                },
-                # Battery SOC Gauge (conditional)
-                {
-                    "type": "conditional",
-                    "conditions": [
-                        {
-                            "condition": "state",
-                            "entity": "binary_sensor.charge_cheapest_system_ready",
-                            "state": "on",
-                        }
-                    ],
-                    "card": {
-                        "type": "gauge",
-                        "name": "Target SOC",
-                        "needle": True,
-                        "min": 0,
-                        "max": 100,
-                        "severity": {"green": 60, "yellow": 30, "red": 0},
-                        "entity": "sensor.charge_cheapest_target_soc",
-                    },
-                },
-                # Price Chart - ApexCharts (conditional)
-                {
-                    "type": "conditional",
-                    "conditions": [
-                        {
-                            "condition": "state",
-                            "entity": "binary_sensor.charge_cheapest_system_ready",
-                            "state": "on",
-                        }
-                    ],
-                    "card": {
-                        "type": "custom:apexcharts-card",
-                        "header": {
-                            "show": True,
-                            "title": "Electricity Prices",
-                            "show_states": True,
-                            "colorize_states": True,
-                        },
-                        "graph_span": "48h",
-                        "span": {"start": "day"},
-                        "apex_config": {
-                            "chart": {"height": "300px"},
-                            "xaxis": {
-                                "labels": {"datetimeFormatter": {"hour": "HH:mm"}}
-                            },
-                            "yaxis": {"decimalsInFloat": 3},
-                            "tooltip": {"x": {"format": "dd MMM HH:mm"}},
-                        },
-                        "series": [
-                            {
-                                "entity": "sensor.charge_cheapest_current_price",
-                                "name": "Price",
-                                "type": "area",
-                                "color": "#4CAF50",
-                                "stroke_width": 2,
-                                "opacity": 0.3,
-                            }
-                        ],
-                    },
-                },
-                # Price Chart Fallback - History Graph
-                {
-                    "type": "history-graph",
-                    "title": "Price History",
-                    "hours_to_show": 24,
-                    "entities": [
-                        {
-                            "entity": "sensor.charge_cheapest_current_price",
-                            "name": "Price",
-                        }
-                    ],
-                },
-                # Cheapest Hours Info
-                {
-                    "type": "markdown",
-                    "title": "Price Information",
-                    "content": "**Today's Range:** {{ states('sensor.charge_cheapest_price_range') }}\n\n"
-                    "**Current Price:** {{ states('sensor.charge_cheapest_current_price') }} EUR/kWh\n\n"
-                    "**Tomorrow Available:** {{ 'Yes' if is_state('binary_sensor.charge_cheapest_prices_available_tomorrow', 'on') else 'No' }}\n\n"
-                    "**Recommended SOC:** {{ states('sensor.charge_cheapest_recommended_soc') }}%",
-                },
-            ],
-        },
-        # Statistics Tab
-        {
-            "title": "Statistics",
-            "path": "statistics",
-            "icon": "mdi:chart-line",
-            "cards": [
-                # Savings Summary
-                {
-                    "type": "entities",
-                    "title": "Savings Summary",
-                    "show_header_toggle": False,
-                    "entities": [
-                        {
-                            "entity": "sensor.charge_cheapest_estimated_savings",
-                            "name": "Estimated Savings Today",
-                        },
-                    ],
-                },
-                # Charging Statistics
-                {
-                    "type": "entities",
-                    "title": "Charging Information",
-                    "show_header_toggle": False,
-                    "entities": [
-                        {
-                            "entity": "sensor.charge_cheapest_charging_duration",
-                            "name": "Charging Duration",
-                        },
-                        {
-                            "entity": "sensor.charge_cheapest_target_soc",
-                            "name": "Target SOC",
-                        },
-                    ],
-                },
-                # Charging Status History
-                {
-                    "type": "history-graph",
-                    "title": "Charging Activity",
-                    "hours_to_show": 48,
-                    "entities": [
-                        {
-                            "entity": "binary_sensor.charge_cheapest_is_charging",
-                            "name": "Charging",
-                        }
-                    ],
-                },
-                # Price History
-                {
-                    "type": "history-graph",
-                    "title": "Price Trends",
-                    "hours_to_show": 48,
-                    "entities": [
-                        {
-                            "entity": "sensor.charge_cheapest_current_price",
-                            "name": "Price",
-                        }
-                    ],
-                },
-                # Cost Comparison Card
-                {
-                    "type": "markdown",
-                    "title": "Cost Analysis",
-                    "content": "**Charging Strategy Performance**\n\n"
-                    "*Daily Savings:* {{ states('sensor.charge_cheapest_estimated_savings') }} EUR\n\n"
-                    "---\n\n"
-                    "*Tip: Charging during cheap hours can save 20-50% compared to average grid prices.*",
-                },
-            ],
-        },
-        # Configuration Tab
-        {
-            "title": "Configuration",
-            "path": "configuration",
-            "icon": "mdi:cog",
-            "cards": [
-                # Validation Status
-                {
-                    "type": "entities",
-                    "title": "System Status",
-                    "show_header_toggle": False,
-                    "entities": [
-                        {
-                            "entity": "binary_sensor.charge_cheapest_system_ready",
-                            "name": "All Dependencies OK",
-                            "icon": "mdi:check-circle",
-                        },
-                        {
-                            "entity": "binary_sensor.charge_cheapest_prices_available_tomorrow",
-                            "name": "Tomorrow Prices Available",
-                            "icon": "mdi:calendar-check",
-                        },
-                    ],
-                },
-                # Configuration Status OK
-                {
-                    "type": "conditional",
-                    "conditions": [
-                        {
-                            "condition": "state",
-                            "entity": "binary_sensor.charge_cheapest_system_ready",
-                            "state": "on",
-                        }
-                    ],
-                    "card": {
-                        "type": "markdown",
-                        "content": "**Configuration Status: OK**\n\n"
-                        "All required entities are configured and responding correctly.",
-                    },
-                },
-                # Configuration Status Incomplete
-                {
-                    "type": "conditional",
-                    "conditions": [
-                        {
-                            "condition": "state",
-                            "entity": "binary_sensor.charge_cheapest_system_ready",
-                            "state": "off",
-                        }
-                    ],
-                    "card": {
-                        "type": "markdown",
-                        "content": "**Configuration Status: Incomplete**\n\n"
-                        "Please check the integration configuration:\n"
-                        "1. Verify your price sensor entity ID\n"
-                        "2. Verify your battery SOC sensor entity ID\n"
-                        "3. Verify your battery charging switch entity ID\n\n"
-                        "Go to Settings > Devices & Services > Charge Cheapest to reconfigure.",
-                    },
-                },
-                # System Information
-                {
-                    "type": "markdown",
-                    "title": "System Information",
-                    "content": "**Charge Cheapest**\n\n"
-                    "*Version:* 1.0.0\n\n"
-                    "*Status:* {{ 'Connected' if is_state('binary_sensor.charge_cheapest_system_ready', 'on') else 'Configuration Required' }}\n\n"
-                    "*Charging Status:* {{ states('sensor.charge_cheapest_status') }}\n\n"
-                    "---\n\n"
-                    "**Documentation**\n\n"
-                    "For setup instructions and troubleshooting, visit the GitHub repository.\n\n"
-                    "**Note:** To install ApexCharts for price visualization, add the custom:apexcharts-card via HACS.",
-                },
-            ],
-        },
-    ],
-}
-
-
 async def async_setup_dashboard(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Set up the dashboard on first integration setup."""
     # Check if dashboard already exists
@@ -291,7 +25,32 @@ async def async_setup_dashboard(hass: HomeAssistant, entry: ConfigEntry) -> None
         return
 
     # Create dashboard
-    await _create_dashboard(hass)
+    await _create_dashboard(hass, entry)
+
+
+async def async_reconcile_dashboard(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Bring the dashboard in line with the generated configuration.
+
+    The stored configuration is only rewritten when it differs from the
+    generated one, so frontends keep the dashboard when nothing changed.
+
+    Returns:
+        True if the dashboard was created or its configuration written
+    """
+    if not await _dashboard_exists(hass):
+        await _create_dashboard(hass, entry)
+        return True
+
+    from .dashboard_template import build_dashboard_config
+
+    config = build_dashboard_config(_entity_ids(hass, entry))
+    if await _load_dashboard_config(hass) == config:
+        _LOGGER.debug("Dashboard configuration is up to date")
+        return False
+
+    await _store_dashboard_config(hass, config)
+    _LOGGER.info("Dashboard configuration updated")
+    return True
 
 
 async def async_register_dashboard_service(hass: HomeAssistant) -> None:
@@ -299,22 +58,24 @@ async def async_register_dashboard_service(hass: HomeAssistant) -> None:
     if hass.services.has_service(DOMAIN, SERVICE_RECREATE_DASHBOARD):
         return
 
-    async def handle_recreate_dashboard(call: ServiceCall) -> None:
+    async def handle_recreate_dashboard(call: ServiceCall) -> ServiceResponse:
         """Handle the recreate_dashboard service call."""
-        _LOGGER.info("Recreating dashboard...")
-
-        # Delete existing dashboard if present
-        await _delete_dashboard(hass)
-
-        # Create fresh dashboard
-        await _create_dashboard(hass)
+        entries = [
+            entry
+            for entry in hass.config_entries.async_entries(DOMAIN)
+            if entry.entry_id in hass.data.get(DOMAIN, {})
+        ]
+        if not entries:
+            _LOGGER.warning("No loaded config entry to recreate the dashboard for")
+            return {"changed": False}
 
-        _LOGGER.info("Dashboard recreated successfully")
+        return {"changed": await async_reconcile_dashboard(hass, entries[0])}
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_RECREATE_DASHBOARD,
         handle_recreate_dashboard,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
 
@@ -343,8 +104,25 @@ async def _dashboard_exists(hass: HomeAssistant) -> bool:
     return False
 
 
-async def _create_dashboard(hass: HomeAssistant) -> None:
-    """Create the dashboard."""
+def _entity_ids(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, str]:
+    """Return the registered entity id of each dashboard entity of ``entry``."""
+    from homeassistant.helpers import entity_registry as er
+
+    from .dashboard_template import DASHBOARD_ENTITIES
+
+    registry = er.async_get(hass)
+    entity_ids: dict[str, str] = {}
+    for key, platform in DASHBOARD_ENTITIES.items():
+        entity_id = registry.async_get_entity_id(
+            platform, DOMAIN, f"{entry.entry_id}_{key}"
+        )
+        if entity_id:
+            entity_ids[key] = entity_id
+    return entity_ids
+
+
+async def _create_dashboard(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Create the dashboard for the entities of ``entry``."""
     try:
         # Use storage collection to create dashboard
         from homeassistant.components.lovelace import DOMAIN as LOVELACE_DOMAIN
@@ -366,8 +144,10 @@ async def _create_dashboard(hass: HomeAssistant) -> None:
             "mode": MODE_STORAGE,
         }
 
-        # Store dashboard views
-        lovelace_config = DASHBOARD_CONFIG.copy()
+        # Generate dashboard views only now that they are needed
+        from .dashboard_template import build_dashboard_config
+
+        lovelace_config = build_dashboard_config(_entity_ids(hass, entry))
 
         # Try to create using lovelace storage
         if LOVELACE_DOMAIN in hass.data:
@@ -407,36 +187,17 @@ async def _store_dashboard_config(hass: HomeAssistant, config: dict) -> None:
         _LOGGER.warning("Could not store dashboard config: %s", err)
 
 
-async def _delete_dashboard(hass: HomeAssistant) -> None:
-    """Delete the existing dashboard."""
+async def _load_dashboard_config(hass: HomeAssistant) -> dict | None:
+    """Load the stored dashboard configuration."""
     try:
-        from homeassistant.components.lovelace import DOMAIN as LOVELACE_DOMAIN
-
-        if LOVELACE_DOMAIN in hass.data:
-            lovelace_data = hass.data[LOVELACE_DOMAIN]
-
-            if hasattr(lovelace_data, "dashboards"):
-                try:
-                    dashboards_collection = lovelace_data.dashboards
-                    if DASHBOARD_URL_PATH in dashboards_collection:
-                        if hasattr(dashboards_collection, "async_delete_item"):
-                            await dashboards_collection.async_delete_item(
-                                DASHBOARD_URL_PATH
-                            )
-                            _LOGGER.info("Existing dashboard deleted")
-                            return
-                except Exception as err:
-                    _LOGGER.debug("Could not delete via dashboards collection: %s", err)
-
-        # Fallback: Try to remove storage file
-        try:
-            from homeassistant.helpers.storage import Store
-
-            store = Store(hass, 1, f"lovelace.{DASHBOARD_URL_PATH}")
-            await store.async_remove()
-            _LOGGER.debug("Dashboard storage removed")
-        except Exception:
-            pass
+        from homeassistant.helpers.storage import Store
 
+        store = Store(hass, 1, f"lovelace.{DASHBOARD_URL_PATH}")
+        stored = await store.async_load()
     except Exception as err:
-        _LOGGER.debug("Could not delete dashboard: %s", err)
+        _LOGGER.debug("Could not load dashboard config: %s", err)
+        return None
+
+    if not isinstance(stored, dict):
+        return None
+    return stored.get("data")
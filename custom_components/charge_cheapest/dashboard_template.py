@@ -0,0 +1,216 @@
+"""Dashboard template for Charge Cheapest integration.
+
+The lovelace configuration is only needed when the dashboard is created, so
+it is generated on demand from compact card helpers instead of being kept as
+a module-level dict. Entities are referenced by their description key and
+resolved to the entity ids of one config entry.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from .const import DASHBOARD_TITLE, DOMAIN, VERSION
+
+# Entity description keys used on the dashboard, with their platform
+DASHBOARD_ENTITIES: dict[str, str] = {
+    "status": "sensor",
+    "current_price": "sensor",
+    "next_window": "sensor",
+    "target_soc": "sensor",
+    "price_range": "sensor",
+    "recommended_soc": "sensor",
+    "estimated_savings": "sensor",
+    "charging_duration": "sensor",
+    "is_cheap_hour": "binary_sensor",
+    "is_charging": "binary_sensor",
+    "prices_available_tomorrow": "binary_sensor",
+    "system_ready": "binary_sensor",
+}
+
+_PRICE_INFO = (
+    "**Today's Range:** {{ states('%(price_range)s') }}\n\n"
+    "**Current Price:** {{ states('%(current_price)s') }} EUR/kWh\n\n"
+    "**Tomorrow Available:** {{ 'Yes' if is_state('%(prices_available_tomorrow)s', 'on') else 'No' }}\n\n"
+    "**Recommended SOC:** {{ states('%(recommended_soc)s') }}%%"
+)
+
+_COST_ANALYSIS = (
+    "**Charging Strategy Performance**\n\n*Daily Savings:* {{ states('%(estimated_savings)s') }} EUR\n\n---\n\n*Tip: Charging during cheap hours can save 20-50%% compared to average grid prices.*"
+)
+
+_SYSTEM_INFO = (
+    "**Charge Cheapest**\n\n"
+    f"*Version:* {VERSION}\n\n"
+    "*Status:* {{ 'Connected' if is_state('%(system_ready)s', 'on') else 'Configuration Required' }}\n\n"
+    "*Charging Status:* {{ states('%(status)s') }}\n\n"
+    "---\n\n"
+    "**Documentation**\n\n"
+    "For setup instructions and troubleshooting, visit the GitHub repository.\n\n"
+    "**Note:** To install ApexCharts for price visualization, add the custom:apexcharts-card via HACS."
+)
+
+_CONFIG_OK = "**Configuration Status: OK**\n\nAll required entities are configured and responding correctly."
+
+_CONFIG_INCOMPLETE = (
+    "**Configuration Status: Incomplete**\n\n"
+    "Please check the integration configuration:\n"
+    "1. Verify your price sensor entity ID\n"
+    "2. Verify your battery SOC sensor entity ID\n"
+    "3. Verify your battery charging switch entity ID\n\n"
+    "Go to Settings > Devices & Services > Charge Cheapest to reconfigure."
+)
+
+
+def default_entity_ids() -> dict[str, str]:
+    """Return the entity ids Home Assistant assigns to a first config entry."""
+    return {key: f"{platform}.{DOMAIN}_{key}" for key, platform in DASHBOARD_ENTITIES.items()}
+
+
+def build_dashboard_config(entity_ids: Mapping[str, str]) -> dict[str, Any]:
+    """Return the lovelace configuration for one config entry.
+
+    Args:
+        entity_ids: Entity id per key of ``DASHBOARD_ENTITIES``
+
+    Returns:
+        Dashboard configuration with title and views
+    """
+    ids = {**default_entity_ids(), **entity_ids}
+
+    def row(key: str, name: str, icon: str | None = None) -> dict[str, Any]:
+        entity: dict[str, Any] = {"entity": ids[key], "name": name}
+        if icon:
+            entity["icon"] = icon
+        return entity
+
+    def entities_card(title: str, *rows: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "type": "entities",
+            "title": title,
+            "show_header_toggle": False,
+            "entities": list(rows),
+        }
+
+    def history_card(title: str, hours: int, key: str, name: str) -> dict[str, Any]:
+        return {
+            "type": "history-graph",
+            "title": title,
+            "hours_to_show": hours,
+            "entities": [row(key, name)],
+        }
+
+    def markdown_card(content: str, title: str | None = None) -> dict[str, Any]:
+        card: dict[str, Any] = {"type": "markdown"}
+        if title:
+            card["title"] = title
+        card["content"] = content % ids
+        return card
+
+    def when_ready(card: dict[str, Any], state: str = "on") -> dict[str, Any]:
+        return {
+            "type": "conditional",
+            "conditions": [{"condition": "state", "entity": ids["system_ready"], "state": state}],
+            "card": card,
+        }
+
+    price_chart = {
+        "type": "custom:apexcharts-card",
+        "header": {
+            "show": True,
+            "title": "Electricity Prices",
+            "show_states": True,
+            "colorize_states": True,
+        },
+        "graph_span": "48h",
+        "span": {"start": "day"},
+        "apex_config": {
+            "chart": {"height": "300px"},
+            "xaxis": {"labels": {"datetimeFormatter": {"hour": "HH:mm"}}},
+            "yaxis": {"decimalsInFloat": 3},
+            "tooltip": {"x": {"format": "dd MMM HH:mm"}},
+        },
+        "series": [
+            {
+                "entity": ids["current_price"],
+                "name": "Price",
+                "type": "area",
+                "color": "#4CAF50",
+                "stroke_width": 2,
+                "opacity": 0.3,
+            }
+        ],
+    }
+
+    soc_gauge = {
+        "type": "gauge",
+        "name": "Target SOC",
+        "needle": True,
+        "min": 0,
+        "max": 100,
+        "severity": {"green": 60, "yellow": 30, "red": 0},
+        "entity": ids["target_soc"],
+    }
+
+    return {
+        "title": DASHBOARD_TITLE,
+        "views": [
+            {
+                "title": "Overview",
+                "path": "overview",
+                "icon": "mdi:battery-charging",
+                "cards": [
+                    entities_card(
+                        "Charging Status",
+                        row("status", "Status"),
+                        row("current_price", "Current Price"),
+                        row("next_window", "Next Window"),
+                        row("is_cheap_hour", "Cheap Hour"),
+                    ),
+                    when_ready(soc_gauge),
+                    when_ready(price_chart),
+                    history_card("Price History", 24, "current_price", "Price"),
+                    markdown_card(_PRICE_INFO, "Price Information"),
+                ],
+            },
+            {
+                "title": "Statistics",
+                "path": "statistics",
+                "icon": "mdi:chart-line",
+                "cards": [
+                    entities_card(
+                        "Savings Summary",
+                        row("estimated_savings", "Estimated Savings Today"),
+                    ),
+                    entities_card(
+                        "Charging Information",
+                        row("charging_duration", "Charging Duration"),
+                        row("target_soc", "Target SOC"),
+                    ),
+                    history_card("Charging Activity", 48, "is_charging", "Charging"),
+                    history_card("Price Trends", 48, "current_price", "Price"),
+                    markdown_card(_COST_ANALYSIS, "Cost Analysis"),
+                ],
+            },
+            {
+                "title": "Configuration",
+                "path": "configuration",
+                "icon": "mdi:cog",
+                "cards": [
+                    entities_card(
+                        "System Status",
+                        row("system_ready", "All Dependencies OK", "mdi:check-circle"),
+                        row(
+                            "prices_available_tomorrow",
+                            "Tomorrow Prices Available",
+                            "mdi:calendar-check",
+                        ),
+                    ),
+                    when_ready(markdown_card(_CONFIG_OK)),
+                    when_ready(markdown_card(_CONFIG_INCOMPLETE), "off"),
+                    markdown_card(_SYSTEM_INFO, "System Information"),
+                ],
+            },
+        ],
+    }
@@ -0,0 +1,51 @@
+"""Diagnostics support for Charge Cheapest integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_BATTERY_CAPACITY_SENSOR,
+    CONF_BATTERY_CHARGING_POWER,
+    CONF_BATTERY_CHARGING_SWITCH,
+    CONF_BATTERY_SOC_SENSOR,
+    CONF_NOTIFICATION_SERVICE,
+    CONF_PRICE_SENSOR,
+    CONF_SOLAR_FORECAST_SENSOR,
+    DOMAIN,
+)
+from .coordinator import TibberCheapestChargingCoordinator
+
+# Entity IDs and the notify target can name devices, people or rooms
+TO_REDACT = {
+    CONF_BATTERY_CAPACITY_SENSOR,
+    CONF_BATTERY_CHARGING_POWER,
+    CONF_BATTERY_CHARGING_SWITCH,
+    CONF_BATTERY_SOC_SENSOR,
+    CONF_NOTIFICATION_SERVICE,
+    CONF_PRICE_SENSOR,
+    CONF_SOLAR_FORECAST_SENSOR,
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the settings, latest data and planning internals of a config entry."""
+    coordinator: TibberCheapestChargingCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    interval = coordinator.update_interval
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval_seconds": interval.total_seconds() if interval else None,
+            "data": coordinator.data,
+        },
+        **coordinator.diagnostics(),
+    }
@@ -0,0 +1,53 @@
+"""Base entity for Charge Cheapest integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import TibberCheapestChargingCoordinator
+
+
+class TibberCheapestChargingEntity(CoordinatorEntity[TibberCheapestChargingCoordinator]):
+    """Coordinator entity that writes its state only on material changes.
+
+    Every state write with a changed state or attribute is a new recorder
+    row. Attributes in ``_volatile_attributes`` change on nearly every
+    refresh without meaning anything, so a change of only those is not
+    written; they are refreshed with the next material change. A dotted
+    name such as ``charge_plan.planned_at`` marks a single key of a
+    dictionary attribute as volatile.
+    """
+
+    _volatile_attributes: frozenset[str] = frozenset()
+
+    _written: tuple[Any, ...] | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state if it or a non-volatile attribute changed."""
+        available, state, attributes = self.available, self.state, self._material_attributes()
+        if self._written is not None:
+            written_available, written_state, written_attributes = self._written
+            if available == written_available and attributes == written_attributes and not self._state_changed(written_state, state):
+                return
+        self._written = (available, state, attributes)
+        super()._handle_coordinator_update()
+
+    def _state_changed(self, written: Any, state: Any) -> bool:
+        """Return True if ``state`` differs materially from the written state."""
+        return state != written
+
+    def _material_attributes(self) -> dict[str, Any]:
+        """Return the state attributes without the volatile ones."""
+        volatile = self._volatile_attributes
+        material = {}
+        for key, value in (self.extra_state_attributes or {}).items():
+            if key in volatile:
+                continue
+            if isinstance(value, dict):
+                value = {field: item for field, item in value.items() if f"{key}.{field}" not in volatile}
+            material[key] = value
+        return material
@@ -0,0 +1,91 @@
+"""Evening-peak SOC forecast for Charge Cheapest integration.
+
+The SOC at the start of the evening peak is projected from the household
+drain measured over the last hours and the solar yield still expected
+before the peak. The solar forecast is a daily total, so it is spread over
+the day with a half-sine profile between sunrise and sunset. The same
+profile is used to take the solar yield out of the measured drain.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import Callable
+
+
+def solar_share(start: float, end: float, sunrise: float, sunset: float) -> float:
+    """Return the share of a day's solar yield produced between two epochs."""
+    if sunset <= sunrise or end <= start:
+        return 0.0
+
+    def produced(timestamp: float) -> float:
+        progress = min(max((timestamp - sunrise) / (sunset - sunrise), 0.0), 1.0)
+        return (1 - math.cos(math.pi * progress)) / 2
+
+    return produced(end) - produced(start)
+
+
+def project_soc(
+    soc: float,
+    start: float,
+    end: float,
+    drain_per_hour: float,
+    solar_soc: Callable[[float, float], float],
+) -> float:
+    """Return the SOC (%) expected at ``end`` without any grid charging.
+
+    Args:
+        soc: State of charge (%) at ``start``
+        start: Epoch of the measurement
+        end: Epoch to project to
+        drain_per_hour: Household drain in SOC % per hour
+        solar_soc: SOC % added by solar between two epochs
+    """
+    hours = max(0.0, end - start) / 3600
+    projected = soc - drain_per_hour * hours + solar_soc(start, end)
+    return min(100.0, max(0.0, projected))
+
+
+class DrainEstimator:
+    """Measure the household drain from SOC samples taken while not charging."""
+
+    __slots__ = ("_last_rate", "_min_seconds", "_samples", "_window_seconds")
+
+    def __init__(self, window_seconds: float, min_seconds: float) -> None:
+        """Initialize with the sample window and the shortest usable span."""
+        self._window_seconds = window_seconds
+        self._min_seconds = min_seconds
+        self._samples: deque[tuple[float, float]] = deque()
+        self._last_rate: float | None = None
+
+    def add(self, timestamp: float, soc: float, charging: bool) -> None:
+        """Record a SOC sample; grid charging breaks the series.
+
+        A negative SOC stands for an unavailable sensor and is skipped, so a
+        short dropout keeps the samples taken so far.
+        """
+        if soc < 0:
+            return
+        if charging:
+            self._samples.clear()
+            return
+        if self._samples and self._samples[-1][0] >= timestamp:
+            return
+        self._samples.append((timestamp, soc))
+        while self._samples[0][0] < timestamp - self._window_seconds:
+            self._samples.popleft()
+
+    def rate(self, solar_soc: Callable[[float, float], float]) -> float | None:
+        """Return the drain in SOC % per hour with the solar yield taken out.
+
+        While too few samples were taken since the last charge, the last
+        measured rate is returned, or None if there never was one.
+        """
+        if len(self._samples) >= 2:
+            (first_time, first_soc), (last_time, last_soc) = self._samples[0], self._samples[-1]
+            seconds = last_time - first_time
+            if seconds >= self._min_seconds:
+                consumed = first_soc - last_soc + solar_soc(first_time, last_time)
+                self._last_rate = max(0.0, consumed / (seconds / 3600))
+        return self._last_rate
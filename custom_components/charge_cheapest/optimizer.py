@@ -0,0 +1,321 @@
+"""SOC trajectory optimizer for Charge Cheapest integration.
+
+The night, day and evening-peak targets are solved together as one charge
+plan over every known price slot. The state of the dynamic program is the
+number of slots charged so far, so the SOC grid step is exactly the SOC a
+single slot of charging adds. The grid therefore never has more than
+``100 / soc_per_slot`` states, and a two-day horizon solves in a few
+milliseconds.
+
+The household drain is a constant SOC loss in every slot that is not
+charged, as the grid supplies the household while charging, and solar adds
+its share in every slot. Each charged slot then lifts the SOC at all later
+boundaries by the same amount, so the SOC at a boundary still follows from
+the number of charged slots alone.
+
+A plan is only recalculated when the policy in ``replan_reason`` asks for
+it: on a new price revision, a changed solar forecast or other planning
+input, or when the measured SOC drifted too far from the planned
+trajectory, drain and solar included. Each re-plan covers the remaining
+horizon from the current slot, and the charging that already happened is
+carried over unchanged.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Hashable, Sequence
+from dataclasses import dataclass
+
+from .window import ChargingWindow
+
+_INF = float("inf")
+
+REPLAN_INITIAL = "initial"
+REPLAN_PRICES = "prices"
+REPLAN_FORECAST = "forecast"
+REPLAN_INPUTS = "inputs"
+REPLAN_HORIZON = "horizon"
+REPLAN_SOC_DRIFT = "soc_drift"
+
+
+@dataclass(frozen=True, slots=True)
+class SocTarget:
+    """A minimum SOC (%) that must be reached before slot ``slot`` starts."""
+
+    slot: int
+    soc: float
+
+
+@dataclass(frozen=True, slots=True)
+class ChargePlan:
+    """Charging segments of an optimized SOC trajectory."""
+
+    segments: tuple[ChargingWindow, ...]
+    cost: float
+    end_soc: float
+
+    @property
+    def slots(self) -> int:
+        """Return the number of charged slots."""
+        return sum(segment.slots for segment in self.segments)
+
+
+@dataclass(frozen=True, slots=True)
+class RollingPlan:
+    """A charge plan for the remaining horizon, anchored at its first slot.
+
+    ``charged`` flags every slot from ``anchor`` on, and ``start_soc`` was
+    measured at ``planned_at`` within the first slot. ``solar`` holds the
+    SOC solar adds in each slot. Charging periods of earlier plans that lie
+    before ``planned_at`` are kept in ``executed``.
+    """
+
+    anchor: float
+    planned_at: float
+    slot_seconds: float
+    start_soc: float
+    soc_per_slot: float
+    charged: bytes
+    price_revision: int | None
+    forecast: Hashable
+    inputs: Hashable
+    executed: tuple[tuple[float, float], ...] = ()
+    drain_per_slot: float = 0.0
+    solar: tuple[float, ...] = ()
+
+    @property
+    def end(self) -> float:
+        """Return the epoch the planned horizon ends at."""
+        return self.anchor + len(self.charged) * self.slot_seconds
+
+    def soc_at(self, timestamp: float) -> float:
+        """Return the SOC (%) the plan expects at ``timestamp``.
+
+        Charged slots add ``soc_per_slot``, all other slots lose
+        ``drain_per_slot``, and solar adds its share in every slot.
+        """
+        timestamp = max(timestamp, self.planned_at)
+        slots = self._slots_until(timestamp) - self._slots_until(self.planned_at)
+        charged = self._charged_until(timestamp) - self._charged_until(self.planned_at)
+        solar = self._solar_until(timestamp) - self._solar_until(self.planned_at)
+        soc = self.start_soc + charged * self.soc_per_slot - (slots - charged) * self.drain_per_slot + solar
+        return min(100.0, max(0.0, soc))
+
+    def _slots_until(self, timestamp: float) -> float:
+        """Return the slots elapsed from the anchor to ``timestamp``."""
+        return max(0.0, min(timestamp, self.end) - self.anchor) / self.slot_seconds
+
+    def _charged_until(self, timestamp: float) -> float:
+        """Return the number of slots charged from the anchor to ``timestamp``."""
+        elapsed = self._slots_until(timestamp)
+        full = int(elapsed)
+        slots: float = sum(self.charged[:full])
+        if full < len(self.charged) and self.charged[full]:
+            slots += elapsed - full
+        return slots
+
+    def _solar_until(self, timestamp: float) -> float:
+        """Return the SOC (%) solar adds from the anchor to ``timestamp``."""
+        elapsed = self._slots_until(timestamp)
+        full = int(elapsed)
+        solar = sum(self.solar[:full])
+        if full < len(self.solar):
+            solar += self.solar[full] * (elapsed - full)
+        return solar
+
+    def periods(self) -> tuple[tuple[float, float], ...]:
+        """Return executed and planned charging as start and end epochs."""
+        periods = list(self.executed)
+        slot = 0
+        while slot < len(self.charged):
+            if not self.charged[slot]:
+                slot += 1
+                continue
+            start = slot
+            while slot < len(self.charged) and self.charged[slot]:
+                slot += 1
+            period = (
+                max(self.planned_at, self.anchor + start * self.slot_seconds),
+                self.anchor + slot * self.slot_seconds,
+            )
+            if periods and periods[-1][1] >= period[0]:
+                periods[-1] = (periods[-1][0], max(periods[-1][1], period[1]))
+            else:
+                periods.append(period)
+        return tuple(periods)
+
+    def executed_before(self, timestamp: float, since: float) -> tuple[tuple[float, float], ...]:
+        """Return the charging periods between ``since`` and ``timestamp``, clipped to them."""
+        return tuple((max(start, since), min(end, timestamp)) for start, end in self.periods() if start < timestamp and end > since)
+
+
+def replan_reason(
+    plan: RollingPlan | None,
+    price_revision: int | None,
+    forecast: Hashable,
+    inputs: Hashable,
+    timestamp: float,
+    soc: float,
+    max_drift: float,
+) -> str | None:
+    """Return why ``plan`` has to be recalculated, or None to keep it.
+
+    Args:
+        plan: Current plan, None if there is none
+        price_revision: Revision of the parsed prices
+        forecast: Fingerprint of the solar forecast
+        inputs: Fingerprint of all other planning inputs
+        timestamp: Current epoch
+        soc: Measured state of charge (%)
+        max_drift: SOC (%) the measurement may deviate from the plan
+    """
+    if plan is None:
+        return REPLAN_INITIAL
+    if price_revision != plan.price_revision:
+        return REPLAN_PRICES
+    if forecast != plan.forecast:
+        return REPLAN_FORECAST
+    if inputs != plan.inputs:
+        return REPLAN_INPUTS
+    if timestamp >= plan.end:
+        return REPLAN_HORIZON
+    if abs(soc - plan.soc_at(timestamp)) >= max_drift:
+        return REPLAN_SOC_DRIFT
+    return None
+
+
+def charging_slots(
+    current_soc: float,
+    target_soc: float,
+    capacity_kwh: float,
+    charge_power_kw: float,
+    efficiency: float,
+    slot_hours: float,
+) -> int:
+    """Return the slots needed to charge from ``current_soc`` to ``target_soc``.
+
+    Any positive SOC delta needs at least one slot.
+    """
+    soc_delta = target_soc - current_soc
+    if soc_delta <= 0:
+        return 0
+
+    energy_needed_kwh = (soc_delta / 100) * capacity_kwh
+    hours_needed = energy_needed_kwh / (charge_power_kw * efficiency)
+    return (max(hours_needed, slot_hours) / slot_hours).__ceil__()
+
+
+def _required_slots(target_soc: float, start_soc: float, soc_per_slot: float) -> int:
+    """Return the number of charged slots needed to lift ``start_soc`` to ``target_soc``."""
+    if target_soc <= start_soc:
+        return 0
+    return math.ceil(round((target_soc - start_soc) / soc_per_slot, 9))
+
+
+def optimize_charge_plan(
+    prices: Sequence[float],
+    start_soc: float,
+    soc_per_slot: float,
+    targets: Sequence[SocTarget] = (),
+    floor_soc: float = 0.0,
+    allowed: Sequence[bool] | None = None,
+    max_soc: float = 100.0,
+    drain_per_slot: float = 0.0,
+    solar: Sequence[float] | None = None,
+) -> ChargePlan:
+    """Return the cheapest charge plan that meets all SOC targets.
+
+    Targets that cannot be reached with the allowed slots before them are
+    met as closely as possible. The SOC is kept at ``floor_soc`` at every
+    slot boundary; below it the battery charges in every allowed slot until
+    the floor is reached. Slots beyond the highest target are only charged
+    when their price is negative.
+
+    Args:
+        prices: Time-ordered slot prices, the first slot starts now
+        start_soc: Current state of charge (%)
+        soc_per_slot: SOC (%) added by charging for one slot
+        targets: Minimum SOC per slot boundary
+        floor_soc: SOC (%) to restore as early as possible
+        allowed: Per-slot flag whether charging is allowed, all if None
+        max_soc: Upper SOC bound (%)
+        drain_per_slot: SOC (%) the household drains in a slot without charging
+        solar: Per-slot SOC (%) added by solar, none if None
+
+    Returns:
+        The plan, with segment costs as summed slot prices
+    """
+    horizon = len(prices)
+    if allowed is None:
+        allowed = (True,) * horizon
+    if horizon == 0 or soc_per_slot <= 0:
+        return ChargePlan((), 0.0, start_soc)
+
+    # SOC at each slot boundary without charging; a charged slot also saves its drain
+    gain = soc_per_slot + drain_per_slot
+    idle = [start_soc] * (horizon + 1)
+    # Number of allowed slots before each slot boundary caps every requirement
+    reachable = [0] * (horizon + 1)
+    for slot in range(horizon):
+        idle[slot + 1] = idle[slot] - drain_per_slot + (solar[slot] if solar else 0.0)
+        reachable[slot + 1] = reachable[slot] + bool(allowed[slot])
+
+    required = [0] * (horizon + 1)
+    for target in targets:
+        if 0 < target.slot <= horizon:
+            needed = _required_slots(min(target.soc, max_soc), idle[target.slot], gain)
+            required[target.slot] = max(required[target.slot], min(needed, reachable[target.slot]))
+
+    for boundary in range(1, horizon + 1):
+        floor_slots = _required_slots(floor_soc, idle[boundary], gain)
+        required[boundary] = max(required[boundary], min(floor_slots, reachable[boundary]))
+
+    states = max(required)
+    if any(price < 0 for price, ok in zip(prices, allowed, strict=True) if ok):
+        states = max(states, _required_slots(max_soc, min(idle), gain))
+    states = max(0, min(states, reachable[horizon]))
+
+    # cost[k] is the cheapest way to have charged k slots so far
+    cost = [0.0] + [_INF] * states
+    charged: list[bytearray] = []
+    for slot in range(horizon):
+        step = bytearray(states + 1)
+        if allowed[slot]:
+            price = prices[slot]
+            new_cost = cost[:]
+            for count in range(states, 0, -1):
+                candidate = cost[count - 1] + price
+                if candidate < new_cost[count]:
+                    new_cost[count] = candidate
+                    step[count] = 1
+            cost = new_cost
+        for count in range(min(required[slot + 1], states + 1)):
+            cost[count] = _INF
+        charged.append(step)
+
+    best = min(range(states + 1), key=cost.__getitem__)
+    if cost[best] == _INF:
+        return ChargePlan((), 0.0, start_soc)
+
+    # Walk the decisions back from the cheapest final state
+    plan = bytearray(horizon)
+    count = best
+    for slot in range(horizon - 1, -1, -1):
+        if count and charged[slot][count]:
+            plan[slot] = 1
+            count -= 1
+
+    segments: list[ChargingWindow] = []
+    slot = 0
+    while slot < horizon:
+        if not plan[slot]:
+            slot += 1
+            continue
+        start = slot
+        while slot < horizon and plan[slot]:
+            slot += 1
+        segments.append(ChargingWindow(start, slot - start, sum(prices[start:slot])))
+
+    end_soc = min(max_soc, max(0.0, idle[horizon] + best * gain))
+    return ChargePlan(tuple(segments), cost[best], round(end_soc, 1))
@@ -0,0 +1,87 @@
+"""On-demand profiling for Charge Cheapest integration.
+
+A profiling session collects one cProfile over the next coordinator
+refreshes and the trigger callbacks that run in between. The profiler is
+only enabled while a refresh or callback runs; while one of them awaits,
+whatever else the event loop runs in that time is included as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import os
+import pstats
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class ProfileSession:
+    """Profile a number of refreshes and the callbacks around them."""
+
+    __slots__ = ("_depth", "_profile", "_stopped", "callbacks", "done", "refreshes", "target")
+
+    def __init__(self, refreshes: int) -> None:
+        """Initialize a session that is done after ``refreshes`` refreshes."""
+        self._profile = cProfile.Profile()
+        self._depth = 0
+        self._stopped = False
+        self.target = refreshes
+        self.refreshes = 0
+        self.callbacks = 0
+        self.done = asyncio.Event()
+
+    @contextmanager
+    def measure(self, refresh: bool = False) -> Iterator[None]:
+        """Profile the enclosed refresh or callback.
+
+        Nested and interleaved measurements share one enabled profiler.
+        """
+        if self._depth == 0 and not self._stopped:
+            self._profile.enable()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and not self._stopped:
+                self._profile.disable()
+            if refresh:
+                self.refreshes += 1
+                if self.refreshes >= self.target:
+                    self.done.set()
+            else:
+                self.callbacks += 1
+
+    def stop(self) -> None:
+        """Stop profiling, also within a refresh or callback that is still running.
+
+        Must run on the event loop, the thread the profiler was enabled in.
+        """
+        if self._depth and not self._stopped:
+            self._profile.disable()
+        self._stopped = True
+
+    def write(self, path: str, limit: int) -> list[dict[str, Any]]:
+        """Write the pstats file and return the ``limit`` top functions by own time.
+
+        Runs in the executor, as dumping and sorting the stats is blocking.
+        The session has to be stopped first.
+        """
+        if not self._stopped:
+            raise RuntimeError("Profile session is still running")
+        self._profile.dump_stats(path)
+        if not self.refreshes and not self.callbacks:
+            return []
+        stats = pstats.Stats(self._profile)
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        return [
+            {
+                "function": f"{os.path.basename(file)}:{line}({name})",
+                "calls": calls,
+                "own_ms": round(own * 1000, 3),
+                "cumulative_ms": round(cumulative * 1000, 3),
+            }
+            for (file, line, name), (_, calls, own, cumulative, _) in ranked[:limit]
+        ]
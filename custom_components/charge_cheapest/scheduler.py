@@ -0,0 +1,135 @@
+"""Charge execution scheduler for Charge Cheapest integration.
+
+The coordinator plans charging segments; the scheduler turns them into
+point-in-time callbacks that switch charging on and off exactly at the slot
+boundaries. A new plan replaces all pending callbacks, and charging is
+started or stopped right away when the current time moved into or out of a
+planned segment.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import EXECUTOR_ACTION_HISTORY
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ChargeScheduler:
+    """Switch charging at the boundaries of planned segments."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        start_charging: Callable[[], Awaitable[None]],
+        stop_charging: Callable[[], Awaitable[None]],
+    ) -> None:
+        """Initialize the scheduler with the coordinator's switch actions."""
+        self.hass = hass
+        self._start_charging = start_charging
+        self._stop_charging = stop_charging
+        self._segments: tuple[tuple[float, float], ...] = ()
+        self._timers: list[CALLBACK_TYPE] = []
+        self._charging = False
+        self._actions: deque[dict[str, Any]] = deque(maxlen=EXECUTOR_ACTION_HISTORY)
+
+    @property
+    def charging(self) -> bool:
+        """Return True while the scheduler holds charging on."""
+        return self._charging
+
+    @property
+    def segments(self) -> tuple[tuple[float, float], ...]:
+        """Return the scheduled segments as start and end epochs."""
+        return self._segments
+
+    def recent_actions(self) -> list[dict[str, Any]]:
+        """Return the last scheduling and switch actions, oldest first."""
+        return list(self._actions)
+
+    @callback
+    def async_schedule(self, segments: Sequence[tuple[float, float]]) -> None:
+        """Replace the plan with segments given as start and end epochs."""
+        now = dt_util.utcnow().timestamp()
+        plan = self._merge(segments, now)
+        if plan == self._segments:
+            return
+
+        self._cancel_timers()
+        self._segments = plan
+        self._record("schedule", segments=len(plan))
+
+        active = any(start <= now < end for start, end in plan)
+        if active and not self._charging:
+            self._async_run(True)
+        elif not active and self._charging:
+            self._async_run(False)
+
+        for start, end in plan:
+            if start > now:
+                self._track(start, True)
+            self._track(end, False)
+
+        _LOGGER.debug("Scheduled %d charging segments", len(plan))
+
+    @callback
+    def async_mark_stopped(self) -> None:
+        """Record that charging was stopped outside of the plan."""
+        self._charging = False
+        self._record("stopped_outside_plan")
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the plan and all pending callbacks without switching."""
+        self._cancel_timers()
+        self._segments = ()
+        self._record("cancel")
+
+    @staticmethod
+    def _merge(segments: Sequence[tuple[float, float]], now: float) -> tuple[tuple[float, float], ...]:
+        """Return future segments in time order with touching segments joined."""
+        merged: list[tuple[float, float]] = []
+        for start, end in sorted(segments):
+            if end <= now:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return tuple(merged)
+
+    def _track(self, timestamp: float, start: bool) -> None:
+        """Register a switch callback at ``timestamp``."""
+
+        @callback
+        def _fire(now: datetime) -> None:
+            self._async_run(start)
+
+        self._timers.append(async_track_point_in_time(self.hass, _fire, dt_util.utc_from_timestamp(timestamp)))
+
+    @callback
+    def _async_run(self, start: bool) -> None:
+        """Switch charging on or off."""
+        self._charging = start
+        self._record("start" if start else "stop")
+        action = self._start_charging if start else self._stop_charging
+        self.hass.async_create_task(action())
+
+    def _record(self, action: str, **details: Any) -> None:
+        """Remember an action with the current time for diagnostics."""
+        self._actions.append({"time": dt_util.utcnow().isoformat(), "action": action, **details})
+
+    def _cancel_timers(self) -> None:
+        """Cancel all pending switch callbacks."""
+        for cancel in self._timers:
+            cancel()
+        self._timers.clear()
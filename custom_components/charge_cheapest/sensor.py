@@ -11,24 +11,33 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfEnergy
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfEnergy, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
     ATTR_CALCULATION_TIMESTAMP,
+    ATTR_CHARGE_PLAN,
     ATTR_CHARGING_DURATION,
+    ATTR_CHARGING_SEGMENTS,
     ATTR_CURRENT_SOC,
+    ATTR_DAY_WINDOW,
+    ATTR_DURATION_COSTS,
     ATTR_ESTIMATED_COST,
     ATTR_NEXT_WINDOW_END,
     ATTR_NEXT_WINDOW_START,
     ATTR_OPTIMAL_SOC_TARGET,
+    ATTR_PEAK_FORECAST,
+    ATTR_REFRESH_DURATION,
+    ATTR_STAGE_CACHE_HIT_RATE,
+    ATTR_STAGE_CACHE_STATS,
+    ATTR_STAGE_TIMINGS,
     ATTR_TARGET_SOC,
     ATTR_TOMORROW_PRICES_AVAILABLE,
     DOMAIN,
 )
 from .coordinator import TibberCheapestChargingCoordinator
+from .entity import TibberCheapestChargingEntity
 
 
 @dataclass(frozen=True)
@@ -37,6 +46,8 @@ class TibberCheapestChargingSensorEntityDescription(SensorEntityDescription):
 
     value_fn: str | None = None
     attr_fn: dict[str, str] | None = None
+    # Smallest change of a numeric state that is written, None for any change
+    state_tolerance: float | None = None
 
 
 SENSOR_DESCRIPTIONS: tuple[TibberCheapestChargingSensorEntityDescription, ...] = (
@@ -103,6 +114,26 @@ SENSOR_DESCRIPTIONS: tuple[TibberCheapestChargingSensorEntityDescription, ...] =
         native_unit_of_measurement=PERCENTAGE,
         value_fn=ATTR_TARGET_SOC,
     ),
+    TibberCheapestChargingSensorEntityDescription(
+        key="stage_cache",
+        translation_key="stage_cache",
+        name="Calculation Cache Hit Rate",
+        icon="mdi:cached",
+        native_unit_of_measurement=PERCENTAGE,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=ATTR_STAGE_CACHE_HIT_RATE,
+        state_tolerance=5,
+    ),
+    TibberCheapestChargingSensorEntityDescription(
+        key="refresh_duration",
+        translation_key="refresh_duration",
+        name="Refresh Duration",
+        icon="mdi:timer-cog-outline",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=ATTR_REFRESH_DURATION,
+        state_tolerance=10,
+    ),
 )
 
 
@@ -124,13 +155,35 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class TibberCheapestChargingSensor(
-    CoordinatorEntity[TibberCheapestChargingCoordinator], SensorEntity
-):
+class TibberCheapestChargingSensor(TibberCheapestChargingEntity, SensorEntity):
     """Representation of a Charge Cheapest sensor."""
 
     entity_description: TibberCheapestChargingSensorEntityDescription
 
+    # Change on every refresh, written along with the next real change
+    _volatile_attributes = frozenset(
+        {
+            ATTR_CALCULATION_TIMESTAMP,
+            ATTR_STAGE_CACHE_STATS,
+            ATTR_STAGE_TIMINGS,
+            f"{ATTR_CHARGE_PLAN}.planned_at",
+            f"{ATTR_PEAK_FORECAST}.projected_soc",
+            f"{ATTR_PEAK_FORECAST}.drain_rate",
+            f"{ATTR_PEAK_FORECAST}.shortfall",
+        }
+    )
+
+    # Large tables that only change with new prices are kept out of the recorder as well
+    _unrecorded_attributes = frozenset(
+        {
+            ATTR_CALCULATION_TIMESTAMP,
+            ATTR_STAGE_CACHE_STATS,
+            ATTR_STAGE_TIMINGS,
+            ATTR_CHARGE_PLAN,
+            ATTR_DURATION_COSTS,
+        }
+    )
+
     def __init__(
         self,
         coordinator: TibberCheapestChargingCoordinator,
@@ -167,6 +220,16 @@ class TibberCheapestChargingSensor(
 
         return None
 
+    def _state_changed(self, written: Any, state: Any) -> bool:
+        """Return True if the state moved at least the description's tolerance."""
+        tolerance = self.entity_description.state_tolerance
+        if tolerance is None or written is None or state is None:
+            return state != written
+        try:
+            return abs(float(state) - float(written)) >= tolerance
+        except (TypeError, ValueError):
+            return state != written
+
     def _format_next_window(self) -> str:
         """Format the next charging window as a time range."""
         if self.coordinator.data is None:
@@ -207,12 +270,23 @@ class TibberCheapestChargingSensor(
             attrs[ATTR_NEXT_WINDOW_END] = self.coordinator.data.get(ATTR_NEXT_WINDOW_END)
             attrs[ATTR_ESTIMATED_COST] = self.coordinator.data.get(ATTR_ESTIMATED_COST)
             attrs[ATTR_CHARGING_DURATION] = self.coordinator.data.get(ATTR_CHARGING_DURATION)
+            attrs[ATTR_CHARGING_SEGMENTS] = self.coordinator.data.get(ATTR_CHARGING_SEGMENTS)
+            attrs[ATTR_CHARGE_PLAN] = self.coordinator.data.get(ATTR_CHARGE_PLAN)
+            attrs[ATTR_DURATION_COSTS] = self.coordinator.data.get(ATTR_DURATION_COSTS)
+            attrs[ATTR_DAY_WINDOW] = self.coordinator.data.get(ATTR_DAY_WINDOW)
+            attrs[ATTR_PEAK_FORECAST] = self.coordinator.data.get(ATTR_PEAK_FORECAST)
             attrs["failure_mode"] = self.coordinator.data.get("failure_mode")
 
         elif self.entity_description.key == "recommended_soc":
             attrs[ATTR_OPTIMAL_SOC_TARGET] = self.coordinator.data.get(ATTR_OPTIMAL_SOC_TARGET)
             attrs[ATTR_CALCULATION_TIMESTAMP] = self.coordinator.data.get(ATTR_CALCULATION_TIMESTAMP)
 
+        elif self.entity_description.key == "stage_cache":
+            attrs[ATTR_STAGE_CACHE_STATS] = self.coordinator.data.get(ATTR_STAGE_CACHE_STATS)
+
+        elif self.entity_description.key == "refresh_duration":
+            attrs[ATTR_STAGE_TIMINGS] = self.coordinator.data.get(ATTR_STAGE_TIMINGS)
+
         elif self.entity_description.key == "current_price":
             attrs[ATTR_TOMORROW_PRICES_AVAILABLE] = self.coordinator.data.get(
                 ATTR_TOMORROW_PRICES_AVAILABLE
@@ -0,0 +1,78 @@
+"""Fingerprinted stage cache for Charge Cheapest integration.
+
+Each coordinator refresh runs a fixed pipeline of stages. A stage's output
+only depends on a handful of inputs, so the coordinator passes a hashable
+fingerprint of those inputs and reuses the previous output while the
+fingerprint is unchanged.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class StageCache:
+    """Remember the last output of each stage together with its input fingerprint."""
+
+    __slots__ = ("_entries", "_hits", "_misses")
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: dict[str, tuple[Hashable, Any]] = {}
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+
+    def lookup(self, stage: str, fingerprint: Hashable) -> tuple[bool, Any]:
+        """Return ``(True, output)`` if ``stage`` already ran with ``fingerprint``."""
+        entry = self._entries.get(stage)
+        if entry is not None and entry[0] == fingerprint:
+            self._hits[stage] = self._hits.get(stage, 0) + 1
+            return True, entry[1]
+        self._misses[stage] = self._misses.get(stage, 0) + 1
+        return False, None
+
+    def store(self, stage: str, fingerprint: Hashable, output: Any) -> None:
+        """Remember ``output`` as the result of ``stage`` for ``fingerprint``."""
+        self._entries[stage] = (fingerprint, output)
+
+    def get_or_compute(self, stage: str, fingerprint: Hashable, compute: Callable[[], _T]) -> _T:
+        """Return the cached output of ``stage`` or compute and store it."""
+        hit, output = self.lookup(stage, fingerprint)
+        if hit:
+            return output
+        output = compute()
+        self.store(stage, fingerprint, output)
+        return output
+
+    def clear(self) -> None:
+        """Drop all cached outputs, keeping the hit and miss counters."""
+        self._entries.clear()
+
+    def fingerprints(self) -> dict[str, Hashable]:
+        """Return the last input fingerprint of every stage."""
+        return {stage: entry[0] for stage, entry in self._entries.items()}
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return hit and miss counts and the hit rate (%) per stage."""
+        stats = {}
+        for stage in sorted(self._hits.keys() | self._misses.keys()):
+            hits = self._hits.get(stage, 0)
+            misses = self._misses.get(stage, 0)
+            stats[stage] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(100 * hits / (hits + misses), 1),
+            }
+        return stats
+
+    @property
+    def hit_rate(self) -> float | None:
+        """Return the overall hit rate (%) across all stages."""
+        hits = sum(self._hits.values())
+        total = hits + sum(self._misses.values())
+        if not total:
+            return None
+        return round(100 * hits / total, 1)
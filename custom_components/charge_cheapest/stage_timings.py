@@ -0,0 +1,88 @@
+"""Per-stage refresh timings for Charge Cheapest integration.
+
+The coordinator refresh runs on the event loop, so every stage adds to the
+time the loop is blocked. The coordinator laps a monotonic timer after each
+stage and this keeps the durations of the last refreshes in a ring buffer
+per stage, summarized as percentiles for the diagnostic sensor. Every
+refresh publishes the summary, so each buffer is also kept sorted instead
+of being sorted per summary.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from collections import deque
+
+STAGE_TOTAL = "total"
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Return the nearest-rank percentile of ascending samples."""
+    rank = (percent / 100 * len(ordered)).__ceil__()
+    return ordered[max(rank, 1) - 1]
+
+
+class StageTimings:
+    """Remember the last durations of each refresh stage."""
+
+    __slots__ = ("_last", "_samples", "_size", "_sorted", "_started", "_lapped")
+
+    def __init__(self, size: int) -> None:
+        """Initialize empty ring buffers holding ``size`` refreshes each."""
+        self._size = size
+        self._samples: dict[str, deque[float]] = {}
+        self._sorted: dict[str, list[float]] = {}
+        self._last: dict[str, float] = {}
+        self._started = 0.0
+        self._lapped = 0.0
+
+    def start(self) -> None:
+        """Start timing a refresh."""
+        self._last = {}
+        self._started = self._lapped = time.monotonic()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap as the duration of ``stage``."""
+        now = time.monotonic()
+        self.record(stage, now - self._lapped)
+        self._lapped = now
+
+    def finish(self) -> float:
+        """Record and return the duration of the whole refresh in seconds."""
+        total = time.monotonic() - self._started
+        self.record(STAGE_TOTAL, total)
+        return total
+
+    def record(self, stage: str, seconds: float) -> None:
+        """Add one duration of ``stage``, dropping the oldest beyond the buffer size."""
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = deque(maxlen=self._size)
+            self._sorted[stage] = []
+        ordered = self._sorted[stage]
+        if len(samples) == self._size:
+            del ordered[bisect_left(ordered, samples[0])]
+        samples.append(seconds)
+        insort(ordered, seconds)
+        self._last[stage] = seconds
+
+    def last(self) -> dict[str, float]:
+        """Return the stage durations (ms) of the latest refresh."""
+        return {stage: round(seconds * 1000, 2) for stage, seconds in self._last.items()}
+
+    def recent(self, stage: str = STAGE_TOTAL) -> list[float]:
+        """Return the buffered durations (ms) of ``stage``, oldest first."""
+        return [round(seconds * 1000, 2) for seconds in self._samples.get(stage, ())]
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return p50, p95 and max (ms) with the sample count per stage."""
+        stats = {}
+        for stage, ordered in self._sorted.items():
+            stats[stage] = {
+                "p50": round(_percentile(ordered, 50) * 1000, 2),
+                "p95": round(_percentile(ordered, 95) * 1000, 2),
+                "max": round(ordered[-1] * 1000, 2),
+                "samples": len(ordered),
+            }
+        return stats
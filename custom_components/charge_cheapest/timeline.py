@@ -0,0 +1,209 @@
+"""Compact price timeline for Charge Cheapest integration.
+
+Tibber publishes ``today``/``tomorrow`` price lists as dicts, either hourly or
+quarter-hourly. The timeline turns them into a start epoch, a slot resolution
+and a flat ``array('d')`` of prices, so the optimizer can index slots by
+arithmetic instead of creating datetime objects per slot.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+from statistics import fmean, median
+from typing import Any
+
+# Keys used by the Tibber sensor attributes and the Tibber price service
+PRICE_KEYS = ("total", "price")
+START_KEYS = ("startsAt", "start_time")
+
+HOURLY_RESOLUTION = 3600
+QUARTER_HOURLY_RESOLUTION = 900
+
+# Hourly lists have at most 25 entries, even on DST change days
+MAX_HOURLY_ENTRIES = 25
+
+
+def entry_price(entry: Any) -> float:
+    """Return the price of a single price entry."""
+    if isinstance(entry, dict):
+        for key in PRICE_KEYS:
+            value = entry.get(key)
+            if value is not None:
+                return float(value)
+        return 0.0
+    return float(entry)
+
+
+def entry_start(entry: Any) -> float | None:
+    """Return the start of a price entry as epoch seconds, if present."""
+    if not isinstance(entry, dict):
+        return None
+    for key in START_KEYS:
+        value = entry.get(key)
+        if value is None:
+            continue
+        if isinstance(value, datetime):
+            return value.timestamp()
+        return datetime.fromisoformat(str(value)).timestamp()
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class PriceTimeline:
+    """Time-ordered prices at a fixed slot resolution."""
+
+    start: float
+    resolution: int
+    prices: array
+    today_slots: int
+
+    def __len__(self) -> int:
+        """Return the number of slots in the timeline."""
+        return len(self.prices)
+
+    @property
+    def end(self) -> float:
+        """Return the epoch at which the last slot ends."""
+        return self.start + len(self.prices) * self.resolution
+
+    @property
+    def today_prices(self) -> array:
+        """Return the prices belonging to today."""
+        return self.prices[: self.today_slots]
+
+    def index_at(self, timestamp: float) -> int:
+        """Return the slot index containing ``timestamp``, clamped to the timeline."""
+        index = int((timestamp - self.start) // self.resolution)
+        return min(max(index, 0), len(self.prices))
+
+    def slot_start(self, index: int) -> float:
+        """Return the start epoch of slot ``index``."""
+        return self.start + index * self.resolution
+
+    def resample(self, resolution: int) -> PriceTimeline:
+        """Return the timeline split into slots of ``resolution`` seconds.
+
+        Only refinement is supported: each coarse slot is repeated so that the
+        price per slot, and therefore averages and extremes, stay unchanged.
+        """
+        if resolution == self.resolution:
+            return self
+        if resolution > self.resolution or self.resolution % resolution:
+            raise ValueError(f"Cannot resample {self.resolution}s slots to {resolution}s slots")
+
+        factor = self.resolution // resolution
+        prices = array("d")
+        for price in self.prices:
+            prices.extend((price,) * factor)
+        return PriceTimeline(self.start, resolution, prices, self.today_slots * factor)
+
+    @classmethod
+    def from_attributes(
+        cls,
+        today: Sequence[Any],
+        tomorrow: Sequence[Any] | None,
+        day_start: float,
+    ) -> PriceTimeline | None:
+        """Build a timeline from Tibber ``today``/``tomorrow`` attributes.
+
+        Args:
+            today: Today's price entries
+            tomorrow: Tomorrow's price entries, if already published
+            day_start: Epoch of local midnight, used when entries carry no start time
+
+        Returns:
+            The timeline, or None when there are no prices for today
+        """
+        if not today:
+            return None
+
+        entries = list(today) + list(tomorrow or [])
+        prices = array("d", (entry_price(entry) for entry in entries))
+
+        start = entry_start(entries[0])
+        second = entry_start(entries[1]) if len(entries) > 1 else None
+        if start is not None and second is not None and second > start:
+            resolution = int(round(second - start))
+        elif len(today) <= MAX_HOURLY_ENTRIES:
+            resolution = HOURLY_RESOLUTION
+        else:
+            resolution = QUARTER_HOURLY_RESOLUTION
+
+        if start is None:
+            start = day_start
+
+        return cls(start, resolution, prices, len(today))
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedPrices:
+    """Price sensor state parsed once per sensor update.
+
+    Statistics cover today's slots only and are None when there are no
+    prices for today.
+    """
+
+    revision: int
+    current_price: float | None
+    tomorrow_available: bool
+    timeline: PriceTimeline | None
+    min_price: float | None
+    max_price: float | None
+    mean_price: float | None
+    median_price: float | None
+
+    @classmethod
+    def from_state(
+        cls,
+        revision: int,
+        state_value: Any,
+        attributes: Mapping[str, Any],
+        day_start: float,
+        resolution: int,
+    ) -> ParsedPrices:
+        """Parse a price sensor state into a timeline and its statistics.
+
+        Args:
+            revision: Revision number identifying this parse
+            state_value: The sensor state, i.e. the current price
+            attributes: The sensor attributes with ``today``/``tomorrow`` lists
+            day_start: Epoch of local midnight
+            resolution: Slot resolution of the resulting timeline in seconds
+        """
+        current_price = _state_price(state_value)
+        tomorrow = attributes.get("tomorrow", [])
+        timeline = PriceTimeline.from_attributes(attributes.get("today", []), tomorrow, day_start)
+        if timeline is None:
+            return cls(revision, current_price, bool(tomorrow), None, None, None, None, None)
+
+        timeline = timeline.resample(resolution)
+        today_prices = timeline.today_prices
+        return cls(
+            revision,
+            current_price,
+            bool(tomorrow),
+            timeline,
+            min(today_prices),
+            max(today_prices),
+            fmean(today_prices),
+            median(today_prices),
+        )
+
+    def with_current_price(self, state_value: Any) -> ParsedPrices:
+        """Return this parse with the current price of a newer state.
+
+        The sensor state changes every slot while its price lists stay the
+        same, so the timeline, its statistics and the revision are kept.
+        """
+        return replace(self, current_price=_state_price(state_value))
+
+
+def _state_price(state_value: Any) -> float | None:
+    """Return the sensor state as price, None if it is not a number."""
+    try:
+        return float(state_value)
+    except (ValueError, TypeError):
+        return None
@@ -0,0 +1,244 @@
+"""Cheapest charging window search for Charge Cheapest integration.
+
+The engine keeps prices in time order and builds a prefix-sum array once, so
+the cost of any contiguous block is a single subtraction. Finding the cheapest
+block of a given length is O(n), and several durations can be answered in the
+same pass over the start positions.
+
+Besides one contiguous block, the engine can pick the cheapest individual
+slots and group them into a limited number of runs with a minimum length, so
+the charger is not toggled every quarter hour.
+"""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class ChargingWindow:
+    """A contiguous block of price slots."""
+
+    start_index: int
+    slots: int
+    cost: float
+
+    @property
+    def end_index(self) -> int:
+        """Return the index one past the last slot of the window."""
+        return self.start_index + self.slots
+
+
+class WindowEngine:
+    """Find the cheapest contiguous window in a time-ordered price series."""
+
+    __slots__ = ("_prefix",)
+
+    def __init__(self, prices: Iterable[float]) -> None:
+        """Initialize the engine and build the prefix-sum array."""
+        prefix = array("d", [0.0])
+        running = 0.0
+        for price in prices:
+            running += price
+            prefix.append(running)
+        self._prefix = prefix
+
+    def __len__(self) -> int:
+        """Return the number of price slots."""
+        return len(self._prefix) - 1
+
+    def block_cost(self, start: int, slots: int) -> float:
+        """Return the summed price of ``slots`` slots starting at ``start``."""
+        return self._prefix[start + slots] - self._prefix[start]
+
+    def cheapest(self, slots: int, first: int = 0, last: int | None = None) -> ChargingWindow | None:
+        """Return the cheapest window of ``slots`` slots within [first, last).
+
+        Windows longer than the search range are shortened to the full range.
+        Ties are resolved in favour of the earliest window.
+        """
+        return self.cheapest_many((slots,), first, last).get(slots)
+
+    def cheapest_many(self, durations: Sequence[int], first: int = 0, last: int | None = None) -> dict[int, ChargingWindow]:
+        """Return the cheapest window for every requested duration in one pass.
+
+        Args:
+            durations: Window lengths in slots
+            first: First slot index of the search range
+            last: Index one past the last slot of the search range
+
+        Returns:
+            Mapping of requested duration to its cheapest window
+        """
+        prefix = self._prefix
+        first = max(first, 0)
+        last = len(self) if last is None else min(last, len(self))
+        span = last - first
+        if span <= 0:
+            return {}
+
+        lengths = sorted({min(slots, span) for slots in durations if slots > 0})
+        best_cost = dict.fromkeys(lengths, float("inf"))
+        best_start = dict.fromkeys(lengths, first)
+
+        for start in range(first, last):
+            base = prefix[start]
+            for length in lengths:
+                end = start + length
+                if end > last:
+                    break
+                cost = prefix[end] - base
+                if cost < best_cost[length]:
+                    best_cost[length] = cost
+                    best_start[length] = start
+
+        result: dict[int, ChargingWindow] = {}
+        for slots in durations:
+            if slots <= 0:
+                continue
+            length = min(slots, span)
+            result[slots] = ChargingWindow(best_start[length], length, best_cost[length])
+        return result
+
+    def cheapest_segments(
+        self,
+        slots: int,
+        first: int = 0,
+        last: int | None = None,
+        min_run: int = 1,
+        max_runs: int | None = None,
+    ) -> list[ChargingWindow]:
+        """Return the cheapest set of ``slots`` slots as time-ordered segments.
+
+        The cheapest slots are selected with a partial sort and grouped into
+        runs. Runs shorter than ``min_run`` grow into their cheaper neighbour
+        slots, and runs are merged across their cheapest gaps until at most
+        ``max_runs`` remain. Surplus slots are then given back from the most
+        expensive runs or run ends. The single cheapest contiguous block is
+        returned instead whenever it is not more expensive.
+
+        Args:
+            slots: Number of slots to charge
+            first: First slot index of the search range
+            last: Index one past the last slot of the search range
+            min_run: Minimum number of consecutive slots per segment
+            max_runs: Maximum number of segments, unlimited if None
+
+        Returns:
+            Segments in time order, empty if the range is empty
+        """
+        contiguous = self.cheapest(slots, first, last)
+        if contiguous is None:
+            return []
+
+        slots = contiguous.slots
+        min_run = max(1, min(min_run, slots))
+        if max_runs == 1 or min_run == slots:
+            return [contiguous]
+
+        first = max(first, 0)
+        last = len(self) if last is None else min(last, len(self))
+        candidates = ((self.block_cost(index, 1), index) for index in range(first, last))
+        chosen = sorted(index for _, index in heapq.nsmallest(slots, candidates))
+
+        runs: list[list[int]] = []
+        for index in chosen:
+            if runs and runs[-1][1] == index:
+                runs[-1][1] = index + 1
+            else:
+                runs.append([index, index + 1])
+
+        # Grow runs shorter than min_run into their cheaper neighbour slot
+        for run in runs:
+            while run[1] - run[0] < min_run:
+                left = self.block_cost(run[0] - 1, 1) if run[0] > first else float("inf")
+                right = self.block_cost(run[1], 1) if run[1] < last else float("inf")
+                if left <= right:
+                    run[0] -= 1
+                else:
+                    run[1] += 1
+        runs = self._merge_overlapping(runs)
+
+        # Merge runs across their cheapest gaps until few enough remain
+        while max_runs is not None and len(runs) > max_runs:
+            merge = min(
+                range(len(runs) - 1),
+                key=lambda i: self.block_cost(runs[i][1], runs[i + 1][0] - runs[i][1]),
+            )
+            runs[merge][1] = runs[merge + 1][1]
+            del runs[merge + 1]
+
+        # Give back surplus slots, dropping whole runs or trimming run ends,
+        # whichever saves the most per slot
+        excess = sum(end - start for start, end in runs) - slots
+        while excess > 0:
+            best_saving = float("-inf")
+            best_action = None
+            for run in runs:
+                length = run[1] - run[0]
+                if length <= excess and len(runs) > 1:
+                    saving = self.block_cost(run[0], length) / length
+                    if saving > best_saving:
+                        best_saving, best_action = saving, (run, None)
+                if length > min_run:
+                    for side, index in ((0, run[0]), (1, run[1] - 1)):
+                        saving = self.block_cost(index, 1)
+                        if saving > best_saving:
+                            best_saving, best_action = saving, (run, side)
+            if best_action is None:
+                runs = self._drop_and_refill(runs, excess, first, last)
+                break
+            run, side = best_action
+            if side is None:
+                excess -= run[1] - run[0]
+                runs.remove(run)
+            else:
+                run[side] += 1 if side == 0 else -1
+                excess -= 1
+
+        segments = [ChargingWindow(start, end - start, self.block_cost(start, end - start)) for start, end in runs]
+        if sum(segment.cost for segment in segments) >= contiguous.cost:
+            return [contiguous]
+        return segments
+
+    def _drop_and_refill(self, runs: list[list[int]], excess: int, first: int, last: int) -> list[list[int]]:
+        """Drop the most expensive run and refill the shortfall at run ends.
+
+        Used when no run can give back its surplus without falling below the
+        minimum run length. Growing runs keeps them at or above that length.
+        """
+        if len(runs) < 2:
+            return runs
+
+        drop = max(runs, key=lambda run: self.block_cost(run[0], run[1] - run[0]) / (run[1] - run[0]))
+        deficit = (drop[1] - drop[0]) - excess
+        refilled = [list(run) for run in runs if run is not drop]
+        while deficit > 0:
+            best_price = float("inf")
+            best_grow = None
+            for run in refilled:
+                if run[0] > first and self.block_cost(run[0] - 1, 1) < best_price:
+                    best_price, best_grow = self.block_cost(run[0] - 1, 1), (run, 0)
+                if run[1] < last and self.block_cost(run[1], 1) < best_price:
+                    best_price, best_grow = self.block_cost(run[1], 1), (run, 1)
+            if best_grow is None:
+                return runs
+            run, side = best_grow
+            run[side] += -1 if side == 0 else 1
+            deficit -= 1
+            refilled = self._merge_overlapping(refilled)
+        return refilled
+
+    @staticmethod
+    def _merge_overlapping(runs: list[list[int]]) -> list[list[int]]:
+        """Merge time-ordered runs that touch or overlap."""
+        merged: list[list[int]] = []
+        for run in runs:
+            if merged and run[0] <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], run[1])
+            else:
+                merged.append(run)
+        return merged
@@ -0,0 +1,16 @@
+"""Fixtures for Charge Cheapest benchmarks."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from price_series import PRICE_CASES, price_attributes
+
+
+@pytest.fixture(params=list(PRICE_CASES))
+def price_case(request) -> tuple[float, dict[str, list[dict[str, Any]]]]:
+    """Return the local day start and price attributes of each benchmark case."""
+    day, resolution, today_slots, tomorrow_slots = PRICE_CASES[request.param]
+    day_start = day.timestamp()
+    return day_start, price_attributes(day_start, resolution, today_slots, tomorrow_slots)
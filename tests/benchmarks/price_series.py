@@ -0,0 +1,50 @@
+"""Synthetic price series for Charge Cheapest benchmarks.
+
+Price series are synthetic but deterministic, so stored results of
+different releases measure the same work. Every case is a Tibber style
+``today``/``tomorrow`` attribute pair with ``startsAt`` times.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from datetime import datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+TIME_ZONE = ZoneInfo("Europe/Berlin")
+
+# Case id: (first local day, slot resolution, slots today, slots tomorrow)
+PRICE_CASES: dict[str, tuple[datetime, int, int, int]] = {
+    "24": (datetime(2026, 1, 8, tzinfo=TIME_ZONE), 3600, 24, 0),
+    "96": (datetime(2026, 1, 8, tzinfo=TIME_ZONE), 900, 96, 0),
+    "192": (datetime(2026, 1, 8, tzinfo=TIME_ZONE), 900, 96, 96),
+    "384": (datetime(2026, 1, 8, tzinfo=TIME_ZONE), 900, 96, 288),
+    "dst-23h": (datetime(2026, 3, 29, tzinfo=TIME_ZONE), 900, 92, 96),
+    "dst-25h": (datetime(2026, 10, 25, tzinfo=TIME_ZONE), 900, 100, 96),
+}
+
+
+def price_attributes(day_start: float, resolution: int, today_slots: int, tomorrow_slots: int) -> dict[str, list[dict[str, Any]]]:
+    """Return price attributes with a daily price curve and seeded noise.
+
+    Args:
+        day_start: Epoch of the first slot
+        resolution: Slot length in seconds
+        today_slots: Number of entries in ``today``
+        tomorrow_slots: Number of entries in ``tomorrow``
+    """
+    rng = random.Random(today_slots * 1000 + tomorrow_slots)
+    entries = []
+    for slot in range(today_slots + tomorrow_slots):
+        start = day_start + slot * resolution
+        phase = (start - day_start) % 86400 / 86400
+        price = 0.25 + 0.08 * math.sin(2 * math.pi * (phase - 0.3)) + rng.uniform(-0.03, 0.03)
+        entries.append(
+            {
+                "startsAt": datetime.fromtimestamp(start, TIME_ZONE).isoformat(),
+                "total": round(price, 4),
+            }
+        )
+    return {"today": entries[:today_slots], "tomorrow": entries[today_slots:]}
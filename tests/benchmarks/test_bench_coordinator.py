@@ -0,0 +1,130 @@
+"""Benchmarks for the coordinator refresh and its calculation methods.
+
+These need Home Assistant installed; the states of the configured entities
+are served from a dict and the plan store is replaced by a mock.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from price_series import PRICE_CASES, price_attributes
+
+pytest.importorskip("pytest_benchmark")
+pytest.importorskip("homeassistant")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+from homeassistant.util import dt as dt_util  # noqa: E402
+
+from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator  # noqa: E402
+
+
+def _state(value, attributes=None):
+    """Return a state object with the fields the coordinator reads."""
+    return SimpleNamespace(
+        state=value,
+        attributes=attributes or {},
+        last_updated=dt_util.utcnow(),
+        context=SimpleNamespace(id="benchmark"),
+    )
+
+
+@pytest.fixture(params=list(PRICE_CASES))
+def coordinator(request, mock_hass_config):
+    """Return a coordinator whose price sensor starts at today's local midnight."""
+    _, resolution, today_slots, tomorrow_slots = PRICE_CASES[request.param]
+    day_start = dt_util.start_of_local_day().timestamp()
+    states = {
+        "sensor.tibber_prices": _state("0.25", price_attributes(day_start, resolution, today_slots, tomorrow_slots)),
+        "sensor.battery_soc": _state("45", {"unit_of_measurement": "%"}),
+        "sensor.battery_capacity": _state("10", {"unit_of_measurement": "kWh"}),
+        "input_number.charging_power": _state("3000", {"unit_of_measurement": "W"}),
+        "switch.battery_charging": _state("off"),
+    }
+    hass, entry = mock_hass_config
+    hass.states.get = states.get
+
+    with patch("custom_components.charge_cheapest.coordinator.Store"):
+        yield TibberCheapestChargingCoordinator(hass, entry)
+
+
+@pytest.fixture
+def mock_hass_config():
+    """Return a mock hass and a config entry with all optional entities."""
+    hass = MagicMock()
+    hass.data = {}
+    entry = MagicMock()
+    entry.entry_id = "benchmark"
+    entry.data = {
+        "battery_soc_sensor": "sensor.battery_soc",
+        "battery_charging_switch": "switch.battery_charging",
+        "price_sensor": "sensor.tibber_prices",
+        "battery_capacity_sensor": "sensor.battery_capacity",
+        "battery_charging_power": "input_number.charging_power",
+    }
+    entry.options = {}
+    return hass, entry
+
+
+@pytest.fixture
+def run():
+    """Return a function running a coroutine on a dedicated event loop."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+def _reset(coordinator):
+    """Drop all caches so the next refresh recalculates every stage."""
+    coordinator._stages.clear()
+    coordinator._price_cache = None
+    coordinator._price_cache_key = None
+    coordinator._rolling_plan = None
+
+
+def test_update_data_cold(benchmark, coordinator, run):
+    """Benchmark a refresh after new prices, with every stage recalculated."""
+    result = benchmark.pedantic(
+        lambda: run(coordinator._async_update_data()),
+        setup=lambda: _reset(coordinator),
+        rounds=50,
+    )
+
+    assert result["status"]
+
+
+def test_update_data_warm(benchmark, coordinator, run):
+    """Benchmark a refresh without changed inputs, served from the stage cache."""
+    run(coordinator._async_update_data())
+
+    result = benchmark(lambda: run(coordinator._async_update_data()))
+
+    assert coordinator._stages.hit_rate > 0.5
+    assert result["status"]
+
+
+def test_calculate_cheapest_hours(benchmark, coordinator, run):
+    """Benchmark the night window search for a 2.5 hour charge."""
+    run(coordinator._async_update_data())
+
+    benchmark(lambda: run(coordinator._calculate_cheapest_hours(2.5)))
+
+
+def test_calculate_charging_duration(benchmark, coordinator):
+    """Benchmark the charging duration from the capacity and power sensors."""
+    result = benchmark(coordinator._calculate_charging_duration, 20.0, 60.0)
+
+    assert result > 0
+
+
+def test_calculate_optimal_morning_soc(benchmark, coordinator):
+    """Benchmark the solar forecast SOC target."""
+    result = benchmark(coordinator._calculate_optimal_morning_soc)
+
+    assert 0 <= result <= 100
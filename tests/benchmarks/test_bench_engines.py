@@ -0,0 +1,61 @@
+"""Benchmarks for the pure planning engines behind a coordinator refresh."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+QUARTER_HOUR = 900
+
+# Night target of 60 % from 20 % at 3 kW into 10 kWh
+SOC_PER_SLOT = 7.125
+
+
+@pytest.fixture
+def parsed(component_module, price_case):
+    """Return the parsed prices of a benchmark case."""
+    day_start, attributes = price_case
+    timeline = component_module("timeline")
+    return timeline.ParsedPrices.from_state(1, "0.25", attributes, day_start, QUARTER_HOUR)
+
+
+def test_parse_prices(benchmark, component_module, price_case):
+    """Benchmark parsing the price sensor state into a quarter-hour timeline."""
+    day_start, attributes = price_case
+    timeline = component_module("timeline")
+
+    result = benchmark(timeline.ParsedPrices.from_state, 1, "0.25", attributes, day_start, QUARTER_HOUR)
+
+    assert result.timeline is not None
+
+
+def test_duration_table(benchmark, component_module, parsed):
+    """Benchmark the cheapest window for every duration up to 8 hours."""
+    window = component_module("window")
+    prices = parsed.timeline.prices
+
+    result = benchmark(lambda: window.WindowEngine(prices).cheapest_many(range(1, 33)))
+
+    assert result
+
+
+def test_split_segments(benchmark, component_module, parsed):
+    """Benchmark split charging into at most three runs of 30 minutes."""
+    window = component_module("window")
+    engine = window.WindowEngine(parsed.timeline.prices)
+
+    result = benchmark(engine.cheapest_segments, 16, min_run=2, max_runs=3)
+
+    assert sum(segment.slots for segment in result) >= 16
+
+
+def test_charge_plan(benchmark, component_module, parsed):
+    """Benchmark the SOC charge plan over the whole price horizon."""
+    optimizer = component_module("optimizer")
+    prices = parsed.timeline.prices
+    targets = [optimizer.SocTarget(len(prices) // 2, 60.0), optimizer.SocTarget(len(prices), 50.0)]
+
+    result = benchmark(optimizer.optimize_charge_plan, prices, 20.0, SOC_PER_SLOT, targets, floor_soc=10.0)
+
+    assert result.end_soc >= 50.0
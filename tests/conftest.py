@@ -4,6 +4,9 @@ Shared pytest fixtures for Home Assistant blueprint testing.
 Provides YAML loading with Home Assistant custom tag support (!input).
 """
 
+import importlib
+import sys
+import types
 from pathlib import Path
 
 import pytest
@@ -52,6 +55,26 @@ PROJECT_ROOT = Path(__file__).parent.parent
 BLUEPRINT_PATH = PROJECT_ROOT / "blueprints" / "automation" / "charge_cheapest.yaml"
 PACKAGE_PATH = PROJECT_ROOT / "packages" / "cheapest_battery_charging" / "cheapest_battery_charging.yaml"
 DASHBOARD_PATH = PROJECT_ROOT / "dashboards" / "charge_cheapest.yaml"
+COMPONENT_PATH = PROJECT_ROOT / "custom_components" / "charge_cheapest"
+
+
+def load_component_module(name: str) -> types.ModuleType:
+    """Import a Home Assistant independent module of the integration.
+
+    The package is registered without executing its ``__init__`` so that pure
+    modules (and their relative imports) load without Home Assistant installed.
+    """
+    if "charge_cheapest" not in sys.modules:
+        package = types.ModuleType("charge_cheapest")
+        package.__path__ = [str(COMPONENT_PATH)]
+        sys.modules["charge_cheapest"] = package
+    return importlib.import_module(f"charge_cheapest.{name}")
+
+
+@pytest.fixture
+def component_module():
+    """Return a loader for Home Assistant independent integration modules."""
+    return load_component_module
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,131 @@
+"""Tests for offline backtesting over historical prices."""
+
+from __future__ import annotations
+
+import math
+from datetime import datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+
+SPEC_PRICES = Path(__file__).parent.parent.parent / "agent-os" / "specs" / "2026-01-07-tibber-price-data-integration" / "planning" / "prices.yaml"
+
+TIME_ZONE = ZoneInfo("Europe/Berlin")
+
+
+@pytest.fixture
+def backtest(component_module):
+    """Load the backtest module."""
+    return component_module("backtest")
+
+
+@pytest.fixture
+def config(component_module):
+    """Return the default compiled configuration."""
+    return component_module("compiled_config").CompiledConfig.from_mapping({})
+
+
+def _series(days: int) -> list[dict]:
+    """Return quarter-hour prices with a cheap early morning and an expensive evening."""
+    start = datetime(2026, 1, 1, tzinfo=TIME_ZONE).timestamp()
+    entries = []
+    for slot in range(days * 96):
+        local = datetime.fromtimestamp(start + slot * 900, TIME_ZONE)
+        hour = local.hour + local.minute / 60
+        price = 0.25 + 0.1 * math.sin(2 * math.pi * (hour - 9) / 24) + 0.001 * (slot % 7)
+        entries.append({"start_time": local.isoformat(), "price": round(price, 4)})
+    return entries
+
+
+class TestPriceLoading:
+    """Test loading historical price files."""
+
+    def test_spec_yaml(self, backtest):
+        """Test that the Tibber price service response loads as quarter hours."""
+        timeline = backtest.load_prices_yaml(SPEC_PRICES)
+
+        assert timeline.resolution == 900
+        assert timeline.start == datetime.fromisoformat("2026-01-08T00:15:00+01:00").timestamp()
+        assert timeline.prices[0] == pytest.approx(0.26)
+
+    def test_hourly_csv(self, backtest, tmp_path):
+        """Test that hourly CSV prices are refined to quarter hours."""
+        path = tmp_path / "prices.csv"
+        path.write_text("startsAt,total\n2026-01-08T00:00:00+01:00,0.20\n2026-01-08T01:00:00+01:00,0.30\n")
+
+        timeline = backtest.load_prices_csv(path)
+
+        assert list(timeline.prices) == [0.20] * 4 + [0.30] * 4
+
+    def test_gap_is_rejected(self, backtest):
+        """Test that a missing slot raises instead of shifting later prices."""
+        entries = _series(1)
+        del entries[10]
+
+        with pytest.raises(ValueError, match="not contiguous"):
+            backtest.series_timeline(entries)
+
+
+class TestBacktest:
+    """Test replaying prices through the planning strategies."""
+
+    def test_cheapest_beats_timer(self, backtest, config):
+        """Test that the planned window is cheaper than charging at the night start."""
+        timeline = backtest.series_timeline(_series(14))
+        home = backtest.HomeModel()
+
+        results = backtest.compare_strategies(timeline, config, home, TIME_ZONE)
+
+        configured = results[backtest.STRATEGY_CONFIGURED]
+        timer = results[backtest.STRATEGY_NIGHT_START]
+        assert len(configured.days) == 14
+        assert configured.cost < timer.cost
+        assert configured.cycles == pytest.approx(timer.cycles, rel=0.01)
+        assert configured.target_hit_rate == 1.0
+
+    def test_charging_stops_at_target(self, backtest, config):
+        """Test that charging never lifts SOC beyond the night target."""
+        timeline = backtest.series_timeline(_series(3))
+        home = backtest.HomeModel(initial_soc=55.0, daily_consumption_kwh=0.0)
+
+        result = backtest.run_backtest(timeline, config, home, TIME_ZONE)
+
+        # 5 % of 10 kWh on the first night, nothing after
+        assert sum(day.charged_kwh for day in result.days) == pytest.approx(0.5 / 0.95)
+        assert result.savings == pytest.approx(-result.cost)
+
+    def test_year_of_quarter_hours(self, backtest, config):
+        """Test that a full year replays with one result per day."""
+        timeline = backtest.series_timeline(_series(365))
+
+        result = backtest.run_backtest(timeline, config, backtest.HomeModel(), TIME_ZONE)
+
+        assert len(result.days) == 365
+        assert result.summary()["target_hit_rate"] == 1.0
+        assert result.savings > 0
+
+    def test_charge_plan_strategy(self, backtest, config):
+        """Test that the charge plan strategy replays the optimizer with the window strategies."""
+        timeline = backtest.series_timeline(_series(14))
+
+        results = backtest.compare_strategies(timeline, config, backtest.HomeModel(), TIME_ZONE)
+
+        charge_plan = results[backtest.STRATEGY_CHARGE_PLAN]
+        assert len(charge_plan.days) == 14
+        assert charge_plan.target_hit_rate == 1.0
+        assert charge_plan.cost < results[backtest.STRATEGY_NIGHT_START].cost
+        assert charge_plan.savings > results[backtest.STRATEGY_CONFIGURED].savings
+
+    def test_peak_forecast_charges_before_the_peak(self, backtest, component_module):
+        """Test that a projected evening peak shortfall is charged before the first night is planned."""
+        config = component_module("compiled_config").CompiledConfig.from_mapping({"evening_peak_target_soc": 60})
+        timeline = backtest.series_timeline(_series(2))
+        home = backtest.HomeModel(initial_soc=30.0)
+
+        window = backtest.run_backtest(timeline, config, home, TIME_ZONE)
+        charge_plan = backtest.run_backtest(timeline, config, home, TIME_ZONE, backtest.STRATEGY_CHARGE_PLAN)
+
+        # The first night starts at 23:00, after the first evening peak
+        assert window.days[0].charged_kwh == 0
+        assert charge_plan.days[0].charged_kwh > 0
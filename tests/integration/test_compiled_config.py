@@ -0,0 +1,122 @@
+"""Tests for the compiled configuration snapshot."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+
+@pytest.fixture
+def compiled_config(component_module):
+    """Load the compiled config module."""
+    return component_module("compiled_config")
+
+
+class TestCompiledConfig:
+    """Test compiling config entry data and options."""
+
+    def test_times_are_minute_offsets(self, compiled_config, mock_config_entry):
+        """Test that schedule times are pre-parsed to minutes since midnight."""
+        config = compiled_config.CompiledConfig.from_mapping(mock_config_entry.data)
+
+        assert config.night_start == 23 * 60
+        assert config.night_end == 6 * 60
+        assert config.evening_peak_start == 17 * 60
+        assert config.trigger_time == 22 * 60 + 30
+
+    def test_options_override_data_with_typed_values(self, compiled_config, mock_config_entry):
+        """Test that options win over data and selector floats become typed values."""
+        merged = {
+            **mock_config_entry.data,
+            "night_target_soc": 75.0,
+            "night_start_time": {"hour": 22, "minute": 15},
+            "charging_duration_hours": "2.5",
+        }
+        config = compiled_config.CompiledConfig.from_mapping(merged)
+
+        assert config.night_target_soc == 75
+        assert isinstance(config.night_target_soc, int)
+        assert config.night_start == 22 * 60 + 15
+        assert config.charging_duration_hours == 2.5
+
+    def test_defaults_for_missing_keys(self, compiled_config):
+        """Test that missing keys fall back to the integration defaults."""
+        config = compiled_config.CompiledConfig.from_mapping({})
+
+        assert config.price_sensor is None
+        assert config.default_charge_start == 60
+        assert config.minimum_soc_floor == 20
+        assert config.failure_behavior == "skip_charging"
+        assert config.charge_control == "blueprint"
+
+    def test_snapshot_is_immutable(self, compiled_config):
+        """Test that the compiled config cannot be modified."""
+        config = compiled_config.CompiledConfig.from_mapping({})
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            config.night_target_soc = 10
+
+    def test_format_minutes_wraps_midnight(self, compiled_config):
+        """Test that minute offsets past midnight wrap to the next day."""
+        assert compiled_config.format_minutes(23 * 60 + 4 * 60) == "03:00:00"
+        assert compiled_config.format_minutes(22 * 60 + 30 + 150) == "01:00:00"
+
+    def test_source_entities_lists_configured_entities(self, compiled_config, mock_config_entry):
+        """Test that only configured entities are tracked for state changes."""
+        config = compiled_config.CompiledConfig.from_mapping({**mock_config_entry.data, "battery_capacity_sensor": "sensor.battery_capacity"})
+
+        assert config.event_driven_updates is True
+        assert config.source_entities == (
+            "sensor.tibber_prices",
+            "sensor.battery_soc",
+            "switch.battery_charging",
+            "sensor.battery_capacity",
+        )
+
+    def test_split_charging_defaults(self, compiled_config, mock_config_entry):
+        """Test that split charging is off by default with sane run limits."""
+        config = compiled_config.CompiledConfig.from_mapping(mock_config_entry.data)
+
+        assert config.split_charging_enabled is False
+        assert config.min_charge_run_minutes == 30
+        assert config.max_charge_runs == 3
+
+    def test_split_charging_options(self, compiled_config, mock_config_entry):
+        """Test that split charging options are coerced to typed values."""
+        config = compiled_config.CompiledConfig.from_mapping(
+            {
+                **mock_config_entry.data,
+                "split_charging_enabled": True,
+                "min_charge_run_minutes": 45.0,
+                "max_charge_runs": 2.0,
+            }
+        )
+
+        assert config.split_charging_enabled is True
+        assert config.min_charge_run_minutes == 45
+        assert config.max_charge_runs == 2
+
+    def test_soc_stop_hysteresis(self, compiled_config, mock_config_entry):
+        """Test that the early stop hysteresis defaults and coerces to float."""
+        default = compiled_config.CompiledConfig.from_mapping(mock_config_entry.data)
+        config = compiled_config.CompiledConfig.from_mapping({**mock_config_entry.data, "soc_stop_hysteresis": 5})
+
+        assert default.soc_stop_hysteresis == 2
+        assert config.soc_stop_hysteresis == 5.0
+
+    def test_replan_soc_drift(self, compiled_config, mock_config_entry):
+        """Test that the re-plan drift threshold defaults and coerces to float."""
+        default = compiled_config.CompiledConfig.from_mapping(mock_config_entry.data)
+        config = compiled_config.CompiledConfig.from_mapping({**mock_config_entry.data, "replan_soc_drift": 10})
+
+        assert default.replan_soc_drift == 5
+        assert config.replan_soc_drift == 10.0
+
+    def test_slow_refresh_warning_ms(self, compiled_config, mock_config_entry):
+        """Test that the slow refresh threshold defaults and coerces to float."""
+        default = compiled_config.CompiledConfig.from_mapping(mock_config_entry.data)
+        config = compiled_config.CompiledConfig.from_mapping({**mock_config_entry.data, "slow_refresh_warning_ms": 500})
+
+        assert default.slow_refresh_warning_ms == 250
+        assert config.slow_refresh_warning_ms == 500.0
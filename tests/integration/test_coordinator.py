@@ -274,3 +274,280 @@ class TestCrossMidnightCalculation:
         assert _calculate_end_time("01:00:00", 3.0) == "04:00:00"
         assert _calculate_end_time("23:00:00", 4.0) == "03:00:00"  # Cross midnight
         assert _calculate_end_time("22:30:00", 2.5) == "01:00:00"  # Cross midnight
+
+
+class TestDurationTable:
+    """Test the precomputed window cost table of the coordinator."""
+
+    def test_truncated_windows_are_left_out(self):
+        """Test that durations longer than the known prices are not reported."""
+        pytest.importorskip("homeassistant")
+        from types import SimpleNamespace
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+        from custom_components.charge_cheapest.timeline import PriceTimeline
+        from custom_components.charge_cheapest.window import WindowEngine
+
+        entry = MagicMock()
+        entry.data = {}
+        entry.options = {}
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(MagicMock(), entry)
+
+        # Only four quarter hours of prices are known
+        timeline = PriceTimeline(1767913200.0, 900, [0.3, 0.1, 0.2, 0.4], 4)
+        coordinator._duration_table = WindowEngine(timeline.prices).cheapest_many(range(1, 9))
+        rows = coordinator._format_duration_table(SimpleNamespace(timeline=timeline))
+        coordinator.data = {"duration_costs": rows}
+
+        assert [row["hours"] for row in rows] == [0.25, 0.5, 0.75, 1.0]
+        assert coordinator.get_window_cost(0.5)["cost"] == round(0.3 * 0.25, 4)
+        assert coordinator.get_window_cost(1.5) is None
+
+
+class TestOptimalSocFingerprint:
+    """Test the inputs the cached optimal SOC target depends on."""
+
+    def test_forecast_update_invalidates_target(self):
+        """Test that a new forecast with the same total recalculates the target."""
+        pytest.importorskip("homeassistant")
+        from types import SimpleNamespace
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        entry = MagicMock()
+        entry.data = {"solar_forecast_sensor": "sensor.solar_forecast"}
+        entry.options = {"solar_forecast_enabled": True}
+        hass = MagicMock()
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(hass, entry)
+
+        today = SimpleNamespace(state="12.0", attributes={}, last_updated=datetime(2026, 1, 8, 6))
+        hass.states.get.return_value = today
+        fingerprint = coordinator._optimal_soc_fingerprint(None)
+        assert coordinator._optimal_soc_fingerprint(None) == fingerprint
+
+        hass.states.get.return_value = SimpleNamespace(state="12.0", attributes={}, last_updated=datetime(2026, 1, 9, 6))
+        assert coordinator._optimal_soc_fingerprint(None) != fingerprint
+
+
+class TestPriceCache:
+    """Test the parsed price sensor state shared by the refresh stages."""
+
+    def test_current_price_keeps_revision(self, mock_tibber_state):
+        """Test that a new current price keeps the parse revision until the price lists change."""
+        pytest.importorskip("homeassistant")
+        from types import SimpleNamespace
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        entry = MagicMock()
+        entry.data = {"price_sensor": "sensor.tibber_prices"}
+        entry.options = {}
+        hass = MagicMock()
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(hass, entry)
+
+        def price_state(price, attributes, hour):
+            return SimpleNamespace(state=price, attributes=attributes, last_updated=datetime(2026, 1, 8, hour), context=SimpleNamespace(id=str(hour)))
+
+        attributes = mock_tibber_state.attributes
+        hass.states.get.return_value = price_state("0.25", attributes, 6)
+        first = coordinator._get_parsed_prices("sensor.tibber_prices")
+
+        hass.states.get.return_value = price_state("0.28", dict(attributes), 7)
+        parsed = coordinator._get_parsed_prices("sensor.tibber_prices")
+        assert parsed.current_price == 0.28
+        assert parsed.revision == first.revision
+        assert parsed.timeline is first.timeline
+
+        hass.states.get.return_value = price_state("0.28", {**attributes, "tomorrow": []}, 8)
+        assert coordinator._get_parsed_prices("sensor.tibber_prices").revision == first.revision + 1
+
+
+class TestChargeControl:
+    """Test that the integration only switches the charger when configured to."""
+
+    def _coordinator(self, options):
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        entry = MagicMock()
+        entry.data = {"battery_charging_switch": "switch.battery_charging"}
+        entry.options = options
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            return TibberCheapestChargingCoordinator(MagicMock(), entry)
+
+    def _setup_automations(self, coordinator):
+        import asyncio
+        from unittest.mock import patch
+
+        with patch("custom_components.charge_cheapest.coordinator.async_track_time_change") as track:
+            asyncio.run(coordinator.async_setup_automations())
+        return track
+
+    def test_blueprint_control_sets_up_nothing(self):
+        """Test that by default no trigger or plan listener is registered."""
+        pytest.importorskip("homeassistant")
+        coordinator = self._coordinator({})
+
+        track = self._setup_automations(coordinator)
+
+        track.assert_not_called()
+        assert coordinator._unsubscribe_callbacks == []
+        assert not coordinator._listeners
+
+    def test_window_control_sets_up_triggers(self):
+        """Test that the night and evening peak triggers and the plan listener are registered."""
+        pytest.importorskip("homeassistant")
+        coordinator = self._coordinator({"charge_control": "windows", "day_schedule_enabled": True})
+
+        track = self._setup_automations(coordinator)
+
+        assert track.call_count == 3
+        assert len(coordinator._unsubscribe_callbacks) == 4
+        assert len(coordinator._listeners) == 1
+
+    def test_blueprint_control_ignores_restored_segments(self):
+        """Test that a restored plan with pre-peak segments does not switch."""
+        pytest.importorskip("homeassistant")
+        coordinator = self._coordinator({})
+        coordinator._scheduler = MagicMock()
+        coordinator.data = {"peak_segment_times": [(0.0, 4102444800.0)]}
+
+        coordinator._handle_plan_update()
+
+        coordinator._scheduler.async_schedule.assert_not_called()
+
+    def test_plan_control_follows_the_charge_plan(self):
+        """Test that only the plan listener is set up and the plan periods are scheduled."""
+        pytest.importorskip("homeassistant")
+        coordinator = self._coordinator({"charge_control": "plan"})
+
+        track = self._setup_automations(coordinator)
+
+        track.assert_not_called()
+        assert len(coordinator._listeners) == 1
+
+        coordinator._scheduler = MagicMock()
+        coordinator.data = {"plan_segment_times": [(100.0, 200.0)], "peak_segment_times": [(300.0, 400.0)]}
+        coordinator._handle_plan_update()
+
+        coordinator._scheduler.async_schedule.assert_called_once_with([(100.0, 200.0)])
+
+
+class TestChargePlan:
+    """Test the charge plan the coordinator solves over the known prices."""
+
+    def test_drain_is_planned(self, mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state):
+        """Test that the measured household drain adds charging and is part of the planned trajectory."""
+        pytest.importorskip("homeassistant")
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        mock_config_entry.data = {
+            **mock_config_entry.data,
+            "battery_capacity_sensor": "sensor.battery_capacity",
+            "battery_charging_power": "input_number.charging_power",
+        }
+        states = {
+            "sensor.tibber_prices": mock_tibber_state,
+            "sensor.battery_capacity": mock_battery_capacity_state,
+            "input_number.charging_power": mock_charging_power_state,
+        }
+        mock_hass.states.get = states.get
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(mock_hass, mock_config_entry)
+        parsed = coordinator._get_parsed_prices("sensor.tibber_prices")
+
+        def planned_seconds(drain):
+            coordinator._drain = MagicMock()
+            coordinator._drain.rate.return_value = drain
+            plan, periods = coordinator._calculate_charge_plan(parsed, 45, 60, (1, None, None), "initial")
+            assert plan["drain_rate"] == (drain or 0.0)
+            assert periods == list(coordinator._rolling_plan.periods())
+            rolling = coordinator._rolling_plan
+            assert rolling.drain_per_slot == pytest.approx((drain or 0.0) * rolling.slot_seconds / 3600)
+            return sum(end - start for start, end in periods)
+
+        assert planned_seconds(2.0) > planned_seconds(None) > 0
+
+
+class TestPeakSegments:
+    """Test pre-peak charging toward the evening peak target."""
+
+    def _coordinator(self, mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state):
+        from unittest.mock import patch
+
+        from homeassistant.util import dt as dt_util
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        # Peak six hours from now at flat prices, so the current slot is charged first
+        peak = dt_util.now() + timedelta(hours=6)
+        mock_tibber_state.attributes = {"today": [{"total": 0.2}] * 24, "tomorrow": [{"total": 0.2}] * 24}
+        mock_config_entry.data = {
+            **mock_config_entry.data,
+            "battery_capacity_sensor": "sensor.battery_capacity",
+            "battery_charging_power": "input_number.charging_power",
+        }
+        mock_config_entry.options = {
+            "charge_control": "windows",
+            "evening_peak_start": peak.strftime("%H:%M:00"),
+            "evening_peak_target_soc": 50,
+        }
+        states = {
+            "sensor.tibber_prices": mock_tibber_state,
+            "sensor.battery_capacity": mock_battery_capacity_state,
+            "input_number.charging_power": mock_charging_power_state,
+        }
+        mock_hass.states.get = states.get
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(mock_hass, mock_config_entry)
+        coordinator._drain = MagicMock()
+        coordinator._drain.rate.return_value = 3.0
+        return coordinator
+
+    def test_started_segments_are_held(self, mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state):
+        """Test that a rising SOC does not move pre-peak segments once the first one started."""
+        pytest.importorskip("homeassistant")
+        coordinator = self._coordinator(mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state)
+        parsed = coordinator._get_parsed_prices("sensor.tibber_prices")
+
+        forecast, times = coordinator._calculate_peak_forecast(parsed, 45)
+
+        # 45% drains by 18% until the peak, so 23% is missing
+        assert forecast["shortfall"] == pytest.approx(23, abs=0.1)
+        assert coordinator._peak_hold["stop_soc"] == pytest.approx(68, abs=0.1)
+
+        held, held_times = coordinator._calculate_peak_forecast(parsed, 60)
+
+        assert held_times == times
+        assert held["segments"] == forecast["segments"]
+        assert held["shortfall"] < forecast["shortfall"]
+
+    def test_peak_charging_stops_at_target(self, mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state):
+        """Test that pre-peak charging stops once SOC reaches the peak target with the drain until the peak."""
+        pytest.importorskip("homeassistant")
+        from types import SimpleNamespace
+
+        coordinator = self._coordinator(mock_hass, mock_config_entry, mock_tibber_state, mock_battery_capacity_state, mock_charging_power_state)
+        coordinator._calculate_peak_forecast(coordinator._get_parsed_prices("sensor.tibber_prices"), 45)
+        coordinator._scheduler = MagicMock()
+        coordinator._async_stop_at_target = MagicMock()
+
+        def soc_changed(soc):
+            coordinator._handle_soc_change(SimpleNamespace(data={"new_state": SimpleNamespace(state=soc)}))
+
+        soc_changed("60")
+        coordinator._scheduler.async_mark_stopped.assert_not_called()
+
+        soc_changed("68")
+        coordinator._scheduler.async_mark_stopped.assert_called_once()
+        coordinator._async_stop_at_target.assert_called_once_with(68.0, "Peak", 68.0)
+        assert coordinator._peak_hold is None
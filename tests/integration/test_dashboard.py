@@ -17,54 +17,87 @@ DASHBOARD_URL_PATH = "charge-cheapest"
 DASHBOARD_TITLE = "Charge Cheapest"
 
 
+@pytest.fixture
+def dashboard_template(component_module):
+    """Load the dashboard template module."""
+    return component_module("dashboard_template")
+
+
+@pytest.fixture
+def dashboard_config(dashboard_template):
+    """Generate the dashboard configuration for the default entity ids."""
+    return dashboard_template.build_dashboard_config({})
+
+
+def _entity_references(config) -> set[str]:
+    """Return every entity id referenced by an ``entity`` key."""
+    found: set[str] = set()
+
+    def walk(node) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "entity" and isinstance(value, str):
+                    found.add(value)
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(config)
+    return found
+
+
 class TestDashboardStructure:
     """Test dashboard configuration structure."""
 
-    def test_dashboard_has_three_views(self):
+    def test_dashboard_has_three_views(self, dashboard_config):
         """Test that dashboard has Overview, Statistics, and Configuration views."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
+        titles = [view["title"] for view in dashboard_config["views"]]
 
-        # Read and check the file contains expected views
-        with open(dashboard_path) as f:
-            content = f.read()
+        assert titles == ["Overview", "Statistics", "Configuration"]
 
-        assert '"title": "Overview"' in content
-        assert '"title": "Statistics"' in content
-        assert '"title": "Configuration"' in content
-
-    def test_dashboard_uses_correct_entity_ids(self):
+    def test_dashboard_uses_correct_entity_ids(self, dashboard_config):
         """Test that dashboard references correct entity IDs."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
-
-        with open(dashboard_path) as f:
-            content = f.read()
+        entities = _entity_references(dashboard_config)
 
         # Check for charge_cheapest_ prefixed entities
-        assert "sensor.charge_cheapest_status" in content
-        assert "sensor.charge_cheapest_current_price" in content
-        assert "sensor.charge_cheapest_next_window" in content
-        assert "binary_sensor.charge_cheapest_system_ready" in content
-        assert "binary_sensor.charge_cheapest_is_cheap_hour" in content
+        assert "sensor.charge_cheapest_status" in entities
+        assert "sensor.charge_cheapest_current_price" in entities
+        assert "sensor.charge_cheapest_next_window" in entities
+        assert "binary_sensor.charge_cheapest_system_ready" in entities
+        assert "binary_sensor.charge_cheapest_is_cheap_hour" in entities
 
-    def test_dashboard_has_apexcharts_conditional(self):
+    def test_dashboard_has_apexcharts_conditional(self, dashboard_config):
         """Test that dashboard includes ApexCharts conditional card."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
-
-        with open(dashboard_path) as f:
-            content = f.read()
+        content = json.dumps(dashboard_config)
 
         assert "custom:apexcharts-card" in content
         assert "history-graph" in content  # Fallback
 
+    def test_dashboard_uses_entry_entity_ids(self, dashboard_template):
+        """Test that entity ids of a config entry replace the defaults everywhere."""
+        config = dashboard_template.build_dashboard_config(
+            {
+                "current_price": "sensor.charge_cheapest_current_price_2",
+                "system_ready": "binary_sensor.charge_cheapest_system_ready_2",
+            }
+        )
+        entities = _entity_references(config)
+        content = json.dumps(config)
+
+        assert "sensor.charge_cheapest_current_price" not in entities
+        assert "sensor.charge_cheapest_current_price_2" in entities
+        assert "binary_sensor.charge_cheapest_system_ready" not in entities
+        assert "states('sensor.charge_cheapest_current_price_2')" in content
+        assert "is_state('binary_sensor.charge_cheapest_system_ready_2', 'on')" in content
+
+    def test_markdown_templates_are_rendered(self, dashboard_config):
+        """Test that no entity placeholder is left in markdown content."""
+        content = json.dumps(dashboard_config)
+
+        assert "%(" not in content
+        assert "20-50% compared" in content
+
     def test_dashboard_url_path(self):
         """Test dashboard URL path constant."""
         assert DASHBOARD_URL_PATH == "charge-cheapest"
@@ -102,38 +135,19 @@ class TestDashboardService:
 class TestDashboardCards:
     """Test dashboard card configurations."""
 
-    def test_overview_view_has_status_card(self):
-        """Test that overview view has status entities card."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
-
-        with open(dashboard_path) as f:
-            content = f.read()
+    @staticmethod
+    def _card_titles(config, view_title):
+        view = next(v for v in config["views"] if v["title"] == view_title)
+        return [card.get("title") for card in view["cards"]]
 
-        assert '"title": "Charging Status"' in content
+    def test_overview_view_has_status_card(self, dashboard_config):
+        """Test that overview view has status entities card."""
+        assert "Charging Status" in self._card_titles(dashboard_config, "Overview")
 
-    def test_statistics_view_has_savings_card(self):
+    def test_statistics_view_has_savings_card(self, dashboard_config):
         """Test that statistics view has savings summary card."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
-
-        with open(dashboard_path) as f:
-            content = f.read()
-
-        assert '"title": "Savings Summary"' in content
+        assert "Savings Summary" in self._card_titles(dashboard_config, "Statistics")
 
-    def test_configuration_view_has_validation_status(self):
+    def test_configuration_view_has_validation_status(self, dashboard_config):
         """Test that configuration view has validation status card."""
-        dashboard_path = os.path.join(
-            os.path.dirname(__file__),
-            "../../custom_components/charge_cheapest/dashboard.py",
-        )
-
-        with open(dashboard_path) as f:
-            content = f.read()
-
-        assert '"title": "System Status"' in content
+        assert "System Status" in self._card_titles(dashboard_config, "Configuration")
@@ -211,3 +211,149 @@ class TestDeviceInfo:
         assert "name" in device_info
         assert "manufacturer" in device_info
         assert "model" in device_info
+
+
+def _added_sensor(entity):
+    """Return ``entity`` as if added to a platform, counting its state writes."""
+    entity.hass = MagicMock()
+    entity.platform = MagicMock(
+        platform_name="charge_cheapest",
+        platform_translations={},
+        component_translations={},
+        default_language_platform_translations={},
+    )
+    entity.platform.domain = "sensor"
+    entity.async_write_ha_state = MagicMock()
+    return entity
+
+
+class TestChangeOnlyStateWrites:
+    """Test that entities skip state writes without a material change."""
+
+    def test_volatile_attributes_are_not_written(self):
+        """Test that only a changed state or recorded attribute writes the state."""
+        pytest.importorskip("homeassistant")
+        from custom_components.charge_cheapest.sensor import (
+            SENSOR_DESCRIPTIONS,
+            TibberCheapestChargingSensor,
+        )
+
+        coordinator = MagicMock()
+        coordinator.last_update_success = True
+        coordinator.data = {
+            "optimal_soc_target": 60,
+            "calculation_timestamp": "2026-01-08T22:30:00",
+        }
+        description = next(item for item in SENSOR_DESCRIPTIONS if item.key == "recommended_soc")
+        sensor = _added_sensor(TibberCheapestChargingSensor(coordinator, description))
+
+        sensor._handle_coordinator_update()
+        coordinator.data = {**coordinator.data, "calculation_timestamp": "2026-01-08T22:35:00"}
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 1
+
+        coordinator.data = {**coordinator.data, "optimal_soc_target": 70}
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 2
+        assert "calculation_timestamp" in sensor._unrecorded_attributes
+
+    def test_volatile_forecast_and_plan_fields(self):
+        """Test that the projection and plan time inside attributes are not written alone."""
+        pytest.importorskip("homeassistant")
+        from custom_components.charge_cheapest.sensor import (
+            SENSOR_DESCRIPTIONS,
+            TibberCheapestChargingSensor,
+        )
+
+        coordinator = MagicMock()
+        coordinator.last_update_success = True
+        coordinator.data = {
+            "charge_plan": {"segments": [], "planned_at": "2026-01-08T12:00:00+01:00"},
+            "peak_forecast": {"projected_soc": 55.2, "drain_rate": 1.41, "shortfall": 0, "segments": []},
+        }
+        description = next(item for item in SENSOR_DESCRIPTIONS if item.key == "next_window")
+        sensor = _added_sensor(TibberCheapestChargingSensor(coordinator, description))
+
+        sensor._handle_coordinator_update()
+        coordinator.data = {
+            "charge_plan": {"segments": [], "planned_at": "2026-01-08T12:05:00+01:00"},
+            "peak_forecast": {"projected_soc": 54.9, "drain_rate": 1.43, "shortfall": 0, "segments": []},
+        }
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 1
+
+        coordinator.data["peak_forecast"] = {**coordinator.data["peak_forecast"], "segments": [{"start": "16:00"}]}
+        sensor._handle_coordinator_update()
+        assert sensor.async_write_ha_state.call_count == 2
+
+    def test_diagnostic_state_tolerance(self):
+        """Test that the refresh duration is only written after a large enough change."""
+        pytest.importorskip("homeassistant")
+        from custom_components.charge_cheapest.sensor import (
+            SENSOR_DESCRIPTIONS,
+            TibberCheapestChargingSensor,
+        )
+
+        coordinator = MagicMock()
+        coordinator.last_update_success = True
+        description = next(item for item in SENSOR_DESCRIPTIONS if item.key == "refresh_duration")
+        sensor = _added_sensor(TibberCheapestChargingSensor(coordinator, description))
+
+        for duration in (12, 14, 19, 21, 25):
+            coordinator.data = {"refresh_duration": duration}
+            sensor._handle_coordinator_update()
+
+        # 12 is written, 14 and 19 are within 10 ms of it, 25 is within 10 ms of 21
+        assert sensor.async_write_ha_state.call_count == 2
+
+    def test_unchanged_refreshes_write_nothing(self, mock_hass, mock_config_entry, mock_tibber_state, mock_battery_soc_state, mock_battery_capacity_state, mock_charging_power_state, mock_charging_switch_state):
+        """Test that refreshes with unchanged inputs do not write any entity state."""
+        pytest.importorskip("homeassistant")
+        import asyncio
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.binary_sensor import (
+            BINARY_SENSOR_DESCRIPTIONS,
+            TibberCheapestChargingBinarySensor,
+        )
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+        from custom_components.charge_cheapest.sensor import (
+            SENSOR_DESCRIPTIONS,
+            TibberCheapestChargingSensor,
+        )
+
+        mock_config_entry.data = {
+            **mock_config_entry.data,
+            "battery_capacity_sensor": "sensor.battery_capacity",
+            "battery_charging_power": "input_number.charging_power",
+        }
+        states = {
+            "sensor.tibber_prices": mock_tibber_state,
+            "sensor.battery_soc": mock_battery_soc_state,
+            "sensor.battery_capacity": mock_battery_capacity_state,
+            "input_number.charging_power": mock_charging_power_state,
+            "switch.battery_charging": mock_charging_switch_state,
+        }
+        mock_hass.states.get = states.get
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(mock_hass, mock_config_entry)
+
+        entities = [_added_sensor(TibberCheapestChargingSensor(coordinator, item)) for item in SENSOR_DESCRIPTIONS]
+        entities += [_added_sensor(TibberCheapestChargingBinarySensor(coordinator, item)) for item in BINARY_SENSOR_DESCRIPTIONS]
+
+        def refresh():
+            coordinator.data = asyncio.run(coordinator._async_update_data())
+            for entity in entities:
+                entity._handle_coordinator_update()
+
+        # Settle the cumulative cache hit rate and the refresh duration percentiles
+        for _ in range(30):
+            refresh()
+        for entity in entities:
+            entity.async_write_ha_state.reset_mock()
+
+        for _ in range(5):
+            refresh()
+
+        assert coordinator.data["calculation_timestamp"]
+        assert [entity.entity_id for entity in entities if entity.async_write_ha_state.called] == []
@@ -0,0 +1,110 @@
+"""Tests for the evening-peak SOC forecast."""
+
+from __future__ import annotations
+
+import pytest
+
+HOUR = 3600
+
+
+@pytest.fixture
+def forecast(component_module):
+    """Load the forecast module."""
+    return component_module("forecast")
+
+
+def _no_solar(start: float, end: float) -> float:
+    return 0.0
+
+
+class TestSolarShare:
+    """Test the half-sine solar profile."""
+
+    def test_whole_day_is_everything(self, forecast):
+        """Test that sunrise to sunset yields the full daily forecast."""
+        assert forecast.solar_share(0, 24 * HOUR, 6 * HOUR, 20 * HOUR) == pytest.approx(1)
+
+    def test_profile_is_symmetric_around_noon(self, forecast):
+        """Test that both halves of the day yield the same share."""
+        morning = forecast.solar_share(6 * HOUR, 13 * HOUR, 6 * HOUR, 20 * HOUR)
+        afternoon = forecast.solar_share(13 * HOUR, 20 * HOUR, 6 * HOUR, 20 * HOUR)
+
+        assert morning == pytest.approx(0.5)
+        assert afternoon == pytest.approx(0.5)
+
+    def test_night_yields_nothing(self, forecast):
+        """Test that no solar yield is expected outside daylight."""
+        assert forecast.solar_share(20 * HOUR, 30 * HOUR, 6 * HOUR, 20 * HOUR) == 0
+
+
+class TestProjectSoc:
+    """Test the SOC projection to the evening peak."""
+
+    def test_drain_and_solar(self, forecast):
+        """Test that the drain is subtracted and the solar yield added."""
+        projected = forecast.project_soc(60, 0, 4 * HOUR, 5, lambda start, end: 12)
+
+        assert projected == pytest.approx(52)
+
+    def test_clamped_to_battery_range(self, forecast):
+        """Test that the projection stays between empty and full."""
+        assert forecast.project_soc(10, 0, 10 * HOUR, 5, _no_solar) == 0
+        assert forecast.project_soc(90, 0, HOUR, 0, lambda start, end: 30) == 100
+
+
+class TestDrainEstimator:
+    """Test the household drain measurement."""
+
+    def test_rate_from_samples(self, forecast):
+        """Test that the drain is the SOC drop per hour over the window."""
+        estimator = forecast.DrainEstimator(3 * HOUR, HOUR / 2)
+        for minutes, soc in ((0, 60), (30, 59), (60, 58)):
+            estimator.add(minutes * 60, soc, charging=False)
+
+        assert estimator.rate(_no_solar) == pytest.approx(2)
+
+    def test_solar_yield_is_taken_out(self, forecast):
+        """Test that solar charging does not hide the household drain."""
+        estimator = forecast.DrainEstimator(3 * HOUR, HOUR / 2)
+        estimator.add(0, 50, charging=False)
+        estimator.add(HOUR, 52, charging=False)
+
+        assert estimator.rate(lambda start, end: 5) == pytest.approx(3)
+
+    def test_needs_minimum_span(self, forecast):
+        """Test that no rate is reported before enough time was sampled."""
+        estimator = forecast.DrainEstimator(3 * HOUR, HOUR / 2)
+        estimator.add(0, 60, charging=False)
+        estimator.add(600, 59, charging=False)
+
+        assert estimator.rate(_no_solar) is None
+
+    def test_charging_keeps_last_rate(self, forecast):
+        """Test that charging restarts sampling but keeps the last rate."""
+        estimator = forecast.DrainEstimator(3 * HOUR, HOUR / 2)
+        estimator.add(0, 60, charging=False)
+        estimator.add(HOUR, 56, charging=False)
+        assert estimator.rate(_no_solar) == pytest.approx(4)
+
+        estimator.add(HOUR + 60, 58, charging=True)
+        estimator.add(HOUR + 120, 59, charging=False)
+
+        assert estimator.rate(_no_solar) == pytest.approx(4)
+
+    def test_unavailable_soc_is_skipped(self, forecast):
+        """Test that an unavailable SOC keeps the samples taken so far."""
+        estimator = forecast.DrainEstimator(3 * HOUR, HOUR / 2)
+        estimator.add(0, 60, charging=False)
+        estimator.add(HOUR / 4, -1, charging=False)
+        estimator.add(HOUR, 57, charging=False)
+
+        assert estimator.rate(_no_solar) == pytest.approx(3)
+
+    def test_old_samples_leave_the_window(self, forecast):
+        """Test that only samples within the window are used."""
+        estimator = forecast.DrainEstimator(HOUR, HOUR / 2)
+        estimator.add(0, 80, charging=False)
+        estimator.add(2 * HOUR, 60, charging=False)
+        estimator.add(3 * HOUR, 59, charging=False)
+
+        assert estimator.rate(_no_solar) == pytest.approx(1)
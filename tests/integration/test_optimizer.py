@@ -0,0 +1,190 @@
+"""Tests for the SOC trajectory optimizer."""
+
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+
+@pytest.fixture
+def optimizer(component_module):
+    """Load the optimizer module."""
+    return component_module("optimizer")
+
+
+class TestOptimizeChargePlan:
+    """Test the dynamic-programming charge plan."""
+
+    def test_picks_cheapest_slots_before_target(self, optimizer):
+        """Test that the target is met with the cheapest slots before it."""
+        prices = [0.30, 0.10, 0.25, 0.12, 0.05, 0.01]
+        target = optimizer.SocTarget(slot=4, soc=50)
+
+        plan = optimizer.optimize_charge_plan(prices, 30, 10, [target])
+
+        assert [(s.start_index, s.slots) for s in plan.segments] == [(1, 1), (3, 1)]
+        assert plan.cost == pytest.approx(0.22)
+        assert plan.end_soc == 50
+
+    def test_matches_brute_force(self, optimizer):
+        """Test that the plan is as cheap as any feasible charge schedule."""
+        prices = [0.21, 0.08, 0.30, 0.12, 0.19, 0.05, 0.27, 0.11]
+        targets = [optimizer.SocTarget(3, 45), optimizer.SocTarget(8, 70)]
+
+        plan = optimizer.optimize_charge_plan(prices, 30, 10, targets)
+
+        best = min(sum(p for p, on in zip(prices, mask, strict=True) if on) for mask in itertools.product((0, 1), repeat=len(prices)) if sum(mask[:3]) >= 2 and sum(mask) >= 4)
+        assert plan.cost == pytest.approx(best)
+
+    def test_only_charges_in_allowed_slots(self, optimizer):
+        """Test that disallowed slots are skipped even when cheapest."""
+        prices = [0.01, 0.20, 0.30, 0.25]
+        allowed = [False, True, True, True]
+
+        plan = optimizer.optimize_charge_plan(prices, 40, 10, [optimizer.SocTarget(4, 60)], allowed=allowed)
+
+        assert [(s.start_index, s.slots) for s in plan.segments] == [(1, 1), (3, 1)]
+
+    def test_restores_floor_first(self, optimizer):
+        """Test that SOC below the floor is charged in the first allowed slots."""
+        prices = [0.40, 0.30, 0.01, 0.01]
+
+        plan = optimizer.optimize_charge_plan(prices, 10, 5, floor_soc=20)
+
+        assert [(s.start_index, s.slots) for s in plan.segments] == [(0, 2)]
+
+    def test_unreachable_target_charges_every_slot(self, optimizer):
+        """Test that an unreachable target is met as closely as possible."""
+        plan = optimizer.optimize_charge_plan([0.2, 0.3], 20, 10, [optimizer.SocTarget(2, 90)])
+
+        assert plan.slots == 2
+        assert plan.end_soc == 40
+
+    def test_charges_at_negative_prices(self, optimizer):
+        """Test that negative prices are used up to a full battery."""
+        plan = optimizer.optimize_charge_plan([-0.05, 0.20, -0.02], 85, 10)
+
+        assert [(s.start_index, s.slots) for s in plan.segments] == [(0, 1), (2, 1)]
+        assert plan.end_soc == 100
+
+    def test_drain_adds_charging(self, optimizer):
+        """Test that the household drain until the target is charged as well."""
+        prices = [0.30, 0.10, 0.25, 0.20]
+        target = optimizer.SocTarget(slot=4, soc=50)
+
+        assert optimizer.optimize_charge_plan(prices, 50, 10, [target]).slots == 0
+        plan = optimizer.optimize_charge_plan(prices, 50, 10, [target], drain_per_slot=2.5)
+
+        assert [(s.start_index, s.slots) for s in plan.segments] == [(1, 1)]
+        assert plan.end_soc == 52.5
+
+    def test_solar_reduces_charging(self, optimizer):
+        """Test that solar expected before the target replaces charging."""
+        prices = [0.30, 0.10, 0.25, 0.20]
+        target = optimizer.SocTarget(slot=4, soc=60)
+
+        assert optimizer.optimize_charge_plan(prices, 50, 10, [target], drain_per_slot=2).slots == 2
+        plan = optimizer.optimize_charge_plan(prices, 50, 10, [target], drain_per_slot=2, solar=[0, 0, 4, 6])
+
+        assert plan.slots == 1
+        assert plan.end_soc == 64
+
+    def test_drain_matches_brute_force(self, optimizer):
+        """Test that the plan keeps floor and targets at the lowest cost under drain and solar."""
+        prices = [0.21, 0.08, 0.30, 0.12, 0.19, 0.05, 0.27, 0.11]
+        solar = [0, 0, 1, 3, 3, 1, 0, 0]
+        targets = [optimizer.SocTarget(3, 45), optimizer.SocTarget(8, 55)]
+
+        def feasible(mask):
+            soc = 30.0
+            for slot, on in enumerate(mask):
+                soc += (10 if on else -2) + solar[slot]
+                if soc < 25 - 1e-9 or any(target.slot == slot + 1 and soc < target.soc - 1e-9 for target in targets):
+                    return False
+            return True
+
+        plan = optimizer.optimize_charge_plan(prices, 30, 10, targets, floor_soc=25, drain_per_slot=2, solar=solar)
+
+        best = min(sum(p for p, on in zip(prices, mask, strict=True) if on) for mask in itertools.product((0, 1), repeat=len(prices)) if feasible(mask))
+        assert plan.cost == pytest.approx(best)
+        mask = [any(s.start_index <= slot < s.end_index for s in plan.segments) for slot in range(len(prices))]
+        assert feasible(mask)
+
+
+def _rolling_plan(optimizer, charged, **kwargs):
+    """Return a plan of quarter-hour slots anchored at epoch 0."""
+    fields = {
+        "anchor": 0.0,
+        "planned_at": 0.0,
+        "slot_seconds": 900,
+        "start_soc": 40.0,
+        "soc_per_slot": 10.0,
+        "charged": bytes(charged),
+        "price_revision": 1,
+        "forecast": ("12.5", "kWh"),
+        "inputs": (60, None, None),
+    }
+    return optimizer.RollingPlan(**{**fields, **kwargs})
+
+
+class TestRollingPlan:
+    """Test the planned SOC trajectory and the re-plan policy."""
+
+    def test_soc_follows_charged_slots(self, optimizer):
+        """Test that the expected SOC rises only within charged slots."""
+        plan = _rolling_plan(optimizer, [0, 1, 1])
+
+        assert plan.soc_at(900) == 40
+        assert plan.soc_at(1350) == pytest.approx(45)
+        assert plan.soc_at(2700) == 60
+        assert plan.soc_at(5000) == 60
+
+    def test_soc_is_measured_from_planning_time(self, optimizer):
+        """Test that a plan made mid-slot expects its start SOC at that time."""
+        plan = _rolling_plan(optimizer, [1, 0], planned_at=450)
+
+        assert plan.soc_at(450) == 40
+        assert plan.soc_at(900) == pytest.approx(45)
+
+    def test_periods_keep_executed_charging(self, optimizer):
+        """Test that executed periods come first and touching periods are joined."""
+        plan = _rolling_plan(
+            optimizer,
+            [1, 1, 0, 1],
+            planned_at=300,
+            executed=((-1800.0, -900.0), (-600.0, 300.0)),
+        )
+
+        assert plan.periods() == ((-1800, -900), (-600, 1800), (2700, 3600))
+        assert plan.executed_before(1200, -1000) == ((-1000, -900), (-600, 1200))
+
+    def test_replan_reasons(self, optimizer):
+        """Test that each trigger is reported and an unchanged plan is kept."""
+        plan = _rolling_plan(optimizer, [1, 1, 0, 0])
+        key = (1, ("12.5", "kWh"), (60, None, None))
+
+        assert optimizer.replan_reason(None, *key, 0, 40, 5) == optimizer.REPLAN_INITIAL
+        assert optimizer.replan_reason(plan, *key, 900, 52, 5) is None
+        assert optimizer.replan_reason(plan, 2, *key[1:], 900, 50, 5) == optimizer.REPLAN_PRICES
+        assert optimizer.replan_reason(plan, 1, ("3.0", "kWh"), key[2], 900, 50, 5) == optimizer.REPLAN_FORECAST
+        assert optimizer.replan_reason(plan, *key[:2], (70, None, None), 900, 50, 5) == optimizer.REPLAN_INPUTS
+        assert optimizer.replan_reason(plan, *key, 3600, 60, 5) == optimizer.REPLAN_HORIZON
+        assert optimizer.replan_reason(plan, *key, 1350, 49, 5) == optimizer.REPLAN_SOC_DRIFT
+
+    def test_soc_includes_drain_and_solar(self, optimizer):
+        """Test that the expected SOC falls by the drain outside charging and rises with solar."""
+        plan = _rolling_plan(optimizer, [1, 1, 0, 0], drain_per_slot=2.0, solar=(0.0, 0.0, 1.0, 3.0))
+
+        assert plan.soc_at(1800) == 60
+        assert plan.soc_at(2700) == pytest.approx(59)
+        assert plan.soc_at(3150) == pytest.approx(59.5)
+        assert plan.soc_at(3600) == pytest.approx(60)
+
+    def test_drift_outside_charging_replans(self, optimizer):
+        """Test that SOC is compared with the drained trajectory between charging slots too."""
+        plan = _rolling_plan(optimizer, [1, 1, 0, 0], drain_per_slot=2.0)
+        key = (1, ("12.5", "kWh"), (60, None, None))
+
+        assert optimizer.replan_reason(plan, *key, 3000, 57, 5) is None
+        assert optimizer.replan_reason(plan, *key, 3000, 52, 5) == optimizer.REPLAN_SOC_DRIFT
@@ -0,0 +1,188 @@
+"""Tests for the on-demand profiling session."""
+
+from __future__ import annotations
+
+import asyncio
+import pstats
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def profiling(component_module):
+    """Load the profiling module."""
+    return component_module("profiling")
+
+
+def _busy() -> int:
+    """Return a sum that takes measurable time."""
+    return sum(index * index for index in range(20000))
+
+
+def _after_stop() -> int:
+    """Return a sum, called after the session stopped."""
+    return _busy()
+
+
+class TestProfileSession:
+    """Test counting refreshes and writing the profile."""
+
+    def test_done_after_target_refreshes(self, profiling):
+        """Test that the session finishes after the requested refreshes only."""
+        session = profiling.ProfileSession(2)
+
+        with session.measure(refresh=True):
+            _busy()
+        with session.measure():
+            _busy()
+        assert not session.done.is_set()
+
+        with session.measure(refresh=True):
+            _busy()
+        assert session.done.is_set()
+        assert (session.refreshes, session.callbacks) == (2, 1)
+
+    def test_nested_measurements(self, profiling):
+        """Test that a callback inside a refresh keeps the profiler enabled."""
+        session = profiling.ProfileSession(1)
+
+        with session.measure(refresh=True):
+            with session.measure():
+                _busy()
+            _busy()
+
+        assert session.refreshes == 1
+
+    def test_write_returns_hotspots(self, profiling, tmp_path):
+        """Test that the pstats file is written and hotspots are ranked by own time."""
+        session = profiling.ProfileSession(1)
+        with session.measure(refresh=True):
+            _busy()
+
+        session.stop()
+        path = tmp_path / "profile.cprof"
+        hotspots = session.write(str(path), 3)
+
+        assert pstats.Stats(str(path)).total_calls > 0
+        assert len(hotspots) == 3
+        assert hotspots[0]["own_ms"] >= hotspots[-1]["own_ms"]
+        assert any("_busy" in hotspot["function"] or "genexpr" in hotspot["function"] for hotspot in hotspots)
+
+    def test_stop_within_running_refresh(self, profiling, tmp_path):
+        """Test that stopping during a refresh disables the profiler before writing."""
+        session = profiling.ProfileSession(1)
+        refresh = session.measure(refresh=True)
+        refresh.__enter__()
+        _busy()
+
+        session.stop()
+        _after_stop()
+        session.write(str(tmp_path / "profile.cprof"), 3)
+        refresh.__exit__(None, None, None)
+
+        functions = [name for (_, _, name) in pstats.Stats(str(tmp_path / "profile.cprof")).stats]
+        assert "_busy" in functions
+        assert "_after_stop" not in functions
+
+    def test_write_needs_stop(self, profiling, tmp_path):
+        """Test that a running session is not written."""
+        session = profiling.ProfileSession(1)
+
+        with pytest.raises(RuntimeError):
+            session.write(str(tmp_path / "profile.cprof"), 3)
+
+
+class TestProfileService:
+    """Test registering the profile service and its admin check."""
+
+    def _register(self, mock_hass):
+        """Register the profile service and return its registration call."""
+        from custom_components.charge_cheapest import _async_register_profile_service
+
+        _async_register_profile_service(mock_hass)
+        return mock_hass.services.async_register.call_args
+
+    def test_registered_with_response(self, mock_hass):
+        """Test that the service is registered to return its response only."""
+        pytest.importorskip("homeassistant")
+        from homeassistant.core import SupportsResponse
+
+        registration = self._register(mock_hass)
+
+        assert registration.args[:2] == ("charge_cheapest", "profile")
+        assert registration.kwargs["supports_response"] is SupportsResponse.ONLY
+
+    def test_non_admin_is_rejected(self, mock_hass):
+        """Test that a non-admin user cannot start a profile."""
+        pytest.importorskip("homeassistant")
+        from homeassistant.exceptions import Unauthorized
+
+        handler = self._register(mock_hass).args[2]
+        mock_hass.auth.async_get_user = AsyncMock(return_value=MagicMock(is_admin=False))
+        call = MagicMock()
+        call.context.user_id = "user"
+
+        with pytest.raises(Unauthorized):
+            asyncio.run(handler(call))
+
+    def test_call_without_user_is_rejected(self, mock_hass):
+        """Test that a call without a user is not treated as an admin."""
+        pytest.importorskip("homeassistant")
+        from homeassistant.exceptions import Unauthorized
+
+        handler = self._register(mock_hass).args[2]
+        mock_hass.auth.async_get_user = AsyncMock()
+        call = MagicMock()
+        call.context.user_id = None
+
+        with pytest.raises(Unauthorized):
+            asyncio.run(handler(call))
+        mock_hass.auth.async_get_user.assert_not_called()
+
+    def test_services_removed_with_last_entry(self, mock_hass, mock_config_entry):
+        """Test that unloading the last entry removes the integration services."""
+        pytest.importorskip("homeassistant")
+        from custom_components.charge_cheapest import async_unload_entry
+
+        coordinator = MagicMock(async_shutdown=AsyncMock())
+        mock_hass.data["charge_cheapest"] = {
+            mock_config_entry.entry_id: {"coordinator": coordinator},
+            "other_entry": {"coordinator": coordinator},
+        }
+        mock_hass.services.async_remove = MagicMock()
+
+        assert asyncio.run(async_unload_entry(mock_hass, mock_config_entry))
+        mock_hass.services.async_remove.assert_not_called()
+
+        mock_config_entry.entry_id = "other_entry"
+        assert asyncio.run(async_unload_entry(mock_hass, mock_config_entry))
+        removed = {call.args for call in mock_hass.services.async_remove.call_args_list}
+        assert removed == {("charge_cheapest", "get_window_costs"), ("charge_cheapest", "profile")}
+
+
+class TestProfiledCallbacks:
+    """Test wrapping the coordinator's callbacks for a profiling session."""
+
+    def test_sync_and_async_callbacks_are_measured(self, mock_hass, mock_config_entry, profiling):
+        """Test that both kinds of callbacks keep their type and are counted."""
+        pytest.importorskip("homeassistant")
+        import inspect
+        from unittest.mock import patch
+
+        from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+
+        with patch("custom_components.charge_cheapest.coordinator.Store"):
+            coordinator = TibberCheapestChargingCoordinator(mock_hass, mock_config_entry)
+
+        async def handle_async(value):
+            return value
+
+        run_async = coordinator._profiled(handle_async)
+        run_sync = coordinator._profiled(lambda value: value)
+        coordinator.profiling = profiling.ProfileSession(1)
+
+        assert inspect.iscoroutinefunction(run_async)
+        assert asyncio.run(run_async(1)) == 1
+        assert run_sync(2) == 2
+        assert coordinator.profiling.callbacks == 2
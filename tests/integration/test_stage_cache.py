@@ -0,0 +1,52 @@
+"""Tests for the fingerprinted stage cache."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def stage_cache(component_module):
+    """Load the stage cache module."""
+    return component_module("stage_cache")
+
+
+class TestStageCache:
+    """Test stage reuse and hit/miss accounting."""
+
+    def test_reuses_output_while_fingerprint_unchanged(self, stage_cache):
+        """Test that a stage is only recomputed when its inputs change."""
+        cache = stage_cache.StageCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("window", (1, 3.0), compute) == 1
+        assert cache.get_or_compute("window", (1, 3.0), compute) == 1
+        assert cache.get_or_compute("window", (2, 3.0), compute) == 2
+        assert len(calls) == 2
+
+    def test_reports_hit_rates_per_stage(self, stage_cache):
+        """Test that hit and miss counters are reported per stage and overall."""
+        cache = stage_cache.StageCache()
+        assert cache.hit_rate is None
+
+        for _ in range(4):
+            cache.get_or_compute("price_range", 7, lambda: "0.1 - 0.2")
+        cache.get_or_compute("savings", (7, None), lambda: 1.5)
+
+        stats = cache.stats()
+        assert stats["price_range"] == {"hits": 3, "misses": 1, "hit_rate": 75.0}
+        assert stats["savings"] == {"hits": 0, "misses": 1, "hit_rate": 0.0}
+        assert cache.hit_rate == 60.0
+        assert cache.fingerprints() == {"price_range": 7, "savings": (7, None)}
+
+    def test_lookup_and_store_for_async_stages(self, stage_cache):
+        """Test the explicit lookup/store pair used by awaitable stages."""
+        cache = stage_cache.StageCache()
+
+        assert cache.lookup("window", 1) == (False, None)
+        cache.store("window", 1, {"start": "01:00:00"})
+        assert cache.lookup("window", 1) == (True, {"start": "01:00:00"})
@@ -0,0 +1,55 @@
+"""Tests for the per-stage refresh timings."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def stage_timings(component_module):
+    """Load the stage timings module."""
+    return component_module("stage_timings")
+
+
+class TestStageTimings:
+    """Test the timing ring buffers and their percentiles."""
+
+    def test_laps_record_each_stage(self, stage_timings, monkeypatch):
+        """Test that laps record the time since the previous lap and finish the total."""
+        clock = iter([10.0, 10.002, 10.0025, 10.01])
+        monkeypatch.setattr(stage_timings.time, "monotonic", lambda: next(clock))
+        timings = stage_timings.StageTimings(10)
+
+        timings.start()
+        timings.lap("price_fetch")
+        timings.lap("duration")
+        total = timings.finish()
+
+        assert total == pytest.approx(0.01)
+        assert timings.last() == {"price_fetch": 2.0, "duration": 0.5, "total": 10.0}
+
+    def test_percentiles(self, stage_timings):
+        """Test nearest-rank p50 and p95 with the maximum per stage."""
+        timings = stage_timings.StageTimings(100)
+        for ms in range(1, 21):
+            timings.record("window_search", ms / 1000)
+
+        assert timings.stats() == {"window_search": {"p50": 10.0, "p95": 19.0, "max": 20.0, "samples": 20}}
+
+    def test_ring_buffer_drops_oldest(self, stage_timings):
+        """Test that only the last refreshes are kept."""
+        timings = stage_timings.StageTimings(3)
+        for ms in (50, 1, 2, 3):
+            timings.record(stage_timings.STAGE_TOTAL, ms / 1000)
+
+        assert timings.recent() == [1.0, 2.0, 3.0]
+        assert timings.stats()["total"]["max"] == 3.0
+
+    def test_percentiles_follow_the_ring_buffer(self, stage_timings):
+        """Test that the percentiles only cover the buffered samples, also with repeated values."""
+        timings = stage_timings.StageTimings(4)
+        for ms in (9, 1, 5, 1, 7, 3, 1):
+            timings.record("window_search", ms / 1000)
+
+        # 1, 7, 3 and 1 are buffered
+        assert timings.stats() == {"window_search": {"p50": 1.0, "p95": 7.0, "max": 7.0, "samples": 4}}
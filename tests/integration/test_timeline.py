@@ -0,0 +1,108 @@
+"""Tests for the compact price timeline."""
+
+from __future__ import annotations
+
+import statistics
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def timeline(component_module):
+    """Load the price timeline module."""
+    return component_module("timeline")
+
+
+DAY_START = datetime.fromisoformat("2026-01-08T00:00:00+01:00").timestamp()
+
+
+class TestPriceTimeline:
+    """Test building and indexing the price timeline."""
+
+    def test_hourly_entries_without_start_times(self, timeline, mock_tibber_state):
+        """Test that plain hourly lists start at local midnight."""
+        attrs = mock_tibber_state.attributes
+        result = timeline.PriceTimeline.from_attributes(attrs["today"], attrs["tomorrow"], DAY_START)
+
+        assert result.start == DAY_START
+        assert result.resolution == 3600
+        assert len(result) == 48
+        assert result.today_slots == 24
+        assert min(result.today_prices) == pytest.approx(0.12)
+
+    def test_quarter_hour_entries_with_start_times(self, timeline):
+        """Test that start_time entries define start and resolution."""
+        today = [
+            {"start_time": "2026-01-08T00:15:00.000+01:00", "price": 0.26},
+            {"start_time": "2026-01-08T00:30:00.000+01:00", "price": 0.2561},
+            {"start_time": "2026-01-08T00:45:00.000+01:00", "price": 0.2539},
+        ]
+        result = timeline.PriceTimeline.from_attributes(today, [], DAY_START)
+
+        assert result.start == DAY_START + 900
+        assert result.resolution == 900
+        assert list(result.prices) == [0.26, 0.2561, 0.2539]
+
+    def test_resample_hourly_to_quarter_hours(self, timeline, mock_tibber_state):
+        """Test that resampling repeats prices and keeps statistics unchanged."""
+        attrs = mock_tibber_state.attributes
+        hourly = timeline.PriceTimeline.from_attributes(attrs["today"], attrs["tomorrow"], DAY_START)
+
+        quarter = hourly.resample(900)
+
+        assert len(quarter) == 4 * len(hourly)
+        assert quarter.today_slots == 96
+        assert sum(quarter.today_prices) / 96 == pytest.approx(sum(hourly.today_prices) / 24)
+        assert quarter.index_at(DAY_START + 23 * 3600) == 92
+
+    def test_index_at_is_clamped(self, timeline, mock_tibber_state):
+        """Test that timestamps outside the timeline clamp to its bounds."""
+        attrs = mock_tibber_state.attributes
+        result = timeline.PriceTimeline.from_attributes(attrs["today"], [], DAY_START)
+
+        assert result.index_at(DAY_START - 7200) == 0
+        assert result.index_at(result.end + 7200) == len(result)
+
+    def test_no_prices_today(self, timeline):
+        """Test that an empty today list yields no timeline."""
+        assert timeline.PriceTimeline.from_attributes([], [], DAY_START) is None
+
+
+class TestParsedPrices:
+    """Test parsing a price sensor state with precomputed statistics."""
+
+    def test_statistics_cover_today(self, timeline, mock_tibber_state):
+        """Test that min, max, mean and median are computed from today's prices."""
+        parsed = timeline.ParsedPrices.from_state(1, mock_tibber_state.state, mock_tibber_state.attributes, DAY_START, 900)
+        today = [entry["total"] for entry in mock_tibber_state.attributes["today"]]
+
+        assert parsed.revision == 1
+        assert parsed.current_price == 0.25
+        assert parsed.tomorrow_available is True
+        assert parsed.timeline.resolution == 900
+        assert parsed.min_price == min(today)
+        assert parsed.max_price == max(today)
+        assert parsed.mean_price == pytest.approx(sum(today) / len(today))
+        assert parsed.median_price == pytest.approx(statistics.median(today))
+
+    def test_new_current_price_keeps_parse(self, timeline, mock_tibber_state):
+        """Test that only the current price changes for a newer state of the same price lists."""
+        parsed = timeline.ParsedPrices.from_state(1, mock_tibber_state.state, mock_tibber_state.attributes, DAY_START, 900)
+
+        updated = parsed.with_current_price("0.3")
+
+        assert updated.current_price == 0.3
+        assert updated.revision == 1
+        assert updated.timeline is parsed.timeline
+        assert updated.median_price == parsed.median_price
+        assert parsed.with_current_price("unavailable").current_price is None
+
+    def test_missing_today_keeps_availability(self, timeline):
+        """Test that tomorrow's availability is reported without today's prices."""
+        parsed = timeline.ParsedPrices.from_state(2, "unknown", {"today": [], "tomorrow": [{"total": 0.1}]}, DAY_START, 900)
+
+        assert parsed.current_price is None
+        assert parsed.tomorrow_available is True
+        assert parsed.timeline is None
+        assert parsed.min_price is None
@@ -0,0 +1,120 @@
+"""Tests for the cheapest charging window engine."""
+
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def window(component_module):
+    """Load the window engine module."""
+    return component_module("window")
+
+
+class TestWindowEngine:
+    """Test prefix-sum window search."""
+
+    def test_keeps_time_order(self, window):
+        """Test that the cheapest block is contiguous in time, not in price."""
+        prices = [0.30, 0.10, 0.40, 0.12, 0.11, 0.35]
+        engine = window.WindowEngine(prices)
+
+        result = engine.cheapest(2)
+
+        assert result.start_index == 3
+        assert result.slots == 2
+        assert result.cost == pytest.approx(0.23)
+
+    def test_matches_brute_force(self, window):
+        """Test that prefix sums match naive slice sums for every duration."""
+        prices = [0.25, 0.22, 0.18, 0.15, 0.31, 0.12, 0.14, 0.40, 0.09, 0.33]
+        engine = window.WindowEngine(prices)
+
+        results = engine.cheapest_many(range(1, len(prices) + 1))
+
+        for slots, result in results.items():
+            costs = [sum(prices[i : i + slots]) for i in range(len(prices) - slots + 1)]
+            assert result.cost == pytest.approx(min(costs))
+            assert result.start_index == costs.index(min(costs))
+
+    def test_respects_search_range(self, window):
+        """Test that windows stay inside the requested slot range."""
+        prices = [0.01, 0.01, 0.30, 0.20, 0.25, 0.01]
+        engine = window.WindowEngine(prices)
+
+        result = engine.cheapest(2, first=2, last=5)
+
+        assert result.start_index == 3
+        assert result.end_index == 5
+
+    def test_clamps_duration_to_range(self, window):
+        """Test that over-long durations are shortened to the whole range."""
+        engine = window.WindowEngine([0.2, 0.3, 0.1])
+
+        result = engine.cheapest(10)
+
+        assert result.start_index == 0
+        assert result.slots == 3
+
+    def test_empty_range_returns_none(self, window):
+        """Test that an empty search range yields no window."""
+        engine = window.WindowEngine([])
+
+        assert engine.cheapest(4) is None
+
+
+class TestDurationTable:
+    """Test the precomputed cheapest window per duration."""
+
+    def test_table_matches_single_searches(self, window):
+        """Test that one pass answers every duration like separate searches."""
+        prices = [0.31, 0.18, 0.22, 0.09, 0.14, 0.27, 0.05, 0.12, 0.40, 0.16]
+        engine = window.WindowEngine(prices)
+
+        table = engine.cheapest_many(range(1, 33), 2, 9)
+
+        assert len(table) == 32
+        for slots, result in table.items():
+            assert result == engine.cheapest(slots, 2, 9)
+        assert table[32].slots == 7
+
+
+class TestCheapestSegments:
+    """Test non-contiguous cheapest slot selection."""
+
+    PRICES = [0.30, 0.05, 0.31, 0.32, 0.06, 0.07, 0.33, 0.34, 0.04, 0.08, 0.35]
+
+    def test_beats_contiguous_block(self, window):
+        """Test that separate cheap runs are preferred over one block."""
+        engine = window.WindowEngine(self.PRICES)
+
+        segments = engine.cheapest_segments(4, min_run=2)
+
+        assert [(s.start_index, s.slots) for s in segments] == [(4, 2), (8, 2)]
+        assert sum(s.cost for s in segments) < engine.cheapest(4).cost
+
+    def test_respects_min_run_length(self, window):
+        """Test that no segment is shorter than the minimum run length."""
+        engine = window.WindowEngine(self.PRICES)
+
+        segments = engine.cheapest_segments(5, min_run=2)
+
+        assert sum(s.slots for s in segments) == 5
+        assert all(s.slots >= 2 for s in segments)
+
+    def test_respects_max_runs(self, window):
+        """Test that the number of switch cycles is limited."""
+        engine = window.WindowEngine(self.PRICES)
+
+        segments = engine.cheapest_segments(5, min_run=1, max_runs=2)
+
+        assert len(segments) <= 2
+        assert sum(s.slots for s in segments) >= 5
+
+    def test_single_run_equals_contiguous(self, window):
+        """Test that one allowed run yields the cheapest contiguous block."""
+        engine = window.WindowEngine(self.PRICES)
+
+        segments = engine.cheapest_segments(3, max_runs=1)
+
+        assert segments == [engine.cheapest(3)]
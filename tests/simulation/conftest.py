@@ -0,0 +1,39 @@
+"""Fixtures for Charge Cheapest simulations."""
+
+from __future__ import annotations
+
+import math
+import os
+import sys
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+# The harness imports the integration as a package
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../.."))
+
+TIME_ZONE = ZoneInfo("Europe/Berlin")
+
+
+@pytest.fixture
+def time_zone():
+    """Return the local time zone of the simulated home."""
+    return TIME_ZONE
+
+
+@pytest.fixture
+def price_entries():
+    """Return a factory for quarter-hour prices with cheap nights and expensive evenings."""
+
+    def factory(days: int) -> list[dict]:
+        start = datetime(2026, 1, 1, tzinfo=TIME_ZONE).timestamp()
+        entries = []
+        for slot in range(days * 96):
+            local = datetime.fromtimestamp(start + slot * 900, TIME_ZONE)
+            hour = local.hour + local.minute / 60
+            price = 0.25 + 0.1 * math.sin(2 * math.pi * (hour - 9) / 24) + 0.001 * (slot % 7)
+            entries.append({"start_time": local.isoformat(), "price": round(price, 4)})
+        return entries
+
+    return factory
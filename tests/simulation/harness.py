@@ -0,0 +1,565 @@
+"""Deterministic simulation harness for the Charge Cheapest coordinator.
+
+The full coordinator, with its time triggers, charge scheduler, SOC watch
+and notifications, runs against a lightweight stand-in for Home Assistant:
+
+- ``VirtualClock`` replaces the wall clock and the time tracking helpers the
+  coordinator and scheduler import, and runs their callbacks in time order
+  without waiting.
+- ``SimHass`` keeps states in memory, fires state change listeners and
+  handles the switch and notification services.
+- ``SimulatedBattery`` charges while the charging switch is on and covers
+  the household load otherwise. It is advanced exactly from one timer to
+  the next and reports its SOC every quarter hour like an inverter sensor.
+- Prices come from a ``PriceTimeline`` and are published like the Tibber
+  sensor: today's prices at midnight, tomorrow's at 13:00.
+
+Home Assistant must be installed, as the coordinator builds on its
+``DataUpdateCoordinator``. Everything else runs in a single asyncio loop as
+fast as the callbacks allow: the clock jumps from timer to timer, and
+requested refreshes run once all timers of an instant have fired instead of
+going through the debouncer. The report holds the loop time spent on every
+simulated day.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta, tzinfo
+from itertools import count
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.charge_cheapest import coordinator as coordinator_module
+from custom_components.charge_cheapest import scheduler as scheduler_module
+from custom_components.charge_cheapest.backtest import HomeModel
+from custom_components.charge_cheapest.const import TIME_SLOT_SECONDS
+from custom_components.charge_cheapest.coordinator import TibberCheapestChargingCoordinator
+from custom_components.charge_cheapest.timeline import PriceTimeline
+
+PRICE_SENSOR = "sensor.tibber_prices"
+SOC_SENSOR = "sensor.battery_soc"
+CAPACITY_SENSOR = "sensor.battery_capacity"
+POWER_INPUT = "input_number.charging_power"
+CHARGING_SWITCH = "switch.battery_charging"
+
+# Tibber publishes tomorrow's prices early in the afternoon
+TOMORROW_PUBLISH_HOUR = 13
+
+
+class VirtualClock:
+    """Simulated time with a timer queue."""
+
+    def __init__(self, start: datetime) -> None:
+        """Initialize the clock at an aware ``start`` time."""
+        self.time_zone = start.tzinfo
+        self._now = start.timestamp()
+        self._timers: list[tuple[float, int, Callable[[datetime], Any]]] = []
+        self._cancelled: set[int] = set()
+        self._sequence = count()
+
+    @property
+    def timestamp(self) -> float:
+        """Return the current epoch."""
+        return self._now
+
+    def now(self, time_zone: tzinfo | None = None) -> datetime:
+        """Return the current local time."""
+        return datetime.fromtimestamp(self._now, time_zone or self.time_zone)
+
+    def utcnow(self) -> datetime:
+        """Return the current UTC time."""
+        return datetime.fromtimestamp(self._now, UTC)
+
+    def start_of_local_day(self, value: datetime | date | None = None) -> datetime:
+        """Return local midnight of ``value``, today if None."""
+        return dt_util.start_of_local_day(value or self.now())
+
+    def call_at(self, timestamp: float, action: Callable[[datetime], Any]) -> Callable[[], None]:
+        """Run ``action`` with the local time once the clock reaches ``timestamp``."""
+        sequence = next(self._sequence)
+        heapq.heappush(self._timers, (max(timestamp, self._now), sequence, action))
+        return lambda: self._cancelled.add(sequence)
+
+    def next_timer(self) -> float | None:
+        """Return the epoch of the next pending timer."""
+        while self._timers and self._timers[0][1] in self._cancelled:
+            self._cancelled.discard(heapq.heappop(self._timers)[1])
+        return self._timers[0][0] if self._timers else None
+
+    def pop_due(self, until: float) -> Callable[[datetime], Any] | None:
+        """Advance to the next timer before ``until`` and return its action."""
+        when = self.next_timer()
+        if when is None or when >= until:
+            self._now = max(self._now, until)
+            return None
+        _, _, action = heapq.heappop(self._timers)
+        self._now = when
+        return action
+
+    # Replacements for homeassistant.helpers.event
+
+    def track_point_in_time(self, hass: Any, action: Callable[[datetime], Any], point: datetime) -> Callable[[], None]:
+        """Stand in for ``async_track_point_in_time``."""
+        return self.call_at(point.timestamp(), action)
+
+    def track_time_change(
+        self,
+        hass: Any,
+        action: Callable[[datetime], Any],
+        hour: int | None = None,
+        minute: int | None = None,
+        second: int | None = None,
+    ) -> Callable[[], None]:
+        """Stand in for ``async_track_time_change`` with a fixed daily time."""
+        handle: dict[str, Callable[[], None]] = {}
+
+        def schedule() -> None:
+            current = self.now()
+            fire = current.replace(hour=hour or 0, minute=minute or 0, second=second or 0, microsecond=0)
+            if fire <= current:
+                fire += timedelta(days=1)
+            handle["cancel"] = self.call_at(fire.timestamp(), run)
+
+        def run(now: datetime) -> Any:
+            schedule()
+            return action(now)
+
+        schedule()
+        return lambda: handle["cancel"]()
+
+
+@dataclass(slots=True)
+class SimState:
+    """A state with the fields the integration reads."""
+
+    entity_id: str
+    state: str
+    attributes: dict[str, Any]
+    last_updated: datetime
+    context: SimpleNamespace
+
+
+class SimStateMachine:
+    """In-memory state machine with state change listeners."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        """Initialize an empty state machine."""
+        self._clock = clock
+        self._states: dict[str, SimState] = {}
+        self._listeners: dict[str, list[Callable[[Any], Any]]] = {}
+        self._context = count()
+
+    def get(self, entity_id: str) -> SimState | None:
+        """Return the state of an entity."""
+        return self._states.get(entity_id)
+
+    def async_set(self, entity_id: str, value: Any, attributes: dict[str, Any] | None = None) -> None:
+        """Set a state and notify listeners when state or attributes changed."""
+        old = self._states.get(entity_id)
+        value = str(value)
+        attributes = attributes if attributes is not None else (old.attributes if old else {})
+        if old is not None and old.state == value and old.attributes == attributes:
+            return
+
+        new = SimState(
+            entity_id,
+            value,
+            attributes,
+            self._clock.utcnow(),
+            SimpleNamespace(id=str(next(self._context))),
+        )
+        self._states[entity_id] = new
+        event = SimpleNamespace(data={"entity_id": entity_id, "old_state": old, "new_state": new})
+        for listener in list(self._listeners.get(entity_id, ())):
+            listener(event)
+
+    def track(self, hass: Any, entity_ids: Iterable[str], action: Callable[[Any], Any]) -> Callable[[], None]:
+        """Stand in for ``async_track_state_change_event``."""
+        entity_ids = [entity_ids] if isinstance(entity_ids, str) else list(entity_ids)
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(action)
+
+        def remove() -> None:
+            for entity_id in entity_ids:
+                self._listeners[entity_id].remove(action)
+
+        return remove
+
+
+class SimServices:
+    """Service registry handling the calls the integration makes."""
+
+    def __init__(self, states: SimStateMachine, clock: VirtualClock) -> None:
+        """Initialize with the state machine the switch writes to."""
+        self._states = states
+        self._clock = clock
+        self.notifications: list[dict[str, Any]] = []
+        self.switch_changes = 0
+        self.switch_events: list[tuple[datetime, str]] = []
+
+    async def async_call(self, domain: str, service: str, data: dict[str, Any], **kwargs: Any) -> None:
+        """Handle a service call."""
+        if domain == "switch":
+            value = "on" if service == "turn_on" else "off"
+            state = self._states.get(data["entity_id"])
+            if state is None or state.state != value:
+                self.switch_changes += 1
+                self.switch_events.append((self._clock.now(), value))
+            self._states.async_set(data["entity_id"], value)
+        elif domain == "persistent_notification":
+            self.notifications.append(data)
+
+    def has_service(self, domain: str, service: str) -> bool:
+        """Return whether a service is handled."""
+        return domain in ("switch", "persistent_notification")
+
+
+class SimHass:
+    """Lightweight stand-in for the parts of ``HomeAssistant`` the coordinator uses."""
+
+    def __init__(self, clock: VirtualClock) -> None:
+        """Initialize the stand-in on the running event loop."""
+        self.loop = asyncio.get_running_loop()
+        self.clock = clock
+        self.data: dict[str, Any] = {}
+        self.states = SimStateMachine(clock)
+        self.services = SimServices(self.states, clock)
+        self.bus = MagicMock()
+        self.config = SimpleNamespace(
+            time_zone=str(clock.time_zone),
+            latitude=52.52,
+            longitude=13.40,
+            elevation=0,
+            path=lambda *parts: "/".join(("/config", *parts)),
+        )
+        self.is_stopping = False
+        self._tasks: set[asyncio.Task] = set()
+
+    def async_create_task(self, target: Any, name: str | None = None, eager_start: bool = True) -> asyncio.Task:
+        """Run a coroutine as a tracked task, eagerly like Home Assistant does."""
+        task = asyncio.Task(target, loop=self.loop, name=name, eager_start=eager_start)
+        self._tasks.add(task)
+        return task
+
+    async_create_background_task = async_create_task
+
+    async def async_block_till_done(self) -> None:
+        """Wait until all tracked tasks finished, including the ones they start."""
+        # Gathering finished tasks does not yield to the loop, so they are
+        # taken out of the set here rather than by a done callback
+        while self._tasks:
+            tasks = list(self._tasks)
+            self._tasks.clear()
+            await asyncio.gather(*tasks)
+
+
+class MemoryStore:
+    """In-memory stand-in for ``homeassistant.helpers.storage.Store``."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize an empty store."""
+        self.data: Any = None
+
+    async def async_load(self) -> Any:
+        """Return the saved data."""
+        return self.data
+
+    async def async_save(self, data: Any) -> None:
+        """Save data."""
+        self.data = data
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        """Save the data right away, delays do not matter in a simulation."""
+        self.data = data_func()
+
+
+@dataclass(slots=True)
+class SimulatedBattery:
+    """Battery that charges at a fixed power or covers the household load."""
+
+    home: HomeModel
+    soc: float
+    charged_kwh: float = 0.0
+    grid_cost: float = 0.0
+
+    def step(self, charging: bool, local: datetime, seconds: float, price: float) -> None:
+        """Advance the battery by ``seconds`` starting at ``local``."""
+        hours = seconds / 3600
+        capacity = self.home.capacity_kwh
+        load = self.home.hourly_load_kwh()[local.hour] * hours
+        grid = load
+        if charging and self.soc < 100:
+            stored = min(self.home.charge_power_kw * hours * self.home.efficiency, (100 - self.soc) / 100 * capacity)
+            self.soc += stored / capacity * 100
+            self.charged_kwh += stored / self.home.efficiency
+            grid += stored / self.home.efficiency
+        else:
+            used = min(load, max(0.0, (self.soc - self.home.min_soc) / 100 * capacity))
+            self.soc -= used / capacity * 100
+            grid -= used
+        self.grid_cost += grid * price
+
+
+@dataclass(slots=True)
+class SimulatedDay:
+    """What happened on one simulated local day."""
+
+    day: date
+    loop_seconds: float = 0.0
+    refreshes: int = 0
+    switch_changes: int = 0
+    notifications: int = 0
+    charged_kwh: float = 0.0
+    cost: float = 0.0
+
+
+@dataclass(slots=True)
+class SimulationReport:
+    """Per-day results of a simulation run."""
+
+    days: list[SimulatedDay] = field(default_factory=list)
+    diagnostics: dict[str, Any] = field(default_factory=dict)
+    switch_events: list[tuple[datetime, str]] = field(default_factory=list)
+
+    @property
+    def loop_seconds(self) -> float:
+        """Return the total event loop time."""
+        return sum(day.loop_seconds for day in self.days)
+
+    def summary(self) -> dict[str, Any]:
+        """Return totals and event loop time per simulated day."""
+        days = len(self.days) or 1
+        loop_times = sorted(day.loop_seconds for day in self.days) or [0.0]
+        return {
+            "days": len(self.days),
+            "loop_ms_per_day": round(self.loop_seconds / days * 1000, 3),
+            "loop_ms_max_day": round(loop_times[-1] * 1000, 3),
+            "days_per_minute": round(60 / (self.loop_seconds / days), 1) if self.loop_seconds else None,
+            "refreshes": sum(day.refreshes for day in self.days),
+            "switch_changes": sum(day.switch_changes for day in self.days),
+            "notifications": sum(day.notifications for day in self.days),
+            "charged_kwh": round(sum(day.charged_kwh for day in self.days), 2),
+            "cost": round(sum(day.cost for day in self.days), 2),
+        }
+
+
+class Simulation:
+    """Run the coordinator over a price timeline on a virtual clock."""
+
+    def __init__(
+        self,
+        timeline: PriceTimeline,
+        time_zone: tzinfo,
+        options: dict[str, Any] | None = None,
+        home: HomeModel | None = None,
+    ) -> None:
+        """Initialize the simulation.
+
+        Args:
+            timeline: Quarter-hour prices covering the simulated days and one more
+            time_zone: Local time zone of the schedule
+            options: Config entry options on top of the simulated entities
+            home: Battery and household model
+        """
+        self.timeline = timeline
+        self.time_zone = time_zone
+        self.home = home or HomeModel()
+        self.options = options or {}
+        self._day_slots: dict[date, list[dict[str, Any]]] = {}
+
+    def _local_day_slots(self, day: date) -> list[dict[str, Any]]:
+        """Return the Tibber style price entries of a local day."""
+        if (slots := self._day_slots.get(day)) is None:
+            slots = self._day_slots[day] = self._build_day_slots(day)
+        return slots
+
+    def _build_day_slots(self, day: date) -> list[dict[str, Any]]:
+        """Build the price entries of a local day from the timeline."""
+        start = datetime.combine(day, datetime.min.time(), self.time_zone)
+        end = datetime.combine(day + timedelta(days=1), datetime.min.time(), self.time_zone)
+        timeline = self.timeline
+        first = timeline.index_at(start.timestamp())
+        last = timeline.index_at(end.timestamp())
+        return [
+            {
+                "startsAt": datetime.fromtimestamp(timeline.slot_start(index), self.time_zone).isoformat(),
+                "total": timeline.prices[index],
+            }
+            for index in range(first, last)
+        ]
+
+    def _price_at(self, timestamp: float) -> float:
+        """Return the price of the slot containing ``timestamp``."""
+        return self.timeline.prices[min(self.timeline.index_at(timestamp), len(self.timeline) - 1)]
+
+    def _publish_prices(self, hass: SimHass, clock: VirtualClock) -> None:
+        """Update the price sensor state and attributes for the current time."""
+        local = clock.now()
+        today = local.date()
+        attributes = {"today": self._local_day_slots(today), "tomorrow": []}
+        if local.hour >= TOMORROW_PUBLISH_HOUR:
+            attributes["tomorrow"] = self._local_day_slots(today + timedelta(days=1))
+        hass.states.async_set(PRICE_SENSOR, round(self._price_at(clock.timestamp), 4), attributes)
+
+    async def async_run(self, days: int) -> SimulationReport:
+        """Simulate ``days`` local days from the first midnight of the timeline."""
+        first_day = datetime.fromtimestamp(self.timeline.start, self.time_zone).date() + timedelta(days=1)
+        start = datetime.combine(first_day, datetime.min.time(), self.time_zone)
+        clock = VirtualClock(start)
+        hass = SimHass(clock)
+        dt_util.set_default_time_zone(self.time_zone)
+
+        entry = MagicMock()
+        entry.entry_id = "simulation"
+        entry.data = {
+            "battery_soc_sensor": SOC_SENSOR,
+            "battery_charging_switch": CHARGING_SWITCH,
+            "price_sensor": PRICE_SENSOR,
+            "battery_capacity_sensor": CAPACITY_SENSOR,
+            "battery_charging_power": POWER_INPUT,
+            # The integration switches the simulated charger itself
+            "charge_control": "windows",
+        }
+        entry.options = self.options
+
+        battery = SimulatedBattery(self.home, self.home.initial_soc)
+        hass.states.async_set(CAPACITY_SENSOR, self.home.capacity_kwh, {"unit_of_measurement": "kWh"})
+        hass.states.async_set(POWER_INPUT, self.home.charge_power_kw * 1000, {"unit_of_measurement": "W"})
+        hass.states.async_set(SOC_SENSOR, round(battery.soc, 1), {"unit_of_measurement": "%"})
+        hass.states.async_set(CHARGING_SWITCH, "off")
+        self._publish_prices(hass, clock)
+
+        virtual_dt = SimpleNamespace(
+            now=clock.now,
+            utcnow=clock.utcnow,
+            start_of_local_day=clock.start_of_local_day,
+            as_local=lambda value: value.astimezone(self.time_zone),
+            utc_from_timestamp=dt_util.utc_from_timestamp,
+            parse_datetime=dt_util.parse_datetime,
+        )
+
+        with (
+            patch.object(coordinator_module, "dt_util", virtual_dt),
+            patch.object(scheduler_module, "dt_util", virtual_dt),
+            patch.object(coordinator_module, "Store", MemoryStore),
+            patch.object(coordinator_module, "async_track_time_change", clock.track_time_change),
+            patch.object(coordinator_module, "async_track_state_change_event", hass.states.track),
+            patch.object(scheduler_module, "async_track_point_in_time", clock.track_point_in_time),
+        ):
+            coordinator = TibberCheapestChargingCoordinator(hass, entry)
+            report = await self._async_drive(coordinator, hass, clock, battery, days)
+            report.diagnostics = coordinator.diagnostics()
+            report.switch_events = hass.services.switch_events
+            await coordinator.async_shutdown()
+        return report
+
+    async def _async_drive(
+        self,
+        coordinator: TibberCheapestChargingCoordinator,
+        hass: SimHass,
+        clock: VirtualClock,
+        battery: SimulatedBattery,
+        days: int,
+    ) -> SimulationReport:
+        """Set the coordinator up like the integration does and run the clock."""
+        report = SimulationReport()
+        today = SimulatedDay(clock.now().date())
+        report.days.append(today)
+
+        # Polling runs on the virtual clock and, like in Home Assistant,
+        # restarts after every refresh
+        poll_interval = coordinator.update_interval.total_seconds()
+        coordinator.update_interval = None
+        poll_handle: dict[str, Callable[[], None]] = {}
+        refresh: dict[str, bool] = {"requested": False}
+        battery_time = clock.timestamp
+
+        async def request_refresh() -> None:
+            refresh["requested"] = True
+
+        def poll(now: datetime) -> Any:
+            return coordinator.async_refresh()
+
+        def refreshed() -> None:
+            today.refreshes += 1
+            if "cancel" in poll_handle:
+                poll_handle["cancel"]()
+            poll_handle["cancel"] = clock.call_at(clock.timestamp + poll_interval, poll)
+
+        def publish(now: datetime) -> None:
+            clock.call_at(clock.timestamp + TIME_SLOT_SECONDS, publish)
+            self._publish_prices(hass, clock)
+            hass.states.async_set(SOC_SENSOR, round(battery.soc, 1))
+
+        def advance_battery() -> None:
+            # The switch only changes on timers, and a price slot or an hour
+            # of load never spans two of them as prices publish every slot
+            nonlocal battery_time
+            if clock.timestamp > battery_time:
+                switch = hass.states.get(CHARGING_SWITCH)
+                charging = switch is not None and switch.state == "on"
+                start = datetime.fromtimestamp(battery_time, self.time_zone)
+                battery.step(charging, start, clock.timestamp - battery_time, self._price_at(battery_time))
+                battery_time = clock.timestamp
+
+        coordinator.async_request_refresh = request_refresh
+        coordinator.async_add_listener(refreshed)
+
+        started = time.perf_counter()
+        await coordinator.async_restore_plan()
+        await coordinator.async_refresh()
+        coordinator.async_setup_listeners()
+        await coordinator.async_setup_automations()
+        clock.call_at(clock.timestamp + TIME_SLOT_SECONDS, publish)
+        await hass.async_block_till_done()
+        refresh["requested"] = False
+        today.loop_seconds += time.perf_counter() - started
+
+        end = (clock.now() + timedelta(days=days)).timestamp()
+        notifications = switch_changes = 0
+        charged_kwh = cost = 0.0
+        while True:
+            started = time.perf_counter()
+            if refresh["requested"] and (clock.next_timer() or end) > clock.timestamp:
+                # Refreshes requested at one instant run together once its timers fired
+                refresh["requested"] = False
+                await coordinator.async_refresh()
+                await hass.async_block_till_done()
+                today.loop_seconds += time.perf_counter() - started
+                continue
+
+            if (action := clock.pop_due(end)) is None:
+                break
+            advance_battery()
+            local = clock.now()
+            if local.date() != today.day:
+                today.notifications = len(hass.services.notifications) - notifications
+                today.switch_changes = hass.services.switch_changes - switch_changes
+                today.charged_kwh = battery.charged_kwh - charged_kwh
+                today.cost = battery.grid_cost - cost
+                notifications = len(hass.services.notifications)
+                switch_changes = hass.services.switch_changes
+                charged_kwh, cost = battery.charged_kwh, battery.grid_cost
+                today = SimulatedDay(local.date())
+                report.days.append(today)
+
+            result = action(local)
+            if asyncio.iscoroutine(result):
+                hass.async_create_task(result)
+            await hass.async_block_till_done()
+            today.loop_seconds += time.perf_counter() - started
+
+        advance_battery()
+        today.notifications = len(hass.services.notifications) - notifications
+        today.switch_changes = hass.services.switch_changes - switch_changes
+        today.charged_kwh = battery.charged_kwh - charged_kwh
+        today.cost = battery.grid_cost - cost
+        return report
@@ -0,0 +1,101 @@
+"""Simulation tests running the coordinator on a virtual clock."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime, time, timedelta
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from harness import Simulation  # noqa: E402
+
+from custom_components.charge_cheapest.backtest import HomeModel, series_timeline  # noqa: E402
+
+# About a thousand simulated days per minute run on a slow single-core
+# machine, stepping the battery every quarter hour ran a fourth of that
+MIN_DAYS_PER_MINUTE = 500
+
+
+def _run(timeline, time_zone, days, **kwargs):
+    """Run a simulation to completion."""
+    return asyncio.run(Simulation(timeline, time_zone, **kwargs).async_run(days))
+
+
+def test_night_charging_follows_the_plan(price_entries, time_zone):
+    """Test that the night trigger schedules charging and the switch follows it."""
+    timeline = series_timeline(price_entries(9))
+    home = HomeModel(initial_soc=30.0)
+
+    report = _run(timeline, time_zone, 7, home=home)
+
+    summary = report.summary()
+    assert summary["days"] == 7
+    assert summary["switch_changes"] >= 14
+    assert summary["charged_kwh"] > 0
+    assert summary["notifications"] > 0
+    assert all(day.loop_seconds > 0 for day in report.days)
+
+
+def test_charging_continues_across_midnight(time_zone):
+    """Test that a window running into the new day keeps charging without tomorrow's prices."""
+    start = datetime(2026, 1, 1, tzinfo=time_zone).timestamp()
+    entries = []
+    for slot in range(4 * 96):
+        local = datetime.fromtimestamp(start + slot * 900, time_zone)
+        cheap = local.time() >= time(23, 30) or local.time() < time(0, 45)
+        entries.append({"start_time": local.isoformat(), "price": 0.1 if cheap else 0.3})
+    # Above the evening peak target, so only the night window charges
+    home = HomeModel(initial_soc=55.0, daily_consumption_kwh=0.0)
+
+    report = _run(series_timeline(entries), time_zone, 2, options={"night_target_soc": 90}, home=home)
+
+    # 55 % to 90 % of 10 kWh at 3 kW takes five quarter hours, from 23:30 to 00:45
+    (on, value_on), (off, value_off) = report.switch_events[:2]
+    assert (value_on, value_off) == ("on", "off")
+    assert on.time() == time(23, 30)
+    assert off.date() > on.date()
+    assert off.time() >= time(0, 30)
+
+
+def test_split_charging_stays_within_runs(price_entries, time_zone):
+    """Test that split charging never switches on more often than allowed."""
+    timeline = series_timeline(price_entries(5))
+    # Without an evening peak target only the night window charges
+    options = {"split_charging_enabled": True, "max_charge_runs": 2, "evening_peak_target_soc": 0}
+
+    report = _run(timeline, time_zone, 3, options=options, home=HomeModel(initial_soc=20.0))
+
+    # Charging starts at most twice in each night window from 23:00 to 06:00
+    night_starts = Counter((local + timedelta(hours=1)).date() for local, value in report.switch_events if value == "on")
+    assert night_starts
+    assert max(night_starts.values()) <= 2
+
+
+def test_months_of_prices(price_entries, time_zone):
+    """Test that three months simulate at hundreds of days per minute with loop time reported per day."""
+    timeline = series_timeline(price_entries(93))
+
+    report = _run(timeline, time_zone, 90)
+
+    summary = report.summary()
+    assert summary["days"] == 90
+    assert summary["refreshes"] > 90
+    assert summary["loop_ms_per_day"] > 0
+    assert summary["days_per_minute"] >= MIN_DAYS_PER_MINUTE
+
+
+def test_diagnostics_snapshot(price_entries, time_zone):
+    """Test that diagnostics cover the timeline, plan caches, timings and switch actions."""
+    timeline = series_timeline(price_entries(4))
+
+    report = _run(timeline, time_zone, 2, home=HomeModel(initial_soc=30.0))
+
+    diagnostics = report.diagnostics
+    actions = [action["action"] for action in diagnostics["executor_actions"]]
+    assert diagnostics["timeline"]["resolution"] == 900
+    assert "window" in diagnostics["stage_fingerprints"]
+    assert diagnostics["stage_timings"]["total"]["samples"] == len(diagnostics["recent_refreshes_ms"])
+    assert "start" in actions and "stop" in actions